@@ -18,6 +18,7 @@ Usage:
 
 from .artifacts import (
     artifact,
+    artifact_paths,
     artifact_exists,
     load_artifacts,
     ArtifactManager,
@@ -33,7 +34,9 @@ from .create import (
     unbind_artifact,
     create_artifact,
     add_download_source,
+    edit_artifacts_toml,
     compute_sha256,
+    compute_sha256_batch,
     compute_git_tree_sha1,
     query_artifact_info,
 )
@@ -43,6 +46,7 @@ __version__ = "0.1.0"
 __all__ = [
     # Artifact access
     "artifact",
+    "artifact_paths",
     "artifact_exists",
     "load_artifacts",
     "ArtifactManager",
@@ -57,7 +61,9 @@ __all__ = [
     "unbind_artifact",      # Remove artifact from TOML
     "create_artifact",      # Create archive from local directory
     "add_download_source",  # Add mirror URL to existing artifact
+    "edit_artifacts_toml",  # Batch several edits into one atomic write
     "compute_sha256",
+    "compute_sha256_batch",
     "compute_git_tree_sha1",
     "query_artifact_info",
 ]
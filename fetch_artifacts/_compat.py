@@ -1,16 +1,41 @@
-"""Compatibility imports for TOML parsing."""
+"""Compatibility imports for TOML parsing, optional HTTP support and Python versions."""
 
-# Reading TOML (Python 3.11+ has tomllib built-in)
-try:
-    import tomllib
-except ImportError:
-    try:
-        import tomli as tomllib
-    except ImportError:
-        tomllib = None
+import importlib.util
+import sys
+
+
+def _lazy_import(name):
+    """
+    Import an optional module on first attribute access, or return None.
+
+    Only the module's presence is checked up front, so importing this
+    package doesn't pay for dependencies that a cached lookup never uses.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        return None
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+# Reading TOML (Python 3.11+ has tomllib built-in); deferred, since
+# managers often load entries from the in-process parse cache
+tomllib = _lazy_import("tomllib") or _lazy_import("tomli")
+
+# Native (Rust) TOML parser, preferred for reading when installed (optional)
+rtoml = _lazy_import("rtoml")
 
 # Writing TOML (requires tomlkit for preserving formatting)
-try:
-    import tomlkit
-except ImportError:
-    tomlkit = None
+tomlkit = _lazy_import("tomlkit")
+
+# Pooled keep-alive HTTP client (optional; urllib is used otherwise)
+httpx = _lazy_import("httpx")
+
+# Slotted dataclasses (Python 3.10+): no per-instance __dict__
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
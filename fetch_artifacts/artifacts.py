@@ -5,66 +5,246 @@ This module implements Julia-style artifact management with TOML configuration,
 automatic downloading, caching, and checksum verification.
 """
 
-import hashlib
+import atexit
+import contextlib
+import functools
+import hmac
+import json
 import os
+import re
 import shutil
+import sys
 import tarfile
 import tempfile
-import urllib.request
+import threading
+import weakref
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
-from urllib.error import URLError
-
-from ._compat import tomllib
-from .utils import download_file, extract_archive, get_extracted_root
+from types import MappingProxyType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from ._compat import DATACLASS_SLOTS, rtoml, tomllib
+from .utils import (
+    _can_stream_untrusted,
+    _local_path,
+    _scratch_file,
+    download_file,
+    download_file_segmented,
+    extract_archive,
+    get_extracted_root,
+    move_tree,
+    probe_url,
+    stream_extract,
+)
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
 
 
 # Global configuration
 _cache_dir: Optional[Path] = None
-_artifact_managers: Dict[str, "ArtifactManager"] = {}
+# Managers handed out by load_artifacts(); held weakly so unused ones can be
+# collected, and guarded so concurrent callers share one instance
+_artifact_managers: "weakref.WeakValueDictionary[str, ArtifactManager]" = (
+    weakref.WeakValueDictionary()
+)
+_artifact_managers_lock = threading.Lock()
+
+# Entries already loaded in this process, keyed by resolved path and stored
+# with the (mtime_ns, size) they were parsed at; a newer parse of the same
+# file replaces the old one, so edits don't accumulate stale copies
+_toml_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, "ArtifactEntry"]]] = {}
+
+# Downloads queued by prefetch(); held weakly (the pool's queue keeps pending
+# ones alive) and cancelled at interpreter exit so it doesn't wait for them
+_prefetch_futures: "weakref.WeakSet[Future]" = weakref.WeakSet()
+_prefetch_exit_lock = threading.Lock()
+_prefetch_exit_registered = False
+
+# Recognized archive suffixes, mapped to (canonical suffix, tarfile read mode)
+_ARCHIVE_FORMATS = {
+    ".tar.xz": (".tar.xz", "r:xz"),
+    ".tar.gz": (".tar.gz", "r:gz"),
+    ".tgz": (".tar.gz", "r:gz"),
+    ".tar.bz2": (".tar.bz2", "r:bz2"),
+    ".tar": (".tar", "r:"),
+    ".zip": (".zip", None),
+}
+# Zstandard tarballs, where tarfile can read them (Python 3.14+)
+if "zst" in tarfile.TarFile.OPEN_METH:
+    _ARCHIVE_FORMATS[".tar.zst"] = (".tar.zst", "r:zst")
+
+# One pass over the URL path, before any query or fragment, for every suffix
+_ARCHIVE_SUFFIX_RE = re.compile(
+    r"[^?#]*\.(%s)(?:[?#]|$)" % "|".join(re.escape(suffix[1:]) for suffix in _ARCHIVE_FORMATS),
+    re.IGNORECASE,
+)
+
+# Well-formed SHA256 checksums; anything else can never match a download
+_SHA256_RE = re.compile(r"[0-9a-fA-F]{64}")
+
+# Keys of an artifact's TOML table with an ArtifactEntry field of their own;
+# anything else is kept as metadata
+_ENTRY_FIELDS = frozenset({"git-tree-sha1", "lazy", "download", "os", "arch"})
+
+# File names searched for by get_artifacts_toml(), in order; the second one
+# is for Julia compatibility
+_TOML_FILENAMES = ("Artifacts.toml", "JuliaArtifacts.toml")
+
+# Interrupted downloads are kept here, as <sha256><suffix>, so they can be
+# resumed; a download in progress writes to its own <sha256>.<random><suffix>
+_PARTIAL_DIR = ".partial"
+
+# Content-addressed store of files shared between artifacts (opt-in)
+_OBJECTS_DIR = ".objects"
+
+# Verified archives kept as <sha256><suffix> so artifacts can be re-extracted
+# without a download (opt-in)
+_ARCHIVES_DIR = ".archives"
+
+# Completion marker written once an artifact is fully extracted
+_MARKER_NAME = ".fetch_artifacts_complete"
+_MARKER_VERSION = 1
+
+# Set to a non-empty value to skip fsync when committing artifacts, trading
+# crash consistency for throughput
+_NO_FSYNC_ENV = "FETCH_ARTIFACTS_NO_FSYNC"
+
+# Set to a non-empty value to parse Artifacts.toml on every load; an edit that
+# keeps the file's size within one mtime tick is otherwise not noticed
+_NO_TOML_CACHE_ENV = "FETCH_ARTIFACTS_DISABLE_TOML_CACHE"
+
+
+def _cancel_prefetches():
+    """Cancel queued prefetch downloads; ones already running finish."""
+    for future in list(_prefetch_futures):
+        future.cancel()
+
+
+def _track_prefetch(future: "Future"):
+    """Remember a prefetch download so it can be cancelled at exit."""
+    global _prefetch_exit_registered
+    with _prefetch_exit_lock:
+        _prefetch_futures.add(future)
+        if not _prefetch_exit_registered:
+            # concurrent.futures joins its workers from a threading exit hook,
+            # which runs before atexit handlers; hooks registered later run
+            # first, so this one empties the queue before that join
+            register = getattr(threading, "_register_atexit", atexit.register)
+            register(_cancel_prefetches)
+            _prefetch_exit_registered = True
+
+
+def _tree_stats(path: Path) -> Tuple[int, int]:
+    """Count files and total bytes under a directory, ignoring the marker."""
+    file_count = 0
+    total_bytes = 0
+    for root, _, files in os.walk(path):
+        for filename in files:
+            if filename == _MARKER_NAME and root == str(path):
+                continue
+            file_count += 1
+            total_bytes += os.lstat(os.path.join(root, filename)).st_size
+    return file_count, total_bytes
+
+
+def _sha256_matches(actual: str, expected: str) -> bool:
+    """Compare hex digests case-insensitively, in constant time."""
+    return hmac.compare_digest(actual.lower(), expected.strip().lower())
+
+
+def _fsync_dir(path: Path):
+    """Flush a directory's entries to disk (no-op where directories can't be opened)."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class DownloadInfo:
     """Information about a download source for an artifact."""
     url: str
     sha256: str
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class ArtifactEntry:
-    """Represents a single artifact entry from Artifacts.toml."""
+    """
+    Represents a single artifact entry from Artifacts.toml.
+
+    Entries are immutable, since parsed entries are shared between every
+    manager loading the same file: ``metadata`` is a read-only mapping, and
+    is left out of the hash, so entries can be used as dict keys.
+    """
     name: str
     git_tree_sha1: Optional[str] = None
     lazy: bool = True  # NOTE: Currently not used - all artifacts are lazy-loaded
-    downloads: List[DownloadInfo] = field(default_factory=list)
+    downloads: Tuple[DownloadInfo, ...] = ()
 
     # Platform-specific fields (optional)
     os: Optional[str] = None
     arch: Optional[str] = None
 
     # Extra metadata fields (description, has_noise, etc.)
-    metadata: Dict[str, Any] = field(default_factory=dict)
+    metadata: Mapping[str, Any] = field(
+        default_factory=lambda: MappingProxyType({}), hash=False
+    )
+
+    def __post_init__(self):
+        if not isinstance(self.metadata, MappingProxyType):
+            # Copied, so the caller's dict can't change the entry either
+            object.__setattr__(self, "metadata", MappingProxyType(dict(self.metadata)))
+
+    def __reduce__(self):
+        # A mappingproxy can't be pickled; rebuild the entry from a plain dict
+        return (
+            type(self),
+            (
+                self.name,
+                self.git_tree_sha1,
+                self.lazy,
+                self.downloads,
+                self.os,
+                self.arch,
+                dict(self.metadata),
+            ),
+        )
 
     @classmethod
     def from_dict(cls, name: str, data: Dict[str, Any]) -> "ArtifactEntry":
         """Create ArtifactEntry from TOML dictionary."""
-        downloads = []
-        if "download" in data:
-            for dl in data["download"]:
-                downloads.append(DownloadInfo(
-                    url=dl["url"],
-                    sha256=dl.get("sha256", "")
-                ))
+        # Interned, so mirrors and checksums repeated across entries (and
+        # across parses of the same file) share one string each
+        downloads = tuple(
+            DownloadInfo(url=sys.intern(dl["url"]), sha256=sys.intern(dl.get("sha256", "").strip()))
+            for dl in data.get("download", ())
+        )
+        git_tree_sha1 = data.get("git-tree-sha1")
+        if git_tree_sha1 is not None:
+            git_tree_sha1 = sys.intern(git_tree_sha1)
 
         # Collect extra metadata fields
-        known_fields = {"git-tree-sha1", "lazy", "download", "os", "arch"}
-        metadata = {k: v for k, v in data.items() if k not in known_fields}
+        metadata = MappingProxyType(
+            {k: v for k, v in data.items() if k not in _ENTRY_FIELDS}
+        )
 
         return cls(
-            name=name,
-            git_tree_sha1=data.get("git-tree-sha1"),
+            name=sys.intern(name),
+            git_tree_sha1=git_tree_sha1,
             lazy=data.get("lazy", True),
             downloads=downloads,
             os=data.get("os"),
@@ -103,6 +283,10 @@ class ArtifactManager:
         toml_path: Union[str, Path],
         cache_dir: Optional[Union[str, Path]] = None,
         verbose: bool = False,
+        dedup: bool = False,
+        verify_checksum: bool = True,
+        keep_archives: bool = False,
+        segments: int = 1,
     ):
         """
         Initialize artifact manager.
@@ -115,9 +299,31 @@ class ArtifactManager:
             Directory to cache artifacts. Defaults to ~/.fetch_artifacts/
         verbose : bool
             Whether to print progress messages
+        dedup : bool
+            Store identical files shared between artifacts only once, as
+            hard links into the cache's object store. Files in deduplicated
+            artifacts must not be modified in place.
+        verify_checksum : bool
+            Compare each download against its declared SHA256 (default: True).
+            Only disable this for sources whose transport already guarantees
+            integrity, such as HTTPS from a trusted host.
+        keep_archives : bool
+            Keep each verified archive in the cache, keyed by its SHA256, so
+            an artifact that is cleared or damaged can be re-extracted, and
+            other entries with the same checksum extracted, without a download.
+        segments : int
+            Split each download into this many parallel byte-range requests
+            when the server supports them (default: 1, a single stream).
+            Ranges are spread over every reachable mirror serving the same
+            file. Segmented downloads are saved to disk before being
+            extracted, so they are neither streamed nor resumable.
         """
         self.toml_path = Path(toml_path)
         self.verbose = verbose
+        self.dedup = dedup
+        self.verify_checksum = verify_checksum
+        self.keep_archives = keep_archives
+        self.segments = segments
 
         # Set cache directory
         if cache_dir is not None:
@@ -125,29 +331,63 @@ class ArtifactManager:
         elif _cache_dir is not None:
             self.cache_dir = _cache_dir
         else:
-            self.cache_dir = Path.home() / ".fetch_artifacts"
+            self.cache_dir = _default_cache_dir()
 
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
+        # Per-directory locks so parallel downloads never extract into the same path
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+        # Cache directories already resolved, keyed by git-tree-sha1 or name
+        self._artifact_dirs: Dict[str, Path] = {}
+
+        # Paths already returned by get_path(); later calls skip verification
+        self._fast_path_cache: Dict[str, Path] = {}
+
+        # Background downloads started by prefetch(), awaited by get_path()
+        self._prefetched: Dict[str, "Future"] = {}
+
         # Load artifacts from TOML
         self.artifacts: Dict[str, ArtifactEntry] = {}
         self._load_toml()
 
     def _load_toml(self):
         """Load artifact definitions from TOML file."""
-        if tomllib is None:
+        try:
+            stat = self.toml_path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Artifacts.toml not found: {self.toml_path}")
+        self._toml_signature = (stat.st_mtime_ns, stat.st_size)
+
+        # A placeholder (empty) file defines nothing; skip parsing and caching
+        if stat.st_size == 0:
+            return
+
+        # Entries loaded earlier in this process need no I/O at all
+        cache_key = self._cache_key()
+        cached = None
+        if not os.environ.get(_NO_TOML_CACHE_ENV):
+            cached = _toml_cache.get(cache_key)
+        if cached is not None and cached[0] == self._toml_signature:
+            self.artifacts = dict(cached[1])
+            return
+
+        if rtoml is not None:
+            data = rtoml.loads(self.toml_path.read_text(encoding="utf-8"))
+        elif tomllib is None:
             raise ImportError(
                 "TOML parsing requires 'tomli' package for Python < 3.11. "
                 "Install with: pip install tomli"
             )
-
-        if not self.toml_path.exists():
-            raise FileNotFoundError(f"Artifacts.toml not found: {self.toml_path}")
-
-        with open(self.toml_path, "rb") as f:
-            data = tomllib.load(f)
+        else:
+            with open(self.toml_path, "rb") as f:
+                data = tomllib.load(f)
 
         for name, entry_data in data.items():
+            # Interned names let lookups with literal keys compare by identity
+            name = sys.intern(name)
+
             # Handle both single entries and platform-specific arrays
             if isinstance(entry_data, list):
                 # Platform-specific: pick first matching or first entry
@@ -157,6 +397,20 @@ class ArtifactManager:
 
             self.artifacts[name] = ArtifactEntry.from_dict(name, entry_data)
 
+        _toml_cache[cache_key] = (self._toml_signature, dict(self.artifacts))
+
+    def _cache_key(self) -> str:
+        """Key identifying this TOML file in the in-process parse cache."""
+        return _resolve_path(os.path.abspath(self.toml_path))
+
+    def _is_stale(self) -> bool:
+        """Check whether Artifacts.toml changed since this manager loaded it."""
+        try:
+            stat = self.toml_path.stat()
+        except FileNotFoundError:
+            return True
+        return (stat.st_mtime_ns, stat.st_size) != self._toml_signature
+
     def __getitem__(self, name: str) -> Path:
         """Get path to artifact, downloading if necessary."""
         return self.get_path(name)
@@ -165,16 +419,28 @@ class ArtifactManager:
         """Check if artifact is defined."""
         return name in self.artifacts
 
-    def get_path(self, name: str, download: bool = True) -> Path:
+    def get_path(
+        self,
+        name: str,
+        download: bool = True,
+        verify_deep: bool = False,
+    ) -> Path:
         """
         Get the path to an artifact.
 
+        Once an artifact has been returned, later calls answer from memory
+        without touching the filesystem until clear() is called; use
+        verify_deep=True to re-check the cache.
+
         Parameters
         ----------
         name : str
             Artifact name as defined in Artifacts.toml
         download : bool
             Whether to download if not cached (default: True)
+        verify_deep : bool
+            Whether to check the cached file count and total size against
+            the completion marker, re-downloading on mismatch (default: False)
 
         Returns
         -------
@@ -188,16 +454,21 @@ class ArtifactManager:
         RuntimeError
             If artifact is not cached and download=False
         """
-        if name not in self.artifacts:
-            raise KeyError(
-                f"Artifact '{name}' not found in {self.toml_path}. "
-                f"Available: {list(self.artifacts.keys())}"
-            )
+        if not verify_deep:
+            path = self._fast_path_cache.get(name)
+            if path is not None:
+                return path
 
-        entry = self.artifacts[name]
+        entry = self._lookup(name)
         artifact_dir = self._get_artifact_dir(entry)
 
-        if artifact_dir.exists() and self._is_valid_artifact(artifact_dir, entry):
+        # Wait for a background download of this artifact, if one was started
+        future = self._prefetched.pop(name, None)
+        if future is not None:
+            future.result()
+
+        if self._is_valid_artifact(artifact_dir, entry, deep=verify_deep):
+            self._fast_path_cache[name] = artifact_dir
             return artifact_dir
 
         if not download:
@@ -205,32 +476,185 @@ class ArtifactManager:
                 f"Artifact '{name}' is not cached and download=False"
             )
 
+        # A deep check failed on an otherwise complete artifact: start over
+        if verify_deep and self._is_valid_artifact(artifact_dir, entry):
+            if self.verbose:
+                print(f"Cached artifact '{name}' is damaged, re-downloading...")
+            shutil.rmtree(artifact_dir)
+
         # Download and extract
-        return self._ensure_artifact(entry)
+        path = self._ensure_artifact(entry)
+        self._fast_path_cache[name] = path
+        return path
+
+    def get_paths(
+        self,
+        names: List[str],
+        download: bool = True,
+        max_workers: int = 8,
+    ) -> Dict[str, Path]:
+        """
+        Get the paths to several artifacts, downloading missing ones in parallel.
+
+        Names that resolve to the same cache directory share one download.
+
+        Parameters
+        ----------
+        names : list of str
+            Artifact names as defined in Artifacts.toml
+        download : bool
+            Whether to download artifacts that are not cached (default: True)
+        max_workers : int
+            Maximum number of concurrent downloads (default: 8)
+
+        Returns
+        -------
+        dict
+            Mapping of artifact name to artifact directory
+
+        Raises
+        ------
+        KeyError
+            If an artifact is not defined in Artifacts.toml
+        RuntimeError
+            If an artifact is not cached and download=False, or its download fails
+        """
+        entries = {name: self._lookup(name) for name in names}
+
+        # Wait for background downloads of these artifacts, if any were started
+        for name in names:
+            future = self._prefetched.pop(name, None)
+            if future is not None:
+                future.result()
+
+        paths: Dict[str, Path] = {}
+        # Missing artifacts grouped by cache directory, so aliases share a download
+        missing: Dict[Path, List[str]] = {}
+        for name, entry in entries.items():
+            artifact_dir = self._get_artifact_dir(entry)
+            if self._is_valid_artifact(artifact_dir, entry):
+                paths[name] = artifact_dir
+            elif not download:
+                raise RuntimeError(
+                    f"Artifact '{name}' is not cached and download=False"
+                )
+            else:
+                missing.setdefault(artifact_dir, []).append(name)
+
+        if missing:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(missing))) as pool:
+                futures = {
+                    pool.submit(self._ensure_artifact, entries[group[0]]): group
+                    for group in missing.values()
+                }
+                for future, group in futures.items():
+                    path = future.result()
+                    for name in group:
+                        paths[name] = path
+
+        return {name: paths[name] for name in names}
+
+    def prefetch(self, max_workers: int = 4):
+        """
+        Start downloading every artifact that is not cached yet, in the background.
+
+        Returns immediately. get_path() and get_paths() wait only for the
+        artifacts they are asked for, and re-raise any error their background
+        download hit; with verbose=True, failures are also printed as they
+        happen. Downloads still queued at interpreter exit are cancelled.
+
+        Parameters
+        ----------
+        max_workers : int
+            Maximum number of concurrent downloads (default: 4)
+        """
+        pending = [
+            entry for name, entry in self.artifacts.items()
+            if entry.downloads and name not in self._prefetched and not self.exists(name)
+        ]
+        if not pending:
+            return
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        pool = ThreadPoolExecutor(max_workers=min(max_workers, len(pending)))
+        for entry in pending:
+            future = pool.submit(self._ensure_artifact, entry)
+            future.add_done_callback(functools.partial(self._report_prefetch, entry.name))
+            _track_prefetch(future)
+            self._prefetched[entry.name] = future
+        # Worker threads exit once the queued downloads are done
+        pool.shutdown(wait=False)
+
+    def _report_prefetch(self, name: str, future: "Future"):
+        """Print a failed background download, which may never be requested."""
+        if self.verbose and not future.cancelled() and future.exception() is not None:
+            print(f"Background download of '{name}' failed: {future.exception()}")
+
+    def _lookup(self, name: str) -> ArtifactEntry:
+        """Get an artifact entry, raising KeyError if it is not defined."""
+        entry = self.artifacts.get(name)
+        if entry is None:
+            raise KeyError(
+                f"Artifact '{name}' not found in {self.toml_path}. "
+                f"Available: {list(self.artifacts.keys())}"
+            )
+        return entry
 
     def _get_artifact_dir(self, entry: ArtifactEntry) -> Path:
         """Get the cache directory for an artifact."""
-        # Use git-tree-sha1 if available for content-addressable storage
-        if entry.git_tree_sha1:
-            return self.cache_dir / entry.git_tree_sha1
-        else:
-            # Fall back to name-based storage
-            return self.cache_dir / entry.name
+        # Use git-tree-sha1 if available for content-addressable storage,
+        # falling back to name-based storage
+        key = entry.git_tree_sha1 or entry.name
+        artifact_dir = self._artifact_dirs.get(key)
+        if artifact_dir is None:
+            artifact_dir = self._artifact_dirs[key] = self.cache_dir / key
+        return artifact_dir
+
+    def _is_valid_artifact(
+        self,
+        path: Path,
+        entry: ArtifactEntry,
+        deep: bool = False,
+    ) -> bool:
+        """
+        Check if cached artifact is valid.
+
+        The default check only looks for the completion marker. With
+        ``deep=True`` the file count and total size recorded in the marker
+        are compared against the directory contents.
+        """
+        # Check for marker file that indicates successful extraction; a
+        # single stat also covers the existence of the directory itself
+        marker = os.path.join(path, _MARKER_NAME)
+        if not deep:
+            try:
+                os.stat(marker)
+            except OSError:
+                return False
+            return True
 
-    def _is_valid_artifact(self, path: Path, entry: ArtifactEntry) -> bool:
-        """Check if cached artifact is valid."""
-        if not path.exists():
+        try:
+            with open(marker) as f:
+                info = json.loads(f.read() or "{}")
+        except (OSError, ValueError):
             return False
+        if "file_count" not in info:
+            return True  # Marker from an older version; nothing to compare
 
-        # Check for marker file that indicates successful extraction
-        marker = path / ".fetch_artifacts_complete"
-        return marker.exists()
+        file_count, total_bytes = _tree_stats(path)
+        return (
+            file_count == info["file_count"]
+            and total_bytes == info.get("total_bytes", total_bytes)
+        )
 
     def _ensure_artifact(self, entry: ArtifactEntry) -> Path:
         """Download and extract artifact if needed."""
         artifact_dir = self._get_artifact_dir(entry)
 
-        if artifact_dir.exists() and self._is_valid_artifact(artifact_dir, entry):
+        if self._is_valid_artifact(artifact_dir, entry):
             return artifact_dir
 
         if not entry.downloads:
@@ -238,11 +662,42 @@ class ArtifactManager:
                 f"Artifact '{entry.name}' has no download sources defined"
             )
 
-        # Try each download source
+        # Serialize concurrent downloads into the same artifact directory;
+        # whoever waits sees the finished artifact once the lock is released
+        with self._artifact_lock(artifact_dir):
+            if self._is_valid_artifact(artifact_dir, entry):
+                return artifact_dir
+            return self._download_from_sources(entry, artifact_dir)
+
+    def _artifact_lock(self, artifact_dir: Path) -> threading.Lock:
+        """Get the lock guarding downloads into an artifact directory."""
+        key = str(artifact_dir)
+        with self._locks_guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def _download_from_sources(self, entry: ArtifactEntry, artifact_dir: Path) -> Path:
+        """Try each download source until one succeeds."""
+        # Fastest responding mirror first
         last_error = None
-        for dl in entry.downloads:
+        failed: List[DownloadInfo] = []
+        ranked = self._rank_mirrors(entry.downloads, failed)
+        for attempt, dl in enumerate(ranked):
+            # With segments requested, the first attempt splits the transfer
+            # across every other mirror of the same file whose probe didn't
+            # fail; otherwise each attempt streams from a single mirror
+            mirrors = []
+            if attempt == 0 and self.segments > 1 and dl.sha256:
+                mirrors = [
+                    other.url for other in ranked
+                    if other is not dl
+                    and other not in failed
+                    and other.sha256.lower() == dl.sha256.lower()
+                ]
             try:
-                return self._download_and_extract(entry, dl, artifact_dir)
+                return self._download_and_extract(entry, dl, artifact_dir, mirrors)
             except Exception as e:
                 last_error = e
                 if self.verbose:
@@ -254,98 +709,435 @@ class ArtifactManager:
             f"Last error: {last_error}"
         )
 
+    def _rank_mirrors(
+        self,
+        downloads: Sequence[DownloadInfo],
+        failed: Optional[List[DownloadInfo]] = None,
+    ) -> List[DownloadInfo]:
+        """
+        Order download sources so the first mirror to respond is tried first.
+
+        All mirrors are probed concurrently; the remaining sources keep their
+        declared order and serve as fallbacks if the transfer itself fails.
+        Mirrors already known to be unreachable are moved to the end, so a
+        fallback does not sit through their full connection timeout first,
+        and are appended to ``failed`` if given.
+        """
+        if len(downloads) < 2:
+            return list(downloads)
+
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        pool = ThreadPoolExecutor(max_workers=len(downloads))
+        try:
+            futures = {pool.submit(probe_url, dl.url): i for i, dl in enumerate(downloads)}
+            unreachable = set()
+            for future in as_completed(futures):
+                if not future.result():
+                    unreachable.add(futures[future])
+                    if failed is not None:
+                        failed.append(downloads[futures[future]])
+                    continue
+                winner = futures[future]
+                fallbacks = [i for i in range(len(downloads)) if i != winner]
+                fallbacks.sort(key=lambda i: i in unreachable)
+                return [downloads[winner]] + [downloads[i] for i in fallbacks]
+        finally:
+            # Don't wait for slow mirrors once a winner is known
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        return list(downloads)
+
     def _download_and_extract(
         self,
         entry: ArtifactEntry,
         dl: DownloadInfo,
-        artifact_dir: Path
+        artifact_dir: Path,
+        mirrors: Optional[List[str]] = None,
     ) -> Path:
-        """Download and extract a single artifact."""
-        if self.verbose:
-            print(f"Downloading artifact '{entry.name}' from {dl.url}...")
+        """
+        Download and extract a single artifact.
 
-        # Create temporary file for download
-        suffix = self._get_archive_suffix(dl.url)
-        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
-            tmp_path = Path(tmp.name)
+        Tar archives are streamed straight from the network into the cache
+        where tarfile's "data" filter is available; on older interpreters
+        they are downloaded and verified first. If ``mirrors`` lists other URLs serving the same file, byte ranges
+        are fetched from all of them in parallel when the servers allow it;
+        that path, like zip archives, goes through a temporary file.
+        """
+        # A malformed checksum can't match, so don't spend a download finding out
+        if self.verify_checksum and dl.sha256 and not _SHA256_RE.fullmatch(dl.sha256):
+            raise RuntimeError(f"Invalid sha256 {dl.sha256!r} for {dl.url}")
 
-        try:
-            # Download with progress
-            download_file(dl.url, tmp_path, verbose=self.verbose)
+        suffix, mode = self._get_archive_format(dl.url)
+        archive = self._archive_path(dl)
+        if archive is not None and not archive.exists():
+            archive = None
+        local = _local_path(dl.url)
 
-            # Verify checksum
-            if dl.sha256:
+        if self.verbose:
+            if archive is not None:
+                print(f"Extracting artifact '{entry.name}' from kept archive {archive}...")
+            else:
+                print(f"Downloading artifact '{entry.name}' from {dl.url}...")
+
+        # Extract into a staging directory inside the cache so the final
+        # move is a same-filesystem rename rather than a full copy
+        staging = Path(tempfile.mkdtemp(prefix=".staging-", dir=self.cache_dir))
+        previous = None
+        try:
+            if archive is not None:
+                # Kept archives were verified when they were stored
+                extract_archive(archive, staging, mode=mode)
+                actual_sha256 = dl.sha256.lower()
+            elif local is not None:
+                actual_sha256 = self._extract_local(dl, local, mode, staging)
+            elif (
+                mirrors
+                or suffix == ".zip"
+                or self.segments > 1
+                # Without an extraction filter, a tampered archive must be
+                # rejected by its checksum before any member is written
+                or not _can_stream_untrusted()
+            ):
+                actual_sha256 = self._download_then_extract(
+                    dl, suffix, mode, staging, mirrors
+                )
+            else:
+                with self._claim_partial(dl) as partial:
+                    actual_sha256 = stream_extract(
+                        dl.url, staging, verbose=self.verbose, spool=partial
+                    )
+                # The transfer completed, so there is nothing left to resume
+                if partial is not None:
+                    try:
+                        self._keep_archive(partial, dl, actual_sha256)
+                    finally:
+                        partial.unlink(missing_ok=True)
+
+            # Verify checksum; a mismatch discards the staged extraction
+            if dl.sha256 and self.verify_checksum:
                 if self.verbose:
                     print("Verifying checksum...")
-                if not self._verify_checksum(tmp_path, dl.sha256):
+                if not _sha256_matches(actual_sha256, dl.sha256):
                     raise RuntimeError(
                         f"Checksum verification failed for {dl.url}"
                     )
 
-            # Extract
-            if self.verbose:
-                print("Extracting...")
+            # Find the root directory in the extracted content
+            src_dir = get_extracted_root(staging)
+
+            if self.dedup:
+                self._dedup_tree(src_dir)
 
-            # Clean existing directory
+            # Mark the staged tree complete before publishing it, so the
+            # artifact directory never appears without its marker
+            self._write_marker(src_dir, actual_sha256)
+
+            # Set any existing directory aside with a rename so the swap is
+            # two metadata operations; it is deleted after the new tree is live
             if artifact_dir.exists():
-                shutil.rmtree(artifact_dir)
+                previous = Path(tempfile.mkdtemp(prefix=".staging-", dir=self.cache_dir))
+                os.replace(artifact_dir, previous / artifact_dir.name)
 
-            # Extract to temporary directory first
-            with tempfile.TemporaryDirectory() as tmp_extract:
-                tmp_extract_path = Path(tmp_extract)
-                extract_archive(tmp_path, tmp_extract_path)
+            # Move to final location, and persist the rename itself
+            move_tree(src_dir, artifact_dir)
+            if not os.environ.get(_NO_FSYNC_ENV):
+                _fsync_dir(self.cache_dir)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+            if previous is not None:
+                shutil.rmtree(previous, ignore_errors=True)
 
-                # Find the root directory in the extracted content
-                src_dir = get_extracted_root(tmp_extract_path)
+        if self.verbose:
+            print(f"Artifact '{entry.name}' ready at: {artifact_dir}")
 
-                # Move to final location
-                shutil.copytree(src_dir, artifact_dir)
+        return artifact_dir
 
-            # Create completion marker
-            marker = artifact_dir / ".fetch_artifacts_complete"
-            marker.touch()
+    def _dedup_tree(self, root: Path):
+        """Replace every regular file under root with a link into the object store."""
+        from .create import compute_sha256_batch
 
-            if self.verbose:
-                print(f"Artifact '{entry.name}' ready at: {artifact_dir}")
+        paths = []
+        for dirpath, _, files in os.walk(root):
+            for filename in files:
+                path = Path(dirpath) / filename
+                if not path.is_symlink():
+                    paths.append(path)
 
-            return artifact_dir
+        # Hash every file in parallel first; linking is cheap metadata work
+        for path, sha256 in zip(paths, compute_sha256_batch(paths)):
+            try:
+                self._store_blob(path, sha256)
+            except OSError:
+                # Filesystem without hard links: keep plain copies
+                return
 
+    def _store_blob(self, path: Path, sha256: str):
+        """
+        Link a file with a known SHA256 into the content-addressed object store.
+
+        If a blob with the same content is already stored, the file is
+        replaced by a hard link to it.
+        """
+        blob = self.cache_dir / _OBJECTS_DIR / sha256[:2] / sha256[2:]
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(path, blob)
+        except FileExistsError:
+            # Only share the blob if it has the same permissions
+            if blob.stat().st_mode != path.stat().st_mode:
+                return
+            tmp = path.with_name(path.name + ".dedup")
+            os.link(blob, tmp)
+            os.replace(tmp, path)
+
+    def _prune_objects(self):
+        """Remove stored blobs no longer linked from any artifact."""
+        objects_dir = self.cache_dir / _OBJECTS_DIR
+        if not objects_dir.exists():
+            return
+        for blob in objects_dir.glob("*/*"):
+            if blob.stat().st_nlink == 1:
+                blob.unlink()
+
+    def _write_marker(self, artifact_dir: Path, sha256: str):
+        """Write the completion marker with a summary of the extracted tree."""
+        file_count, total_bytes = _tree_stats(artifact_dir)
+        info = {
+            "version": _MARKER_VERSION,
+            "sha256": sha256,
+            "file_count": file_count,
+            "total_bytes": total_bytes,
+        }
+        durable = not os.environ.get(_NO_FSYNC_ENV)
+        with open(artifact_dir / _MARKER_NAME, "x") as f:
+            json.dump(info, f)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        if durable:
+            _fsync_dir(artifact_dir)
+
+    def _download_then_extract(
+        self,
+        dl: DownloadInfo,
+        suffix: str,
+        mode: Optional[str],
+        extract_to: Path,
+        mirrors: Optional[List[str]] = None,
+    ) -> str:
+        """
+        Download to a temporary file, then extract it. Returns the file's SHA256.
+
+        Single-stream downloads with a known checksum go to a resumable
+        partial file, which is kept if the transfer is interrupted. Other
+        downloads use an anonymous scratch file in the cache directory.
+        """
+        segmented = bool(mirrors) or self.segments > 1
+        if segmented or self._partial_path(dl) is None:
+            with _scratch_file(self.cache_dir, suffix) as tmp_path:
+                # Download with progress, hashing the bytes as they arrive
+                if segmented:
+                    actual_sha256 = download_file_segmented(
+                        [dl.url] + (mirrors or []),
+                        tmp_path,
+                        verbose=self.verbose,
+                        segments=self.segments if self.segments > 1 else None,
+                    )
+                else:
+                    actual_sha256 = download_file(dl.url, tmp_path, verbose=self.verbose)
+                self._extract_download(dl, actual_sha256, tmp_path, mode, extract_to)
+            return actual_sha256
+
+        # An interrupted transfer leaves the partial file in place to resume
+        with self._claim_partial(dl) as partial:
+            actual_sha256 = download_file(
+                dl.url, partial, verbose=self.verbose, resume=True
+            )
+        try:
+            self._extract_download(dl, actual_sha256, partial, mode, extract_to)
         finally:
-            # Clean up temporary file
-            if tmp_path.exists():
-                tmp_path.unlink()
+            partial.unlink(missing_ok=True)
+        return actual_sha256
+
+    def _extract_local(
+        self,
+        dl: DownloadInfo,
+        path: Path,
+        mode: Optional[str],
+        extract_to: Path,
+    ) -> str:
+        """
+        Extract a ``file://`` source in place. Returns the file's SHA256.
+
+        The file is hashed and extracted where it is, with no copy made;
+        keeping it as an archive copies it (with sendfile where available)
+        rather than linking, so later edits to the source can't reach the cache.
+        """
+        from .create import compute_sha256
+
+        actual_sha256 = compute_sha256(path)
+        self._extract_download(dl, actual_sha256, path, mode, extract_to, link=False)
+        return actual_sha256
+
+    def _extract_download(
+        self,
+        dl: DownloadInfo,
+        actual_sha256: str,
+        path: Path,
+        mode: Optional[str],
+        extract_to: Path,
+        link: bool = True,
+    ):
+        """Extract a downloaded archive, unless its checksum will reject it anyway."""
+        if (
+            self.verify_checksum
+            and dl.sha256
+            and not _sha256_matches(actual_sha256, dl.sha256)
+        ):
+            return
+
+        if self.verbose:
+            print("Extracting...")
+        extract_archive(path, extract_to, mode=mode)
+        self._keep_archive(path, dl, actual_sha256, link=link)
+
+    def _archive_path(self, dl: DownloadInfo) -> Optional[Path]:
+        """
+        Get where a verified archive for a source is kept.
+
+        Returns None unless archives are kept and the source has a
+        well-formed checksum, so a crafted value can't name a path outside
+        the cache even when checksums aren't verified.
+        """
+        if not self.keep_archives or not _SHA256_RE.fullmatch(dl.sha256):
+            return None
+        suffix = self._get_archive_suffix(dl.url)
+        return self.cache_dir / _ARCHIVES_DIR / f"{dl.sha256.lower()}{suffix}"
+
+    def _keep_archive(
+        self,
+        path: Path,
+        dl: DownloadInfo,
+        actual_sha256: str,
+        link: bool = True,
+    ):
+        """Link (or copy) a downloaded archive into the archive store if it matches its checksum."""
+        archive = self._archive_path(dl)
+        if archive is None or not _sha256_matches(actual_sha256, dl.sha256):
+            return
+        archive.parent.mkdir(exist_ok=True)
+        if link:
+            try:
+                # Also gives anonymous (O_TMPFILE) scratch files a name
+                os.link(path, archive)
+                return
+            except FileExistsError:
+                return
+            except OSError:
+                pass  # No hard links here: copy instead
+        elif archive.exists():
+            return
+
+        # Copy under a temporary name, so a partial copy is never taken for
+        # a verified archive
+        tmp = archive.with_name(f"{archive.name}.{os.getpid()}.tmp")
+        try:
+            shutil.copyfile(path, tmp)
+            os.replace(tmp, archive)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+    def _partial_path(self, dl: DownloadInfo) -> Optional[Path]:
+        """
+        Get the resumable partial-download file for a source.
+
+        Partials are keyed by the expected SHA256, so any mirror serving the
+        same file can continue an interrupted transfer. The archive suffix is
+        kept so the file can be extracted in place. Returns None when the
+        source has no well-formed checksum to key on, whether or not
+        checksums are verified, so a crafted value can't name a path outside
+        the cache.
+        """
+        if not _SHA256_RE.fullmatch(dl.sha256):
+            return None
+        partial_dir = self.cache_dir / _PARTIAL_DIR
+        partial_dir.mkdir(exist_ok=True)
+        return partial_dir / f"{dl.sha256.lower()}{self._get_archive_suffix(dl.url)}"
+
+    @contextlib.contextmanager
+    def _claim_partial(self, dl: DownloadInfo):
+        """
+        Yield a partial-download file for a source that no other writer uses.
+
+        A partial left by an earlier attempt is taken over with an atomic
+        rename, so two processes (or managers) fetching the same file never
+        append to one spool. If the download fails and the file is still
+        there, i.e. the network interrupted the transfer, it is handed back
+        under the shared name for a later attempt to resume. Yields None when
+        the source has no checksum to key on.
+        """
+        partial = self._partial_path(dl)
+        if partial is None:
+            yield None
+            return
+
+        sha256, _, suffix = partial.name.partition(".")
+        fd, name = tempfile.mkstemp(
+            prefix=f"{sha256}.", suffix=f".{suffix}", dir=partial.parent
+        )
+        os.close(fd)
+        claimed = Path(name)
+        with contextlib.suppress(OSError):
+            os.replace(partial, claimed)
+        try:
+            yield claimed
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.replace(claimed, partial)
+            raise
 
     def _get_archive_suffix(self, url: str) -> str:
         """Get archive suffix from URL."""
-        # Strip query parameters before checking suffix
-        url_without_query = url.split("?")[0]
-        url_lower = url_without_query.lower()
-        if url_lower.endswith(".tar.xz"):
-            return ".tar.xz"
-        elif url_lower.endswith(".tar.gz") or url_lower.endswith(".tgz"):
-            return ".tar.gz"
-        elif url_lower.endswith(".tar.bz2"):
-            return ".tar.bz2"
-        elif url_lower.endswith(".tar"):
-            return ".tar"
-        elif url_lower.endswith(".zip"):
-            return ".zip"
-        else:
-            return ".tar.gz"  # Default
+        return _archive_format(url)[0]
+
+    def _get_archive_format(self, url: str) -> Tuple[str, Optional[str]]:
+        """
+        Get archive suffix and tarfile read mode from URL.
+
+        The mode is None for zip archives and for unrecognized URLs, in which
+        case the compression is sniffed from the file contents instead.
+        """
+        return _archive_format(url)
 
     def _verify_checksum(self, filepath: Path, expected_sha256: str) -> bool:
         """Verify SHA256 checksum of file."""
+        if not _SHA256_RE.fullmatch(expected_sha256.strip()):
+            return False  # Can't match; skip hashing the file
+
         from .create import compute_sha256
         actual = compute_sha256(filepath)
-        return actual.lower() == expected_sha256.lower()
+        return _sha256_matches(actual, expected_sha256)
 
     def exists(self, name: str) -> bool:
-        """Check if artifact exists in cache."""
-        if name not in self.artifacts:
+        """
+        Check if artifact exists in cache.
+
+        Like get_path(), a positive answer is remembered until clear() is
+        called; a negative one is re-checked each time, since another process
+        may have downloaded the artifact meanwhile.
+        """
+        if name in self._fast_path_cache:
+            return True
+        entry = self.artifacts.get(name)
+        if entry is None:
             return False
-        entry = self.artifacts[name]
         artifact_dir = self._get_artifact_dir(entry)
-        return self._is_valid_artifact(artifact_dir, entry)
+        if not self._is_valid_artifact(artifact_dir, entry):
+            return False
+        self._fast_path_cache[name] = artifact_dir
+        return True
 
     def clear(self, name: Optional[str] = None):
         """
@@ -356,26 +1148,47 @@ class ArtifactManager:
         name : str, optional
             Specific artifact to clear. If None, clears all.
         """
+        # Aliases may share the cleared directory, so forget every fast path
+        self._fast_path_cache.clear()
         if name is not None:
-            if name in self.artifacts:
-                entry = self.artifacts[name]
+            entry = self.artifacts.get(name)
+            if entry is not None:
                 artifact_dir = self._get_artifact_dir(entry)
                 if artifact_dir.exists():
                     shutil.rmtree(artifact_dir)
+                    self._prune_objects()
                     if self.verbose:
                         print(f"Cleared artifact '{name}'")
         else:
-            for artifact_name in self.artifacts:
-                self.clear(artifact_name)
+            # Aliases sharing a directory remove it once
+            targets: Dict[Path, List[str]] = {}
+            for artifact_name, entry in self.artifacts.items():
+                artifact_dir = self._get_artifact_dir(entry)
+                if artifact_dir.exists():
+                    targets.setdefault(artifact_dir, []).append(artifact_name)
+            if not targets:
+                return
+
+            # Removing many small files is bound by syscall latency, so
+            # directories are removed concurrently
+            from concurrent.futures import ThreadPoolExecutor
+
+            workers = min(32, (os.cpu_count() or 1) * 4, len(targets))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(shutil.rmtree, targets))
+            self._prune_objects()
+            if self.verbose:
+                for names in targets.values():
+                    for artifact_name in names:
+                        print(f"Cleared artifact '{artifact_name}'")
 
 
 # Module-level functions for convenience
 
 def get_cache_dir() -> Path:
     """Get the global artifact cache directory."""
-    global _cache_dir
     if _cache_dir is None:
-        return Path.home() / ".fetch_artifacts"
+        return _default_cache_dir()
     return _cache_dir
 
 
@@ -386,33 +1199,61 @@ def set_cache_dir(path: Union[str, Path]):
     _cache_dir.mkdir(parents=True, exist_ok=True)
 
 
-def get_artifacts_toml(search_path: Optional[Path] = None) -> Optional[Path]:
+def get_artifacts_toml(
+    search_path: Optional[Path] = None,
+    start_dir: Optional[Union[str, Path]] = None,
+) -> Optional[Path]:
     """
     Find Artifacts.toml file.
 
     Searches in the following order:
     1. Provided search_path (if given)
-    2. Current working directory (Artifacts.toml or JuliaArtifacts.toml)
+    2. start_dir, or the current working directory (Artifacts.toml or
+       JuliaArtifacts.toml)
 
+    Candidates are checked in order and the search stops at the first hit.
     Returns None if not found.
     """
-    candidates = [
-        Path(search_path) if search_path else None,
-        Path.cwd() / "Artifacts.toml",
-        Path.cwd() / "JuliaArtifacts.toml",  # Julia compatibility
-    ]
+    if search_path and os.path.exists(search_path):
+        return Path(search_path)
 
-    for candidate in candidates:
-        if candidate and candidate.exists():
-            return candidate
+    directory = os.fspath(start_dir) if start_dir is not None else os.getcwd()
+    for filename in _TOML_FILENAMES:
+        candidate = os.path.join(directory, filename)
+        if os.path.exists(candidate):
+            return Path(candidate)
 
     return None
 
 
+@functools.lru_cache(maxsize=None)
+def _default_cache_dir() -> Path:
+    """Get ~/.fetch_artifacts, resolving the home directory only once."""
+    return Path.home() / ".fetch_artifacts"
+
+
+@functools.lru_cache(maxsize=256)
+def _archive_format(url: str) -> Tuple[str, Optional[str]]:
+    """Match a URL against the archive suffixes, memoized per URL."""
+    match = _ARCHIVE_SUFFIX_RE.match(url)
+    if match is None:
+        return ".tar.gz", None  # Default
+    suffix = "." + match.group(1).lower()
+    return _ARCHIVE_FORMATS[suffix]
+
+
+@functools.lru_cache(maxsize=128)
+def _resolve_path(path: str) -> str:
+    """Resolve symlinks in an absolute path, memoized to skip repeated lstat walks."""
+    return str(Path(path).resolve())
+
+
 def load_artifacts(
     toml_path: Optional[Union[str, Path]] = None,
     cache_dir: Optional[Union[str, Path]] = None,
     verbose: bool = False,
+    prefetch: bool = False,
+    prefetch_workers: int = 4,
 ) -> ArtifactManager:
     """
     Load artifacts from an Artifacts.toml file.
@@ -425,6 +1266,11 @@ def load_artifacts(
         Cache directory for artifacts
     verbose : bool
         Whether to print progress messages
+    prefetch : bool
+        Start downloading all uncached artifacts in the background, so they
+        overlap with the caller's own startup (default: False)
+    prefetch_workers : int
+        Maximum number of concurrent background downloads (default: 4)
 
     Returns
     -------
@@ -442,13 +1288,17 @@ def load_artifacts(
     toml_path = Path(toml_path)
 
     # Cache managers by path
-    cache_key = str(toml_path.resolve())
-    if cache_key not in _artifact_managers:
-        _artifact_managers[cache_key] = ArtifactManager(
-            toml_path, cache_dir=cache_dir, verbose=verbose
-        )
+    cache_key = _resolve_path(os.path.abspath(toml_path))
+    with _artifact_managers_lock:
+        manager = _artifact_managers.get(cache_key)
+        if manager is None or manager._is_stale():
+            manager = ArtifactManager(toml_path, cache_dir=cache_dir, verbose=verbose)
+            _artifact_managers[cache_key] = manager
+
+    if prefetch:
+        manager.prefetch(max_workers=prefetch_workers)
 
-    return _artifact_managers[cache_key]
+    return manager
 
 
 def artifact(
@@ -485,6 +1335,41 @@ def artifact(
     return manager.get_path(name)
 
 
+def artifact_paths(
+    names: List[str],
+    toml_path: Optional[Union[str, Path]] = None,
+    verbose: bool = False,
+    max_workers: int = 8,
+) -> Dict[str, Path]:
+    """
+    Get paths to several artifacts, downloading missing ones in parallel.
+
+    Parameters
+    ----------
+    names : list of str
+        Artifact names as defined in Artifacts.toml
+    toml_path : str or Path, optional
+        Path to Artifacts.toml. If None, searches automatically.
+    verbose : bool
+        Whether to print progress messages
+    max_workers : int
+        Maximum number of concurrent downloads (default: 8)
+
+    Returns
+    -------
+    dict
+        Mapping of artifact name to artifact directory
+
+    Examples
+    --------
+    >>> from fetch_artifacts import artifact_paths
+    >>> paths = artifact_paths(["Dataset", "Weights"])
+    >>> paths["Weights"]
+    """
+    manager = load_artifacts(toml_path, verbose=verbose)
+    return manager.get_paths(names, max_workers=max_workers)
+
+
 def artifact_exists(
     name: str,
     toml_path: Optional[Union[str, Path]] = None,
@@ -7,17 +7,73 @@ Similar to Julia's Pkg.Artifacts functions:
 - unbind_artifact!
 """
 
+import contextlib
+import functools
 import hashlib
+import mmap
 import os
+import re
 import shutil
+import stat
 import subprocess
 import tarfile
 import tempfile
+import threading
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from ._compat import tomllib, tomlkit
-from .utils import download_file, extract_archive, get_extracted_root
+from .utils import (
+    CHUNK_SIZE,
+    HashingWriter,
+    _local_path,
+    _read_tar,
+    _stream_tar,
+    download_file,
+    extract_archive,
+    get_extracted_root,
+)
+
+# Read size for the pre-3.11 hashing fallback
+HASH_CHUNK_SIZE = 1 << 20
+
+# Files at least this large are hashed from a memory map, without copying
+# their contents into Python buffers
+HASH_MMAP_THRESHOLD = 16 << 20
+
+# Windows keeps a mapped file from being deleted or replaced, so downloads
+# there are always hashed with plain reads
+_HASH_MMAP = os.name != "nt"
+
+# Tree hashes computed in this process, keyed by a fingerprint of the
+# directory's file metadata (see _tree_fingerprint)
+_tree_hash_cache: Dict[str, str] = {}
+
+# Git blob hashes of individual files hashed in this process, keyed by
+# absolute path and validated against size, mtime, ctime and inode, so
+# re-hashing a tree only reads the files that changed
+_BLOB_CACHE_MAX_ENTRIES = 50_000
+# Files changed this recently may still change within the same timestamp
+# tick and are not recorded (git's "racy clean" problem)
+_BLOB_CACHE_RACY_NS = 2_000_000_000
+_blob_cache: Dict[str, Tuple[Tuple[int, int, int, int], bytes]] = {}
+_blob_cache_lock = threading.Lock()
+
+# Documents being edited inside edit_artifacts_toml(), keyed by absolute path
+_batch_documents: Dict[str, Any] = {}
+
+# TOML bare keys, and strings that need no escaping in a basic string
+_BARE_KEY_RE = re.compile(r"[A-Za-z0-9_-]+")
+_PLAIN_STRING_RE = re.compile(r'[^"\\\x00-\x1f\x7f]*')
+
+# Multi-threaded compressors used for new archives with parallel_compression
+# when installed, tried in order, at the same levels tarfile uses; tarfile writes the plain tar stream
+_PARALLEL_COMPRESSORS = {
+    "xz": (["xz", "-c", "-6", "-T0"],),
+    "gz": (["pigz", "-c", "-9"],),
+    "bz2": (["lbzip2", "-c", "-9"], ["pbzip2", "-c", "-9"]),
+}
 
 
 def compute_sha256(filepath: Union[str, Path]) -> str:
@@ -34,13 +90,85 @@ def compute_sha256(filepath: Union[str, Path]) -> str:
     str
         Hexadecimal SHA256 hash
     """
+    # Unbuffered, so reads land directly in the hasher's buffer
+    with open(filepath, "rb", buffering=0) as f:
+        return _sha256_open_file(f, os.fstat(f.fileno()).st_size)
+
+
+def _sha256_open_file(f, size: int) -> str:
+    """Hash the contents of an unbuffered binary file."""
     sha256_hash = hashlib.sha256()
-    with open(filepath, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            sha256_hash.update(chunk)
+
+    # Hash large files straight from the page cache in a single update call
+    if _HASH_MMAP and (
+        size >= HASH_MMAP_THRESHOLD
+        or (size > HASH_CHUNK_SIZE and not hasattr(hashlib, "file_digest"))
+    ):
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            sha256_hash.update(mm)
+        return sha256_hash.hexdigest()
+
+    # Let the kernel read ahead aggressively. The pages are left cached:
+    # archives are usually extracted right after being verified.
+    if hasattr(os, "posix_fadvise") and size > HASH_CHUNK_SIZE:
+        with contextlib.suppress(OSError):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+    # Python 3.11+ hashes the whole file in C without a Python-level loop
+    if hasattr(hashlib, "file_digest"):
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+    _update_from_file(sha256_hash, f)
     return sha256_hash.hexdigest()
 
 
+def compute_sha256_batch(
+    filepaths: List[Union[str, Path]],
+    max_workers: Optional[int] = None,
+) -> List[str]:
+    """
+    Compute SHA256 hashes of several files in parallel.
+
+    hashlib releases the GIL while hashing, so files are hashed concurrently
+    on a thread pool, overlapping disk reads with hashing.
+
+    Parameters
+    ----------
+    filepaths : list of str or Path
+        Paths to the files
+    max_workers : int, optional
+        Maximum number of files hashed at once (default: number of CPUs)
+
+    Returns
+    -------
+    list of str
+        Hexadecimal SHA256 hashes, in the order of ``filepaths``
+    """
+    if len(filepaths) <= 1:
+        return [compute_sha256(filepath) for filepath in filepaths]
+
+    # Imported here: concurrent.futures pulls in logging, which importing
+    # the package for cached lookups never needs
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+        return list(pool.map(compute_sha256, filepaths))
+
+
+def _update_from_file(hasher, f):
+    """Feed the rest of a binary file into a hash object in large blocks."""
+    # Reuse one buffer so the loop does not allocate per chunk
+    buffer = bytearray(HASH_CHUNK_SIZE)
+    view = memoryview(buffer)
+    while True:
+        n = f.readinto(buffer)
+        if not n:
+            break
+        hasher.update(view[:n])
+
+
 def compute_git_tree_sha1(directory: Union[str, Path]) -> str:
     """
     Compute git-tree-sha1 hash of a directory.
@@ -60,76 +188,187 @@ def compute_git_tree_sha1(directory: Union[str, Path]) -> str:
 
     Note
     ----
-    This requires git to be installed. Falls back to a simple
-    content hash if git is not available.
+    Blob and tree objects are hashed in-process, in git's object format,
+    so git itself does not need to be installed.
+
+    Results are remembered for the rest of the process and reused as long
+    as no file in the directory changes path, size, mode, inode, mtime or
+    ctime.
     """
     directory = Path(directory)
 
-    try:
-        # Try to use git hash-object for true git-tree-sha1
-        # This creates a temporary git repo to compute the hash
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tmpdir = Path(tmpdir)
-
-            # Initialize a git repo
-            subprocess.run(
-                ["git", "init", "-q"],
-                cwd=tmpdir,
-                check=True,
-                capture_output=True
-            )
-
-            # Copy directory contents
-            dest = tmpdir / "content"
-            shutil.copytree(directory, dest)
-
-            # Add all files
-            subprocess.run(
-                ["git", "add", "-A"],
-                cwd=tmpdir,
-                check=True,
-                capture_output=True
-            )
-
-            # Write tree and get hash
-            result = subprocess.run(
-                ["git", "write-tree"],
-                cwd=tmpdir,
-                check=True,
-                capture_output=True,
-                text=True
-            )
-
-            return result.stdout.strip()
-
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        # Fallback: compute simple content hash
-        return _fallback_tree_hash(directory)
-
-
-def _fallback_tree_hash(directory: Path) -> str:
-    """Fallback tree hash when git is not available."""
-    sha256_hash = hashlib.sha256()
-
-    # Sort files for deterministic ordering
-    for filepath in sorted(directory.rglob("*")):
-        if filepath.is_file():
-            # Include relative path in hash
-            rel_path = filepath.relative_to(directory)
-            sha256_hash.update(str(rel_path).encode())
-
-            # Include file content
-            with open(filepath, "rb") as f:
-                for chunk in iter(lambda: f.read(8192), b""):
-                    sha256_hash.update(chunk)
+    # One pass over the metadata serves both the cache lookup and hashing
+    entries = _scan_tree(directory)
+    fingerprint = _tree_fingerprint(directory, entries)
+    tree_hash = _tree_hash_cache.get(fingerprint)
+    if tree_hash is None:
+        tree_hash = _tree_hash_cache[fingerprint] = _compute_git_tree_sha1(
+            directory, entries
+        )
+    return tree_hash
+
+
+def _scan_tree(directory: Path) -> List[Tuple[str, str, os.stat_result]]:
+    """List (parent directory, name, stat) for everything under a directory."""
+    entries = []
+    pending = [""]
+    while pending:
+        rel_dir = pending.pop()
+        with os.scandir(os.path.join(directory, rel_dir)) as it:
+            for entry in it:
+                # Symlinks are followed, so linked content is hashed as if
+                # copied in
+                st = entry.stat()
+                if stat.S_ISDIR(st.st_mode):
+                    pending.append(os.path.join(rel_dir, entry.name))
+                entries.append((rel_dir, entry.name, st))
+    return entries
+
+
+def _tree_fingerprint(
+    directory: Path, entries: List[Tuple[str, str, os.stat_result]]
+) -> str:
+    """Summarize a directory's file metadata, without reading any contents."""
+    summary = sorted(
+        (
+            os.path.join(rel_dir, name),
+            st.st_mode,
+            st.st_size,
+            st.st_ino,
+            st.st_mtime_ns,
+            st.st_ctime_ns,
+        )
+        for rel_dir, name, st in entries
+    )
+    key = repr((os.path.realpath(directory), summary)).encode()
+    return hashlib.sha1(key).hexdigest()
+
+
+def _compute_git_tree_sha1(
+    directory: Path, entries: Optional[List[Tuple[str, str, os.stat_result]]] = None
+) -> str:
+    """Compute the git tree hash of a directory, bypassing the cache."""
+    if entries is None:
+        entries = _scan_tree(directory)
+    # Tree entries per directory, as (sort key, raw entry) pairs
+    trees: Dict[str, List[Tuple[bytes, bytes]]] = {"": []}
+    files = []
+    inodes: Dict[Tuple[int, int], Tuple[str, os.stat_result]] = {}
+    for rel_dir, name, st in entries:
+        if stat.S_ISDIR(st.st_mode):
+            trees[os.path.join(rel_dir, name)] = []
+            continue
+        mode = b"100755" if st.st_mode & stat.S_IXUSR else b"100644"
+        # Hard links (e.g. from deduplicated caches) share one blob hash
+        inode = (st.st_dev, st.st_ino)
+        inodes.setdefault(inode, (os.path.join(directory, rel_dir, name), st))
+        files.append((rel_dir, os.fsencode(name), mode, inode))
+
+    unique = list(inodes.items())
+    blobs = _blob_digests([path_stat for _, path_stat in unique])
+    digests = dict(zip((inode for inode, _ in unique), blobs))
+
+    for rel_dir, name, mode, inode in files:
+        trees[rel_dir].append((name, mode + b" " + name + b"\0" + digests[inode]))
+    return _hash_trees(trees)
+
+
+def _hash_trees(trees: Dict[str, List[Tuple[bytes, bytes]]]) -> str:
+    """
+    Hash per-directory tree entries, keyed by relative path with "" as the
+    root, into the artifact's git-tree-sha1.
+    """
+    # Build trees bottom-up; like git, leave out directories with no files
+    for rel_dir in sorted(trees, key=lambda d: d.count(os.sep), reverse=True):
+        if not rel_dir or not trees[rel_dir]:
+            continue
+        parent, name = os.path.split(rel_dir)
+        name = os.fsencode(name)
+        # git orders subtrees as if their names ended in "/"
+        trees[parent].append(
+            (name + b"/", b"40000 " + name + b"\0" + _git_tree_sha1(trees[rel_dir]))
+        )
 
-    return sha256_hash.hexdigest()[:40]  # Truncate to 40 chars like git
+    # The hash has always been that of a tree holding the directory as
+    # "content", as produced by the original copy-and-stage approach
+    if not trees[""]:
+        return _git_tree_sha1([]).hex()
+    content = b"40000 content\0" + _git_tree_sha1(trees[""])
+    return _git_tree_sha1([(b"content/", content)]).hex()
+
+
+def _blob_digests(files: List[Tuple[str, os.stat_result]]) -> List[bytes]:
+    """Git blob hashes of files, reusing those computed earlier in this process."""
+    keys = [os.path.abspath(path) for path, _ in files]
+    stamps = [
+        (st.st_size, st.st_mtime_ns, st.st_ctime_ns, st.st_ino) for _, st in files
+    ]
+    results: List[Optional[bytes]] = [None] * len(files)
+    missing = []
+    with _blob_cache_lock:
+        for i, (key, stamp) in enumerate(zip(keys, stamps)):
+            record = _blob_cache.get(key)
+            if record is not None and record[0] == stamp:
+                results[i] = record[1]
+            else:
+                missing.append(i)
+
+    paths = [files[i][0] for i in missing]
+    if len(paths) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+            blobs = list(pool.map(_git_blob_sha1, paths))
+    else:
+        blobs = [_git_blob_sha1(path) for path in paths]
+
+    racy_after = time.time_ns() - _BLOB_CACHE_RACY_NS
+    with _blob_cache_lock:
+        for i, blob in zip(missing, blobs):
+            results[i] = blob
+            if max(stamps[i][1:3]) < racy_after:
+                # Re-insert so the oldest entries are the first dropped
+                _blob_cache.pop(keys[i], None)
+                _blob_cache[keys[i]] = (stamps[i], blob)
+        excess = len(_blob_cache) - _BLOB_CACHE_MAX_ENTRIES
+        for key in list(_blob_cache)[: max(0, excess)]:
+            del _blob_cache[key]
+    return results  # type: ignore[return-value]
+
+
+def _git_blob_sha1(path: str) -> bytes:
+    """Hash a file as a git blob object, returning the raw SHA1."""
+    with open(path, "rb", buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        sha1 = hashlib.sha1(b"blob %d\0" % size)
+        if _HASH_MMAP and size >= HASH_MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                sha1.update(mm)
+        elif size > HASH_CHUNK_SIZE and hasattr(hashlib, "file_digest"):
+            # file_digest takes the header-primed object from a factory, and
+            # hashes the rest in C without a Python-level loop
+            return hashlib.file_digest(f, lambda: sha1).digest()
+        elif size > HASH_CHUNK_SIZE:
+            _update_from_file(sha1, f)
+        else:
+            sha1.update(f.read())
+    return sha1.digest()
+
+
+def _git_tree_sha1(entries: List[Tuple[bytes, bytes]]) -> bytes:
+    """Hash (sort key, raw entry) pairs as a git tree object, returning the raw SHA1."""
+    body = b"".join(entry for _, entry in sorted(entries))
+    # Header and body are fed separately, so the body isn't copied again
+    sha1 = hashlib.sha1(b"tree %d\0" % len(body))
+    sha1.update(body)
+    return sha1.digest()
 
 
 def create_artifact(
     directory: Union[str, Path],
     archive_path: Optional[Union[str, Path]] = None,
     compression: str = "xz",
+    parallel_compression: bool = False,
 ) -> Dict[str, str]:
     """
     Create an artifact archive from a directory.
@@ -142,6 +381,11 @@ def create_artifact(
         Output path for the archive. If None, creates in temp directory.
     compression : str
         Compression type: "xz", "gz", "bz2", or None for no compression
+    parallel_compression : bool
+        Compress with a multi-threaded external tool (xz, pigz, lbzip2 or
+        pbzip2) when one is installed (default: False). Faster for large
+        directories, but the archive bytes, and so its sha256, then depend
+        on which tool is available.
 
     Returns
     -------
@@ -178,12 +422,28 @@ def create_artifact(
     else:
         archive_path = Path(archive_path)
 
-    # Create archive
-    with tarfile.open(archive_path, mode) as tar:
-        tar.add(directory, arcname=directory.name)
-
-    # Compute SHA256 of archive
-    sha256 = compute_sha256(archive_path)
+    # Create archive, hashing it as it is written rather than reading it back;
+    # file contents are copied into it in CHUNK_SIZE blocks rather than
+    # tarfile's default 16 KiB
+    command = None
+    if parallel_compression and compression:
+        command = _find_compressor(compression)
+    if command is not None:
+        sha256 = _write_compressed_tar(command, directory, archive_path)
+    else:
+        # Large buffered writes instead of one syscall per compressor block
+        with open(archive_path, "wb", buffering=CHUNK_SIZE) as out:
+            if compression is None:
+                # An uncompressed tar's size is known up front, so reserve it
+                # in one allocation; the estimate is trimmed to fit below
+                _preallocate(out, _estimate_tar_size(directory))
+            writer = HashingWriter(out)
+            with tarfile.open(
+                archive_path, mode, fileobj=writer, copybufsize=CHUNK_SIZE
+            ) as tar:
+                tar.add(directory, arcname=directory.name)
+            out.truncate(out.tell())
+        sha256 = writer.hexdigest()
 
     return {
         "git_tree_sha1": git_tree_sha1,
@@ -192,6 +452,236 @@ def create_artifact(
     }
 
 
+def _estimate_tar_size(directory: Path) -> int:
+    """Estimate the size of an uncompressed tar of a directory."""
+    size = 2 * tarfile.BLOCKSIZE  # end-of-archive marker
+    for root, _, filenames in os.walk(directory):
+        size += tarfile.BLOCKSIZE
+        for name in filenames:
+            file_size = os.lstat(os.path.join(root, name)).st_size
+            size += tarfile.BLOCKSIZE + -(-file_size // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+    return -(-size // tarfile.RECORDSIZE) * tarfile.RECORDSIZE
+
+
+def _preallocate(f, size: int):
+    """Reserve disk space for a file being written, where supported."""
+    if not hasattr(os, "posix_fallocate") or size <= 0:
+        return
+    try:
+        os.posix_fallocate(f.fileno(), 0, size)
+    except OSError:
+        pass  # e.g. filesystems without fallocate support
+
+
+@functools.lru_cache(maxsize=None)
+def _find_compressor(compression: str) -> Optional[Tuple[str, ...]]:
+    """Get the command line of an installed parallel compressor, if any."""
+    for command in _PARALLEL_COMPRESSORS.get(compression, ()):
+        executable = shutil.which(command[0])
+        if executable is not None:
+            return (executable, *command[1:])
+    return None
+
+
+def _write_compressed_tar(command: Tuple[str, ...], directory: Path, archive_path: Path) -> str:
+    """
+    Write a tar archive of a directory through an external compressor.
+
+    Returns the SHA256 of the archive, hashed as the compressed bytes are
+    copied to disk.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    proc = subprocess.Popen(
+        command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    with open(archive_path, "wb") as out, ThreadPoolExecutor(max_workers=1) as pool:
+        writer = HashingWriter(out)
+        # Drain the compressor's output while this thread feeds it the tar stream
+        pump = pool.submit(shutil.copyfileobj, proc.stdout, writer, CHUNK_SIZE)
+        try:
+            with tarfile.open(
+                fileobj=proc.stdin, mode="w|", bufsize=CHUNK_SIZE, copybufsize=CHUNK_SIZE
+            ) as tar:
+                tar.add(directory, arcname=directory.name)
+        finally:
+            proc.stdin.close()
+            pump.result()
+            proc.stdout.close()
+            returncode = proc.wait()
+            error = proc.stderr.read().decode(errors="replace").strip()
+            proc.stderr.close()
+    if returncode != 0:
+        raise RuntimeError(
+            f"{os.path.basename(command[0])} failed with exit status {returncode}: {error}"
+        )
+    return writer.hexdigest()
+
+
+def _load_document(toml_path: Path):
+    """Parse Artifacts.toml with tomlkit, keeping its formatting for rewriting."""
+    # Parsing from one in-memory string beats tomlkit's file API
+    return tomlkit.parse(toml_path.read_text())
+
+
+def _get_document(toml_path: Path, create: bool = False):
+    """
+    Get the tomlkit document to edit for Artifacts.toml.
+
+    Inside edit_artifacts_toml() this is the shared in-memory document.
+    Otherwise the file is parsed, or, if it doesn't exist, an empty document
+    is returned when ``create`` is set and None when it isn't.
+    """
+    doc = _batch_documents.get(os.path.abspath(toml_path))
+    if doc is None:
+        if toml_path.exists():
+            doc = _load_document(toml_path)
+        elif create:
+            doc = tomlkit.document()
+    return doc
+
+
+def _save_document(toml_path: Path, doc):
+    """Write an edited document back, unless edit_artifacts_toml() will."""
+    if os.path.abspath(toml_path) not in _batch_documents:
+        _write_document(toml_path, doc)
+
+
+def _write_document(toml_path: Path, doc):
+    """Replace Artifacts.toml atomically, so readers never see a partial file."""
+    _write_toml_text(toml_path, tomlkit.dumps(doc))
+
+
+def _write_toml_text(toml_path: Path, text: str):
+    """Atomically replace a TOML file with already-rendered text."""
+    toml_path.parent.mkdir(parents=True, exist_ok=True)
+    # A random name opened with O_EXCL is unique across threads and
+    # processes like mkstemp, but 0o666 lets a new file honour the umask
+    # instead of mkstemp's 0o600.
+    while True:
+        tmp_path = toml_path.with_name(f"{toml_path.name}.{os.urandom(6).hex()}.tmp")
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+            break
+        except FileExistsError:
+            continue
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+        with contextlib.suppress(FileNotFoundError):
+            shutil.copymode(toml_path, tmp_path)
+        os.replace(tmp_path, toml_path)
+        # A same-size rewrite within one mtime tick keeps the old cache key.
+        _parse_toml.cache_clear()
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+@contextlib.contextmanager
+def edit_artifacts_toml(toml_path: Union[str, Path]):
+    """
+    Batch several edits of an Artifacts.toml into one read and one write.
+
+    Within the block, bind_artifact(), unbind_artifact(), add_download_source()
+    and add_artifact() for the same file work on one in-memory document,
+    which is written back atomically when the block exits without an error.
+    If an exception escapes, the file is left untouched.
+
+    Parameters
+    ----------
+    toml_path : str or Path
+        Path to Artifacts.toml (created on exit if it doesn't exist)
+
+    Yields
+    ------
+    tomlkit.TOMLDocument
+        The document being edited
+
+    Examples
+    --------
+    >>> with edit_artifacts_toml("Artifacts.toml"):
+    ...     bind_artifact("Artifacts.toml", "First", tree_sha1, url, sha256)
+    ...     add_download_source("Artifacts.toml", "First", mirror_url, sha256)
+    """
+    if tomlkit is None:
+        raise ImportError(
+            "tomlkit is required for writing TOML files. "
+            "Install with: pip install tomlkit"
+        )
+
+    toml_path = Path(toml_path)
+    key = os.path.abspath(toml_path)
+    if key in _batch_documents:
+        # Nested blocks share the outermost one's document and write
+        yield _batch_documents[key]
+        return
+
+    doc = _get_document(toml_path, create=True)
+    _batch_documents[key] = doc
+    try:
+        yield doc
+    finally:
+        del _batch_documents[key]
+    _write_document(toml_path, doc)
+
+
+def _render_new_artifact(
+    name: str,
+    git_tree_sha1: str,
+    download_url: str,
+    sha256: str,
+    lazy: bool,
+) -> Optional[str]:
+    """
+    Render a single-artifact Artifacts.toml without tomlkit.
+
+    The text is exactly what tomlkit would write. Returns None when a value
+    would need quoting or escaping, leaving those cases to tomlkit.
+    """
+    if not _BARE_KEY_RE.fullmatch(name):
+        return None
+    if not all(_PLAIN_STRING_RE.fullmatch(v) for v in (git_tree_sha1, download_url, sha256)):
+        return None
+    return (
+        f'[{name}]\n'
+        f'git-tree-sha1 = "{git_tree_sha1}"\n'
+        + ("lazy = true\n" if lazy else "")
+        + f'\n[[{name}.download]]\n'
+        f'url = "{download_url}"\n'
+        f'sha256 = "{sha256}"\n'
+    )
+
+
+def _read_toml(toml_path: Path) -> Dict[str, Any]:
+    """Parse Artifacts.toml for reading only; the result must not be modified."""
+    stat_result = os.stat(toml_path)
+    return _parse_toml(os.fspath(toml_path), stat_result.st_mtime_ns, stat_result.st_size)
+
+
+def _read_unbatched(toml_path: Path) -> Optional[Dict[str, Any]]:
+    """
+    Parse Artifacts.toml with tomllib for a read-only check before an edit.
+
+    Returns None when the file is being edited inside edit_artifacts_toml(),
+    doesn't exist, or tomllib isn't available; the caller then inspects the
+    tomlkit document instead.
+    """
+    if tomllib is None or os.path.abspath(toml_path) in _batch_documents:
+        return None
+    try:
+        return _read_toml(toml_path)
+    except FileNotFoundError:
+        return None
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_toml(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Parse a TOML file with tomllib, cached per path, mtime and size."""
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
+
 def bind_artifact(
     toml_path: Union[str, Path],
     name: str,
@@ -237,12 +727,23 @@ def bind_artifact(
 
     toml_path = Path(toml_path)
 
+    # A brand-new file with one artifact needs no tomlkit round trip
+    if os.path.abspath(toml_path) not in _batch_documents and not toml_path.exists():
+        text = _render_new_artifact(name, git_tree_sha1, download_url, sha256, lazy)
+        if text is not None:
+            _write_toml_text(toml_path, text)
+            return
+
+    # Refuse to overwrite without paying for a tomlkit parse
+    existing = _read_unbatched(toml_path)
+    if existing is not None and name in existing and not force:
+        raise ValueError(
+            f"Artifact '{name}' already exists in {toml_path}. "
+            "Use force=True to overwrite."
+        )
+
     # Load existing TOML or create new
-    if toml_path.exists():
-        with open(toml_path, "r") as f:
-            doc = tomlkit.load(f)
-    else:
-        doc = tomlkit.document()
+    doc = _get_document(toml_path, create=True)
 
     # Check if artifact exists
     if name in doc and not force:
@@ -270,9 +771,7 @@ def bind_artifact(
     doc[name] = artifact_table
 
     # Write back
-    toml_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(toml_path, "w") as f:
-        f.write(tomlkit.dumps(doc))
+    _save_document(toml_path, doc)
 
 
 def unbind_artifact(
@@ -304,19 +803,18 @@ def unbind_artifact(
 
     toml_path = Path(toml_path)
 
-    if not toml_path.exists():
+    # Nothing to remove: answered by the cached tomllib parse
+    existing = _read_unbatched(toml_path)
+    if existing is not None and name not in existing:
         return False
 
-    with open(toml_path, "r") as f:
-        doc = tomlkit.load(f)
-
-    if name not in doc:
+    doc = _get_document(toml_path)
+    if doc is None or name not in doc:
         return False
 
     del doc[name]
 
-    with open(toml_path, "w") as f:
-        f.write(tomlkit.dumps(doc))
+    _save_document(toml_path, doc)
 
     return True
 
@@ -349,11 +847,14 @@ def add_download_source(
 
     toml_path = Path(toml_path)
 
-    if not toml_path.exists():
-        raise FileNotFoundError(f"Artifacts.toml not found: {toml_path}")
+    # Reject unknown names without paying for a tomlkit parse
+    existing = _read_unbatched(toml_path)
+    if existing is not None and name not in existing:
+        raise KeyError(f"Artifact '{name}' not found in {toml_path}")
 
-    with open(toml_path, "r") as f:
-        doc = tomlkit.load(f)
+    doc = _get_document(toml_path)
+    if doc is None:
+        raise FileNotFoundError(f"Artifacts.toml not found: {toml_path}")
 
     if name not in doc:
         raise KeyError(f"Artifact '{name}' not found in {toml_path}")
@@ -365,8 +866,7 @@ def add_download_source(
 
     doc[name]["download"].append(download_item)
 
-    with open(toml_path, "w") as f:
-        f.write(tomlkit.dumps(doc))
+    _save_document(toml_path, doc)
 
 
 def query_artifact_info(url: str, compute_tree_hash: bool = True) -> Dict[str, Any]:
@@ -387,37 +887,131 @@ def query_artifact_info(url: str, compute_tree_hash: bool = True) -> Dict[str, A
     dict
         Dictionary with sha256, and optionally git_tree_sha1
     """
-    import urllib.request
+    print(f"Downloading {url}...")
 
-    with tempfile.NamedTemporaryFile(delete=False) as tmp:
-        tmp_path = Path(tmp.name)
+    if not compute_tree_hash:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            # Hashed while streaming, so the file is not read back
+            sha256 = download_file(url, Path(tmpdir) / "download", verbose=False)
+        return {"sha256": sha256, "url": url}
 
-    try:
-        print(f"Downloading {url}...")
-        download_file(url, tmp_path, verbose=False)
+    sha256, git_tree_sha1 = _download_tree_hash(url, warn=True)
+    result = {"sha256": sha256, "url": url}
+    if git_tree_sha1 is not None:
+        result["git_tree_sha1"] = git_tree_sha1
+    return result
 
-        sha256 = compute_sha256(tmp_path)
-        result = {"sha256": sha256, "url": url}
 
-        if compute_tree_hash:
-            # Try to extract and compute tree hash
-            with tempfile.TemporaryDirectory() as extract_dir:
-                extract_path = Path(extract_dir)
-                try:
-                    extract_archive(tmp_path, extract_path)
+def _download_tree_hash(url: str, verbose: bool = False, warn: bool = False) -> Tuple[str, Optional[str]]:
+    """
+    Download an archive and compute its SHA256 and git-tree-sha1.
+
+    Tar archives are hashed in one pass over the network stream, members
+    included, without being extracted; ``file://`` archives are read in
+    place. Archives whose members can't be hashed that way are extracted
+    from the copy kept during the download, and anything tarfile can't
+    stream, such as a zip, is downloaded again to a file and extracted from
+    there. The tree hash is None if the archive can't be extracted at all.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        tree_hashes = []
+
+        def hash_members(tf):
+            tree_hashes.append(_tar_tree_hash(tf))
+
+        local = _local_path(url)
+        if local is not None and local.is_file():
+            # Local archives are read where they are instead of being copied
+            archive_path = local
+            sha256 = compute_sha256(local)
+            try:
+                _read_tar(local, hash_members)
+            except tarfile.TarError:
+                tree_hashes.clear()
+        else:
+            archive_path = tmpdir / "download"
+            try:
+                # The archive is kept only in case its members can't be hashed
+                # from the stream and it has to be extracted after all
+                sha256 = _stream_tar(url, hash_members, verbose, spool=archive_path)
+            except tarfile.TarError:
+                tree_hashes.clear()
+                sha256 = download_file(url, archive_path, verbose=verbose)
+        if tree_hashes and tree_hashes[0] is not None:
+            return sha256, tree_hashes[0]
+
+        extract_path = tmpdir / "extracted"
+        try:
+            extract_archive(archive_path, extract_path)
+        except tarfile.TarError as e:
+            if warn:
+                print(f"Warning: Could not extract archive for tree hash: {e}")
+            return sha256, None
 
-                    # Find root directory
-                    content_dir = get_extracted_root(extract_path)
+        # Find root directory
+        content_dir = get_extracted_root(extract_path)
+        return sha256, compute_git_tree_sha1(content_dir)
 
-                    result["git_tree_sha1"] = compute_git_tree_sha1(content_dir)
-                except tarfile.TarError:
-                    print("Warning: Could not extract archive for tree hash")
 
-        return result
+def _tar_tree_hash(tf: tarfile.TarFile) -> Optional[str]:
+    """
+    Compute the git-tree-sha1 of a tar archive's contents without extracting it.
 
-    finally:
-        if tmp_path.exists():
-            tmp_path.unlink()
+    Members are hashed as they stream past, giving the hash the extracted
+    artifact root (see get_extracted_root) would have. Returns None for
+    archives whose extracted layout can't be predicted this exactly, such
+    as ones with symlinks, special files, or paths outside the archive.
+    """
+    # File mode and blob hash, and directories, keyed by path components
+    files: Dict[Tuple[str, ...], Tuple[bytes, bytes]] = {}
+    dirs = set()
+    for member in tf:
+        if member.name.startswith("/"):
+            return None
+        parts = tuple(p for p in member.name.split("/") if p not in ("", "."))
+        if ".." in parts or parts in files or parts in dirs:
+            return None
+        # Extraction keeps the owner's execute bit, which is all git records
+        mode = b"100755" if member.mode & stat.S_IXUSR else b"100644"
+        if member.isdir():
+            if parts:
+                dirs.add(parts)
+        elif member.isreg() and parts:
+            sha1 = hashlib.sha1(b"blob %d\0" % member.size)
+            f = tf.extractfile(member)
+            for chunk in iter(functools.partial(f.read, CHUNK_SIZE), b""):
+                sha1.update(chunk)
+            files[parts] = (mode, sha1.digest())
+        elif member.islnk() and parts:
+            target = tuple(p for p in member.linkname.split("/") if p not in ("", "."))
+            # Hard links share the target's inode, and so its final mode
+            if files.get(target, (None,))[0] != mode:
+                return None
+            files[parts] = files[target]
+        else:
+            return None
+
+    # Extraction creates every parent; none of them may be a file
+    for parts in list(files) + list(dirs):
+        for i in range(1, len(parts)):
+            if parts[:i] in files:
+                return None
+            dirs.add(parts[:i])
+
+    # A lone top-level directory is the artifact root
+    top = {parts[0] for parts in files} | {parts[0] for parts in dirs}
+    skip = 1 if len(top) == 1 and (next(iter(top)),) in dirs else 0
+
+    trees: Dict[str, List[Tuple[bytes, bytes]]] = {"": []}
+    for parts in dirs:
+        if len(parts) > skip:
+            trees[os.path.join(*parts[skip:])] = []
+    for parts, (mode, digest) in files.items():
+        name = os.fsencode(parts[-1])
+        rel_dir = os.path.join("", *parts[skip:-1])
+        trees[rel_dir].append((name, mode + b" " + name + b"\0" + digest))
+    return _hash_trees(trees)
 
 
 def add_artifact(
@@ -449,8 +1043,8 @@ def add_artifact(
     force : bool
         Overwrite existing artifact with same name (default: False)
     clear : bool
-        Whether to clear the downloaded file after adding (default: True)
-        Note: The artifact is always added, this just controls cleanup.
+        Kept for compatibility; the download is streamed and never left on
+        disk, so there is nothing to clean up.
     verbose : bool
         Whether to print progress messages (default: True)
 
@@ -476,84 +1070,50 @@ def add_artifact(
     ...     "https://zenodo.org/records/12345/files/emulator.tar.xz"
     ... )
     Downloading https://zenodo.org/records/12345/files/emulator.tar.xz...
-    Computing hashes...
     Added artifact 'MyEmulator' to Artifacts.toml
     {'git_tree_sha1': 'abc123...', 'sha256': 'def456...', 'url': '...'}
     """
-    import urllib.request
-
     toml_path = Path(toml_path)
 
     # Check if artifact already exists
-    if toml_path.exists() and not force:
-        try:
-            if tomllib is None:
-                raise ImportError("tomli/tomllib required")
-            with open(toml_path, "rb") as f:
-                existing = tomllib.load(f)
-            if name in existing:
-                raise ValueError(
-                    f"Artifact '{name}' already exists in {toml_path}. "
-                    "Use force=True to overwrite."
-                )
-        except ImportError:
-            pass  # Can't check, will fail later if exists
-
-    # Download to temp file
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".tar.xz") as tmp:
-        tmp_path = Path(tmp.name)
-
-    try:
-        if verbose:
-            print(f"Downloading {tarball_url}...")
-
-        # Download with progress
-        download_file(tarball_url, tmp_path, verbose=verbose)
-
-        if verbose:
-            print("Computing hashes...")
-
-        # Compute SHA256 of the tarball
-        sha256 = compute_sha256(tmp_path)
-
-        # Extract and compute git-tree-sha1
-        git_tree_sha1 = None
-        with tempfile.TemporaryDirectory() as extract_dir:
-            extract_path = Path(extract_dir)
-            try:
-                extract_archive(tmp_path, extract_path)
-
-                # Find root directory
-                content_dir = get_extracted_root(extract_path)
-
-                git_tree_sha1 = compute_git_tree_sha1(content_dir)
-            except tarfile.TarError as e:
-                if verbose:
-                    print(f"Warning: Could not extract archive for tree hash: {e}")
-                # Use sha256 as fallback for git-tree-sha1
-                git_tree_sha1 = sha256
-
-        # Bind the artifact
-        bind_artifact(
-            toml_path=toml_path,
-            name=name,
-            git_tree_sha1=git_tree_sha1,
-            download_url=tarball_url,
-            sha256=sha256,
-            lazy=lazy,
-            force=force,
+    batch_doc = _batch_documents.get(os.path.abspath(toml_path))
+    if batch_doc is not None and name in batch_doc and not force:
+        raise ValueError(
+            f"Artifact '{name}' already exists in {toml_path}. "
+            "Use force=True to overwrite."
+        )
+    existing = _read_unbatched(toml_path)
+    if existing is not None and name in existing and not force:
+        raise ValueError(
+            f"Artifact '{name}' already exists in {toml_path}. "
+            "Use force=True to overwrite."
         )
 
-        if verbose:
-            print(f"Added artifact '{name}' to {toml_path}")
-
-        return {
-            "git_tree_sha1": git_tree_sha1,
-            "sha256": sha256,
-            "url": tarball_url,
-        }
+    if verbose:
+        print(f"Downloading {tarball_url}...")
+
+    # Download, hash and extract in one pass, then compute git-tree-sha1
+    sha256, git_tree_sha1 = _download_tree_hash(tarball_url, verbose=verbose, warn=verbose)
+    if git_tree_sha1 is None:
+        # Use sha256 as fallback for git-tree-sha1
+        git_tree_sha1 = sha256
+
+    # Bind the artifact
+    bind_artifact(
+        toml_path=toml_path,
+        name=name,
+        git_tree_sha1=git_tree_sha1,
+        download_url=tarball_url,
+        sha256=sha256,
+        lazy=lazy,
+        force=force,
+    )
+
+    if verbose:
+        print(f"Added artifact '{name}' to {toml_path}")
 
-    finally:
-        # Clean up temp file
-        if clear and tmp_path.exists():
-            tmp_path.unlink()
+    return {
+        "git_tree_sha1": git_tree_sha1,
+        "sha256": sha256,
+        "url": tarball_url,
+    }
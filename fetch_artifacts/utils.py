@@ -1,15 +1,483 @@
 """Shared utility functions for fetch_artifacts."""
 
+import contextlib
+import errno
+import functools
+import hashlib
+import importlib.util
+import io
+import mmap
+import os
+import queue
+import shutil
+import subprocess
+import sys
 import tarfile
-import urllib.request
+import tempfile
+import threading
+import time
 from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
 from urllib.error import URLError
 
+from ._compat import httpx
 
-def download_file(url: str, destination: Path, verbose: bool = False):
+# Read size for streaming downloads (1 MiB amortizes per-read overhead)
+CHUNK_SIZE = 1 << 20
+
+# Chunks read ahead of the consumer in streaming extraction (8 MiB in flight)
+PIPELINE_DEPTH = 8
+
+# Minimum seconds between progress updates, so printing stays off the hot path
+PROGRESS_INTERVAL = 0.2
+
+# Timeout (seconds) for mirror reachability probes
+PROBE_TIMEOUT = 3.0
+
+# Use tarfile's "data" extraction filter where available (3.12+ and security
+# backports): it rejects members escaping the target directory and skips
+# device files, without a separate pass over the member list
+_TAR_FILTER = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+
+
+# Multi-threaded decompressors used for tar archives when installed, tried in
+# order; the tar stream itself is still read by tarfile
+_PARALLEL_DECOMPRESSORS = {
+    "xz": (["xz", "-d", "-c", "-T0"],),
+    "gz": (["pigz", "-d", "-c"],),
+    "bz2": (["lbzip2", "-d", "-c"], ["pbzip2", "-d", "-c"]),
+}
+
+# Leading bytes of zip archives (local file header, or an empty archive)
+_ZIP_MAGIC = (b"PK\x03\x04", b"PK\x05\x06")
+
+# Leading bytes identifying each compression format
+_COMPRESSION_MAGIC = {
+    b"\xfd7zXZ\x00": "xz",
+    b"\x1f\x8b": "gz",
+    b"BZh": "bz2",
+}
+
+# Immediate reconnect attempts when opening an HTTP connection fails (httpx)
+HTTP_CONNECT_RETRIES = 1
+
+# Smallest byte range worth its own request in a segmented download
+SEGMENT_MIN_SIZE = 1 << 20
+
+# Shared httpx client, created on first use so connections (and TLS
+# sessions) are reused across mirror probes and downloads
+_http_client = None
+_http_client_lock = threading.Lock()
+
+
+def _get_http_client():
+    """Get the process-wide httpx client, creating it on first use."""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            transport = httpx.HTTPTransport(
+                http2=importlib.util.find_spec("h2") is not None,
+                retries=HTTP_CONNECT_RETRIES,
+            )
+            # Responses are read raw (undecoded), so ask servers not to
+            # compress them: the bytes on disk must match the sha256
+            _http_client = httpx.Client(
+                transport=transport,
+                headers={"Accept-Encoding": "identity"},
+                follow_redirects=True,
+                timeout=httpx.Timeout(30.0, connect=5.0),
+            )
+        return _http_client
+
+
+class _HttpxResponse:
+    """Adapts a streamed httpx response to the file-like API of urlopen()."""
+
+    def __init__(self, response):
+        self._response = response
+        self._chunks = response.iter_raw(CHUNK_SIZE)
+        # A bytearray grows in place and drops consumed bytes from the front
+        # cheaply, so large reads don't re-copy everything buffered so far
+        self._buffer = bytearray()
+        self.headers = response.headers
+        self.status = response.status_code
+
+    def read(self, size: int = -1) -> bytes:
+        try:
+            while size < 0 or len(self._buffer) < size:
+                chunk = next(self._chunks, None)
+                if chunk is None:
+                    break
+                self._buffer += chunk
+        except httpx.HTTPError as e:
+            raise URLError(e)
+
+        if size < 0 or size >= len(self._buffer):
+            data = bytes(self._buffer)
+            self._buffer.clear()
+        else:
+            with memoryview(self._buffer) as view:
+                data = view[:size].tobytes()
+            del self._buffer[:size]
+        return data
+
+    def close(self):
+        self._response.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _urlopen(
+    url: str,
+    method: str = "GET",
+    headers: Optional[Dict[str, str]] = None,
+    timeout: Optional[float] = None,
+):
+    """
+    Open a URL for streaming.
+
+    HTTP(S) requests go through a pooled keep-alive httpx client when httpx
+    is installed; everything else (and all URLs without httpx) uses urllib.
+    Failures surface as ``URLError`` either way.
+    """
+    if httpx is not None and url.startswith(("http://", "https://")):
+        client = _get_http_client()
+        try:
+            request = client.build_request(
+                method, url, headers=headers,
+                timeout=timeout if timeout is not None else client.timeout,
+            )
+            response = client.send(request, stream=True)
+        except httpx.HTTPError as e:
+            raise URLError(e)
+        if response.status_code >= 400:
+            response.close()
+            raise URLError(f"HTTP Error {response.status_code}: {response.reason_phrase}")
+        return _HttpxResponse(response)
+
+    # Imported here: urllib.request pulls in http.client and email, which
+    # cached-artifact lookups never need
+    import urllib.request
+
+    request = urllib.request.Request(url, headers=headers or {}, method=method)
+    if timeout is None:
+        return urllib.request.urlopen(request)
+    return urllib.request.urlopen(request, timeout=timeout)
+
+
+def _local_path(url: str) -> Optional[Path]:
+    """Get the local file a ``file://`` URL points to, or None for other URLs."""
+    if not url.startswith("file:"):
+        return None
+    from urllib.parse import urlsplit
+    from urllib.request import url2pathname
+
+    parts = urlsplit(url)
+    if parts.netloc not in ("", "localhost"):
+        return None
+    return Path(url2pathname(parts.path))
+
+
+def _print_progress(downloaded: int, total_size: int):
+    """Print a single-line download progress indicator."""
+    percent = min(downloaded * 100 / total_size, 100)
+    mb_downloaded = downloaded / (1024 * 1024)
+    mb_total = total_size / (1024 * 1024)
+    print(
+        f"\r  {percent:.1f}% ({mb_downloaded:.1f}/{mb_total:.1f} MB)",
+        end="",
+        flush=True
+    )
+
+
+class HashingReader:
+    """
+    File-like wrapper that hashes bytes as they are read.
+
+    Wraps an HTTP response (or any binary stream) so that consumers such as
+    ``tarfile`` can read from it while the SHA256 is computed on the fly.
+
+    Parameters
+    ----------
+    stream : file-like
+        Binary stream to read from
+    total_size : int
+        Expected number of bytes (0 if unknown), used for progress output
+    verbose : bool
+        Whether to print progress while reading
+    """
+
+    def __init__(self, stream, total_size: int = 0, verbose: bool = False):
+        self.stream = stream
+        self.total_size = total_size
+        self.verbose = verbose
+        self.bytes_read = 0
+        self.sha256 = hashlib.sha256()
+        self._last_progress = 0.0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.stream.read(size)
+        if chunk:
+            self.sha256.update(chunk)
+            self.bytes_read += len(chunk)
+            if self.verbose and self.total_size > 0:
+                self._report_progress()
+        return chunk
+
+    def _report_progress(self):
+        """Print progress at most every PROGRESS_INTERVAL seconds, and at the end."""
+        now = time.monotonic()
+        if now - self._last_progress < PROGRESS_INTERVAL and self.bytes_read < self.total_size:
+            return
+        self._last_progress = now
+        _print_progress(self.bytes_read, self.total_size)
+
+    def drain(self):
+        """Read and hash whatever is left in the stream."""
+        while self.read(CHUNK_SIZE):
+            pass
+
+    def check_complete(self):
+        """Raise if fewer bytes arrived than the server announced."""
+        if self.total_size > 0 and self.bytes_read < self.total_size:
+            raise RuntimeError(
+                f"Download failed: retrieval incomplete, "
+                f"got only {self.bytes_read} out of {self.total_size} bytes"
+            )
+
+    def hexdigest(self) -> str:
+        return self.sha256.hexdigest()
+
+
+class HashingWriter:
+    """
+    File-like wrapper that hashes bytes as they are written.
+
+    Lets a file be checksummed while it is produced, instead of reading it
+    back from disk afterwards.
+
+    Parameters
+    ----------
+    stream : file-like
+        Binary stream to write to
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.sha256 = hashlib.sha256()
+
+    def write(self, data) -> int:
+        self.sha256.update(data)
+        return self.stream.write(data)
+
+    def flush(self):
+        self.stream.flush()
+
+    def tell(self) -> int:
+        return self.stream.tell()
+
+    def hexdigest(self) -> str:
+        return self.sha256.hexdigest()
+
+
+class _PrefetchReader:
+    """
+    Read a stream ahead of its consumer on a background thread.
+
+    A producer thread reads ``CHUNK_SIZE`` blocks into a bounded queue while
+    the caller decompresses and extracts earlier ones, so network latency is
+    hidden behind compute and vice versa. Errors raised by the producer are
+    re-raised from ``read``. Closing stops the producer; the wrapped stream
+    itself is left open.
+
+    Parameters
+    ----------
+    stream : file-like
+        Binary stream to read from
+    depth : int
+        Maximum number of chunks buffered ahead of the consumer
+    """
+
+    def __init__(self, stream, depth: int = PIPELINE_DEPTH):
+        self._queue = queue.Queue(maxsize=depth)
+        self._buffer = b""
+        self._offset = 0
+        self._eof = False
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._produce, args=(stream,), daemon=True)
+        self._thread.start()
+
+    def _produce(self, stream):
+        try:
+            while not self._closed.is_set():
+                chunk = stream.read(CHUNK_SIZE)
+                self._queue.put(chunk)
+                if not chunk:
+                    return
+        except BaseException as e:
+            self._queue.put(e)
+
+    def _next_chunk(self) -> bytes:
+        item = self._queue.get()
+        if isinstance(item, BaseException):
+            self._eof = True
+            raise item
+        if not item:
+            self._eof = True
+        return item
+
+    def read(self, size: int = -1) -> bytes:
+        if self._offset >= len(self._buffer):
+            if self._eof:
+                return b""
+            self._buffer = self._next_chunk()
+            self._offset = 0
+
+        if size < 0:
+            parts = [self._buffer[self._offset:]]
+            while not self._eof:
+                parts.append(self._next_chunk())
+            self._buffer = b""
+            self._offset = 0
+            return b"".join(parts)
+
+        # Whole chunks are handed over without copying
+        if self._offset == 0 and size >= len(self._buffer):
+            data = self._buffer
+            self._buffer = b""
+            return data
+        data = self._buffer[self._offset:self._offset + size]
+        self._offset += len(data)
+        return data
+
+    def close(self):
+        self._closed.set()
+        # Free a queue slot so a producer blocked in put() can see the flag
+        while self._thread.is_alive():
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._thread.join(0.05)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class _PrependedReader:
+    """Binary stream returning bytes already read from a stream, then the rest of it."""
+
+    def __init__(self, head: bytes, stream):
+        self._head = head
+        self.stream = stream
+
+    def read(self, size: int = -1) -> bytes:
+        if not self._head:
+            return self.stream.read(size)
+        if 0 <= size <= len(self._head):
+            chunk, self._head = self._head[:size], self._head[size:]
+            return chunk
+        # Fill the whole request: tarfile sniffs compression from one read
+        rest = self.stream.read(-1 if size < 0 else size - len(self._head))
+        chunk, self._head = self._head + rest, b""
+        return chunk
+
+
+class _ResumableStream:
+    """
+    Stream a URL through a spool file so interrupted transfers can resume.
+
+    Bytes already in the spool are replayed first and only the remainder is
+    requested, with a ``Range`` header; new bytes are appended to the spool
+    as they are read. If the server ignores or rejects the range, the spool
+    is truncated and the transfer starts from the beginning.
+
+    ``interrupted`` is set when the connection fails or closes before the
+    announced length, i.e. when the spool holds a valid prefix worth resuming.
+
+    Parameters
+    ----------
+    url : str
+        URL to download from
+    spool : Path
+        File holding the bytes received so far (created if missing)
+    """
+
+    def __init__(self, url: str, spool: Path):
+        offset = spool.stat().st_size if spool.exists() else 0
+        response = None
+        if offset:
+            try:
+                response = _urlopen(url, headers={"Range": f"bytes={offset}-"})
+            except URLError:
+                response = None  # e.g. 416 when the spool is already complete
+            if response is not None and getattr(response, "status", None) != 206:
+                response.close()
+                response = None
+        if response is None:
+            offset = 0
+            response = _urlopen(url)
+
+        self._response = response
+        self._prefix = open(spool, "rb") if offset else None
+        self._spool = open(spool, "ab" if offset else "wb")
+        self.headers = response.headers
+        self.resumed_bytes = offset
+        self.total_size = offset + int(response.headers.get("Content-Length") or 0)
+        self.interrupted = False
+        self._received = offset
+
+    def read(self, size: int = -1) -> bytes:
+        if self._prefix is not None:
+            data = self._prefix.read(size)
+            if data:
+                return data
+            self._prefix.close()
+            self._prefix = None
+
+        try:
+            data = self._response.read(size)
+        except Exception:
+            self.interrupted = True
+            raise
+        if not data and size != 0 and self._received < self.total_size:
+            self.interrupted = True  # Connection closed early
+        self._received += len(data)
+        self._spool.write(data)
+        return data
+
+    def close(self):
+        if self._prefix is not None:
+            self._prefix.close()
+        self._spool.close()
+        self._response.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def download_file(
+    url: str,
+    destination: Path,
+    verbose: bool = False,
+    resume: bool = False,
+) -> str:
     """
     Download file from URL with optional progress bar.
 
+    The SHA256 of the downloaded bytes is computed while streaming, so
+    callers can verify the file without reading it back from disk.
+
     Parameters
     ----------
     url : str
@@ -18,41 +486,354 @@ def download_file(url: str, destination: Path, verbose: bool = False):
         Local path to save the file
     verbose : bool
         Whether to show progress bar
+    resume : bool
+        Whether to continue a partial file already at ``destination`` with an
+        HTTP Range request instead of starting over
+
+    Returns
+    -------
+    str
+        Hexadecimal SHA256 hash of the downloaded file
 
     Raises
     ------
     RuntimeError
         If download fails
     """
-    def progress_hook(block_num, block_size, total_size):
-        if verbose and total_size > 0:
-            downloaded = block_num * block_size
-            percent = min(downloaded * 100 / total_size, 100)
-            mb_downloaded = downloaded / (1024 * 1024)
-            mb_total = total_size / (1024 * 1024)
-            print(
-                f"\r  {percent:.1f}% ({mb_downloaded:.1f}/{mb_total:.1f} MB)",
-                end="",
-                flush=True
-            )
+    try:
+        if resume:
+            # The stream appends to destination itself; reading it through
+            # the hasher also replays (and hashes) the bytes already on disk
+            with _ResumableStream(url, destination) as stream:
+                reader = HashingReader(stream, stream.total_size, verbose)
+                reader.drain()
+        else:
+            with _urlopen(url) as response, open(destination, "wb") as f:
+                total_size = int(response.headers.get("Content-Length") or 0)
+                reader = HashingReader(response, total_size, verbose)
+                while True:
+                    chunk = reader.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+
+        reader.check_complete()
+        if verbose:
+            print()  # New line after progress
+    except URLError as e:
+        raise RuntimeError(f"Download failed: {e}")
+
+    return reader.hexdigest()
+
+
+def stream_extract(
+    url: str,
+    extract_to: Path,
+    verbose: bool = False,
+    spool: Optional[Path] = None,
+) -> str:
+    """
+    Download a tar archive and extract it in a single streaming pass.
+
+    Bytes flow from the network through a SHA256 hasher into ``tarfile``'s
+    streaming reader, so the archive is never read back from disk. Any
+    compression (gz, xz, bz2) is detected from the stream itself, and is
+    piped through the same parallel decompressors as ``extract_archive``
+    when one is installed. The download runs on a separate thread a few
+    chunks ahead of hashing and extraction, so the two overlap.
+
+    Parameters
+    ----------
+    url : str
+        URL of the tar archive
+    extract_to : Path
+        Directory to extract to
+    verbose : bool
+        Whether to show progress bar
+    spool : Path, optional
+        File that receives a copy of the downloaded bytes. If it already holds
+        the start of the archive from an interrupted attempt, those bytes are
+        replayed and only the remainder is downloaded. It is removed if the
+        download fails for any reason other than a network interruption,
+        e.g. when the server sent something other than the archive.
+
+    Returns
+    -------
+    str
+        Hexadecimal SHA256 hash of the downloaded archive
+
+    Raises
+    ------
+    RuntimeError
+        If download fails
+    tarfile.TarError
+        If archive extraction fails
+    """
+    extract_to.mkdir(parents=True, exist_ok=True)
+    return _stream_tar(
+        url, functools.partial(_extract_all, extract_to=extract_to), verbose, spool
+    )
+
+
+def _can_stream_untrusted() -> bool:
+    """
+    Whether archives can be extracted before their checksum is verified.
 
+    Only tarfile's "data" filter keeps members of a tampered archive from
+    being written outside the target directory while it is being streamed.
+    """
+    return bool(_TAR_FILTER)
+
+
+def _extract_all(tf: tarfile.TarFile, extract_to: Path):
+    """Extract every member of a tar archive, through the data filter if available."""
+    tf.extractall(extract_to, **_TAR_FILTER)
+
+
+def _stream_tar(
+    url: str,
+    handle: Callable[[tarfile.TarFile], None],
+    verbose: bool = False,
+    spool: Optional[Path] = None,
+) -> str:
+    """
+    Download a tar archive and pass it to ``handle`` as a streaming TarFile.
+
+    This is the single pass behind ``stream_extract``; ``handle`` may read
+    as much of the archive as it needs, and the rest of the download is
+    still hashed. Returns the SHA256 of the archive.
+    """
+    source = None
     try:
-        urllib.request.urlretrieve(
-            url,
-            destination,
-            reporthook=progress_hook if verbose else None
-        )
+        if spool is not None:
+            source = _ResumableStream(url, spool)
+            total_size = source.total_size
+        else:
+            source = _urlopen(url)
+            total_size = int(source.headers.get("Content-Length") or 0)
+
+        with source, _PrefetchReader(source) as prefetched:
+            reader = HashingReader(prefetched, total_size, verbose)
+            head = reader.read(6)
+            command = _parallel_decompressor(head, None)
+            if command is not None:
+                _read_decompressed_stream(command, _PrependedReader(head, reader), handle)
+            else:
+                # Large reads keep per-call overhead out of the decompression loop
+                with tarfile.open(
+                    fileobj=_PrependedReader(head, reader), mode="r|*", bufsize=CHUNK_SIZE
+                ) as tf:
+                    handle(tf)
+            # Trailing padding after the end-of-archive marker is still hashed
+            reader.drain()
+
+        reader.check_complete()
         if verbose:
             print()  # New line after progress
     except URLError as e:
         raise RuntimeError(f"Download failed: {e}")
+    except Exception:
+        # Only bytes cut off by the network are worth resuming; anything else
+        # (e.g. an error page served instead of the archive) would fail again
+        if spool is not None and source is not None and not source.interrupted:
+            spool.unlink(missing_ok=True)
+        raise
+
+    return reader.hexdigest()
+
+
+def probe_url(url: str, timeout: float = PROBE_TIMEOUT) -> bool:
+    """
+    Check whether a URL is reachable with a lightweight HEAD request.
+
+    Parameters
+    ----------
+    url : str
+        URL to probe
+    timeout : float
+        Seconds to wait for a response
+
+    Returns
+    -------
+    bool
+        True if the server answered successfully, False otherwise
+    """
+    try:
+        with _urlopen(url, method="HEAD", timeout=timeout) as response:
+            status = getattr(response, "status", None)
+            return status is None or 200 <= status < 400
+    except (URLError, OSError, ValueError):
+        return False
+
+
+def _query_range_support(url: str, timeout: float = PROBE_TIMEOUT) -> Optional[Tuple[int, bool]]:
+    """Return (content length, accepts byte ranges) for a URL, or None if unreachable."""
+    try:
+        with _urlopen(url, method="HEAD", timeout=timeout) as response:
+            length = int(response.headers.get("Content-Length") or 0)
+            accepts_ranges = response.headers.get("Accept-Ranges", "").lower() == "bytes"
+            return length, accepts_ranges
+    except (URLError, OSError, ValueError):
+        return None
+
+
+def _fetch_range(url: str, destination: Path, start: int, end: int):
+    """Download bytes [start, end] of a URL into the same offsets of destination."""
+    headers = {"Range": f"bytes={start}-{end}"}
+    with _urlopen(url, headers=headers) as response, open(destination, "r+b") as f:
+        if getattr(response, "status", None) != 206:
+            raise RuntimeError(f"Server ignored range request: {url}")
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = response.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                raise RuntimeError(
+                    f"Download failed: range {start}-{end} from {url} ended early"
+                )
+            f.write(chunk)
+            remaining -= len(chunk)
+
+
+def download_file_segmented(
+    urls: List[str],
+    destination: Path,
+    verbose: bool = False,
+    segments: Optional[int] = None,
+) -> str:
+    """
+    Download a file by fetching disjoint byte ranges in parallel.
+
+    All mirrors must serve the same file. Mirrors that do not advertise
+    ``Accept-Ranges: bytes`` or report a different size are skipped, and the
+    ranges are spread over the remaining ones in turn. If only one range is
+    left to fetch, this falls back to a single-stream :func:`download_file`
+    from the first URL.
+
+    Parameters
+    ----------
+    urls : list of str
+        Mirror URLs for the same file, in order of preference
+    destination : Path
+        Local path to save the file
+    verbose : bool
+        Whether to print progress messages
+    segments : int, optional
+        Number of ranges to fetch, so even a single URL can be split over
+        several connections (default: one per usable mirror). Ranges are
+        never smaller than ``SEGMENT_MIN_SIZE``.
+
+    Returns
+    -------
+    str
+        Hexadecimal SHA256 hash of the downloaded file
+
+    Raises
+    ------
+    RuntimeError
+        If download fails
+    """
+    if len(urls) < 2 and (segments or 0) < 2:
+        return download_file(urls[0], destination, verbose=verbose)
+
+    # Imported here: concurrent.futures pulls in logging, which cached
+    # lookups never need
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=len(urls)) as pool:
+        infos = list(pool.map(_query_range_support, urls))
+
+    primary = infos[0]
+    total_size = primary[0] if primary and primary[1] else 0
+    usable = [
+        url for url, info in zip(urls, infos)
+        if info and info[1] and info[0] == total_size
+    ]
+
+    count = min(segments or len(usable), total_size // SEGMENT_MIN_SIZE)
+    if not usable or count < 2:
+        return download_file(urls[0], destination, verbose=verbose)
+
+    if verbose:
+        print(f"  Fetching {count} segments in parallel...")
+
+    # Preallocate so each worker can write its range in place
+    with open(destination, "wb") as f:
+        f.truncate(total_size)
+
+    segment_size = -(-total_size // count)
+    ranges = [
+        (usable[i % len(usable)], start, min(start + segment_size, total_size) - 1)
+        for i, start in enumerate(range(0, total_size, segment_size))
+    ]
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+            futures = [
+                pool.submit(_fetch_range, url, destination, start, end)
+                for url, start, end in ranges
+            ]
+            for future in futures:
+                future.result()
+    except URLError as e:
+        raise RuntimeError(f"Download failed: {e}")
 
+    # Hashing cannot be streamed across out-of-order segments
+    from .create import compute_sha256
+    return compute_sha256(destination)
 
-def extract_archive(archive_path: Path, extract_to: Path):
+
+class _MappedReader(io.RawIOBase):
+    """Seekable binary reader over an mmap (mmap itself lacks seekable() before 3.13)."""
+
+    def __init__(self, mm: mmap.mmap):
+        self._mm = mm
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        return self._mm.read(size)
+
+    def readinto(self, b) -> int:
+        data = self._mm.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._mm.seek(offset, whence)
+        return self._mm.tell()
+
+    def tell(self) -> int:
+        return self._mm.tell()
+
+
+@contextlib.contextmanager
+def _mapped(f):
+    """Memory-map an open file read-only, yielding the file itself if that fails."""
+    try:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (ValueError, OSError):
+        # Empty files cannot be mapped
+        yield f
+        return
+    try:
+        yield _MappedReader(mm)
+    finally:
+        mm.close()
+
+
+def extract_archive(archive_path: Path, extract_to: Path, mode: Optional[str] = None):
     """
     Extract archive to directory.
 
-    Supports tar.gz, tar.xz, tar.bz2, tar, and zip formats.
+    Supports tar.gz, tar.xz, tar.bz2, tar, and zip formats. Compressed tar
+    archives are decompressed by a multi-threaded external tool (``xz -T0``,
+    ``pigz``, ``lbzip2`` or ``pbzip2``) when one is installed, while the tar
+    stream itself is still read by ``tarfile``.
 
     Parameters
     ----------
@@ -60,6 +841,9 @@ def extract_archive(archive_path: Path, extract_to: Path):
         Path to the archive file
     extract_to : Path
         Directory to extract to
+    mode : str, optional
+        tarfile read mode (e.g. "r:xz") when the compression is already
+        known; by default it is detected from the file contents
 
     Raises
     ------
@@ -68,14 +852,170 @@ def extract_archive(archive_path: Path, extract_to: Path):
     """
     extract_to.mkdir(parents=True, exist_ok=True)
 
-    if str(archive_path).endswith(".zip"):
+    with open(archive_path, "rb") as f:
+        head = f.read(6)
+
+    # Zip archives are recognized by name or, for unnamed files, by contents
+    if str(archive_path).endswith(".zip") or head.startswith(_ZIP_MAGIC):
         import zipfile
         with zipfile.ZipFile(archive_path, "r") as zf:
             zf.extractall(extract_to)
+        return
+
+    _read_tar(archive_path, functools.partial(_extract_all, extract_to=extract_to), mode, head)
+
+
+def _read_tar(
+    archive_path: Path,
+    handle: Callable[[tarfile.TarFile], None],
+    mode: Optional[str] = None,
+    head: Optional[bytes] = None,
+):
+    """
+    Pass a tar archive on disk to ``handle`` as a streaming TarFile.
+
+    ``head`` holds the file's leading bytes when the caller has read them
+    already; they pick the parallel decompressor when ``mode`` doesn't.
+    """
+    if head is None:
+        with open(archive_path, "rb") as f:
+            head = f.read(6)
+
+    command = _parallel_decompressor(head, mode)
+    if command is not None:
+        _read_decompressed(command, archive_path, handle)
     else:
-        # Use tarfile for tar archives (handles gz, xz, bz2 automatically)
-        with tarfile.open(archive_path, "r:*") as tf:
-            tf.extractall(extract_to)
+        # Use tarfile for tar archives (handles gz, xz, bz2 automatically),
+        # reading from a memory map to skip buffered-I/O copies. Stream mode
+        # decompresses once, front to back, with no seeks inside the stream.
+        stream_mode = (mode or "r:*").replace(":", "|", 1)
+        with open(archive_path, "rb") as f, _mapped(f) as source:
+            with tarfile.open(fileobj=source, mode=stream_mode, bufsize=CHUNK_SIZE) as tf:
+                handle(tf)
+
+
+@functools.lru_cache(maxsize=None)
+def _find_decompressor(compression: str) -> Optional[Tuple[str, ...]]:
+    """Get the command line of an installed parallel decompressor, if any."""
+    for command in _PARALLEL_DECOMPRESSORS.get(compression, ()):
+        executable = shutil.which(command[0])
+        if executable is not None:
+            return (executable, *command[1:])
+    return None
+
+
+def _parallel_decompressor(head: bytes, mode: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Pick a parallel decompressor for an archive from its mode or leading bytes."""
+    if mode and ":" in mode and mode.split(":", 1)[1] not in ("", "*"):
+        compression = mode.split(":", 1)[1]
+    else:
+        compression = next(
+            (name for magic, name in _COMPRESSION_MAGIC.items() if head.startswith(magic)),
+            None,
+        )
+    if compression is None:
+        return None
+    return _find_decompressor(compression)
+
+
+def _read_decompressed(
+    command: Tuple[str, ...], archive_path: Path, handle: Callable[[tarfile.TarFile], None]
+):
+    """Read a tar archive decompressed by an external process with ``handle``."""
+    with open(archive_path, "rb") as f:
+        proc = subprocess.Popen(
+            command, stdin=f, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+    _read_from_process(command, proc, handle)
+
+
+def _read_decompressed_stream(
+    command: Tuple[str, ...], stream, handle: Callable[[tarfile.TarFile], None]
+):
+    """Read a tar stream piped through an external decompressor with ``handle``."""
+    proc = subprocess.Popen(
+        command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    errors: List[BaseException] = []
+
+    def feed():
+        try:
+            try:
+                while True:
+                    chunk = stream.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    proc.stdin.write(chunk)
+            finally:
+                proc.stdin.close()
+        except BrokenPipeError:
+            pass  # The decompressor quit early; its exit status says why
+        except BaseException as e:
+            errors.append(e)
+
+    feeder = threading.Thread(target=feed, daemon=True)
+    feeder.start()
+    try:
+        _read_from_process(command, proc, handle)
+    finally:
+        feeder.join()
+        # A failed download also truncates the decompressor's input; report
+        # the download error rather than the resulting decompression error
+        if errors:
+            raise errors[0]
+
+
+def _read_from_process(
+    command: Tuple[str, ...],
+    proc: subprocess.Popen,
+    handle: Callable[[tarfile.TarFile], None],
+):
+    """Pass the tar stream a decompressor process writes to its stdout to ``handle``."""
+    try:
+        with tarfile.open(fileobj=proc.stdout, mode="r|", bufsize=CHUNK_SIZE) as tf:
+            handle(tf)
+        # Let the decompressor finish so its exit status covers the whole file
+        while proc.stdout.read(CHUNK_SIZE):
+            pass
+    finally:
+        proc.stdout.close()
+        returncode = proc.wait()
+        error = proc.stderr.read().decode(errors="replace").strip()
+        proc.stderr.close()
+    if returncode != 0:
+        raise tarfile.ReadError(
+            f"{os.path.basename(command[0])} failed with exit status {returncode}: {error}"
+        )
+
+
+@contextlib.contextmanager
+def _scratch_file(directory: Path, suffix: str = ""):
+    """
+    Yield the path of a scratch file in ``directory`` that is removed on exit.
+
+    On Linux the file is created with ``O_TMPFILE``: it never has a name in
+    the directory, so it cannot be leaked even if the process is killed, and
+    is reached through ``/proc/self/fd``. Elsewhere, or on filesystems
+    without ``O_TMPFILE`` support, a named temporary file is used.
+    """
+    if sys.platform.startswith("linux") and hasattr(os, "O_TMPFILE"):
+        try:
+            fd = os.open(directory, os.O_TMPFILE | os.O_RDWR, 0o600)
+        except OSError:
+            pass
+        else:
+            try:
+                yield Path(f"/proc/self/fd/{fd}")
+            finally:
+                os.close(fd)
+            return
+
+    with tempfile.NamedTemporaryFile(dir=directory, suffix=suffix, delete=False) as tmp:
+        path = Path(tmp.name)
+    try:
+        yield path
+    finally:
+        path.unlink(missing_ok=True)
 
 
 def get_extracted_root(extract_dir: Path) -> Path:
@@ -95,7 +1035,76 @@ def get_extracted_root(extract_dir: Path) -> Path:
     Path
         Root directory of the extracted content
     """
-    items = list(extract_dir.iterdir())
-    if len(items) == 1 and items[0].is_dir():
-        return items[0]
+    # Stop listing at the second entry; flat archives can have many
+    with os.scandir(extract_dir) as it:
+        first = next(it, None)
+        if first is None or next(it, None) is not None:
+            return extract_dir
+        if first.is_dir():
+            return Path(first.path)
     return extract_dir
+
+
+# Linux ioctl request number for FICLONE (reflink a whole file)
+_FICLONE = 0x40049409
+
+
+def _clone_file(src: str, dst: str) -> str:
+    """
+    Copy a file, sharing data blocks via reflink where the filesystem allows.
+
+    Without reflink support the data is copied in the kernel with
+    ``copy_file_range``, falling back to :func:`shutil.copy`, whose
+    ``copyfile`` uses ``sendfile`` on Linux (``fcopyfile`` on macOS). Only
+    permission bits are carried over: timestamps of extracted files don't
+    matter for artifacts, so the extra ``copystat`` work of ``copy2`` is
+    skipped.
+    """
+    # FICLONE and copy_file_range are Linux-specific; other platforms
+    # (including macOS and the BSDs, which also have fcntl) use copyfile
+    if not sys.platform.startswith("linux"):
+        return shutil.copy(src, dst)
+
+    import fcntl
+
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            try:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            except OSError:
+                _copy_file_range(fsrc.fileno(), fdst.fileno())
+        shutil.copymode(src, dst)
+        return dst
+    except OSError:
+        return shutil.copy(src, dst)
+
+
+def _copy_file_range(fd_in: int, fd_out: int):
+    """Copy a whole file between descriptors without a userspace buffer."""
+    if not hasattr(os, "copy_file_range"):
+        raise OSError(errno.ENOSYS, "copy_file_range is not available")
+    while os.copy_file_range(fd_in, fd_out, CHUNK_SIZE * 64):
+        pass
+
+
+def move_tree(src: Path, dst: Path):
+    """
+    Move a directory tree to a new location.
+
+    Uses an O(1) rename when both paths are on the same filesystem and
+    falls back to a reflink-aware copy otherwise.
+
+    Parameters
+    ----------
+    src : Path
+        Directory to move
+    dst : Path
+        Destination path (must not exist)
+    """
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.copytree(src, dst, copy_function=_clone_file)
+        shutil.rmtree(src, ignore_errors=True)
@@ -0,0 +1,81 @@
+"""Shared fixtures for the test suite."""
+
+import functools
+import http.server
+import os
+import threading
+
+import pytest
+
+
+class _RangeRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """Static file handler that also honors single ``Range: bytes=a-b`` requests."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_head(self):
+        range_header = self.headers.get("Range")
+        path = self.translate_path(self.path)
+        if not range_header or not os.path.isfile(path):
+            f = super().send_head()
+            return f
+
+        size = os.path.getsize(path)
+        start_str, _, end_str = range_header.split("=", 1)[1].partition("-")
+        start = int(start_str)
+        end = int(end_str) if end_str else size - 1
+
+        f = open(path, "rb")
+        f.seek(start)
+        self.send_response(206)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+        self._remaining = end - start + 1
+        return f
+
+    def end_headers(self):
+        if not self.headers.get("Range"):
+            self.send_header("Accept-Ranges", "bytes")
+        super().end_headers()
+
+    def copyfile(self, source, outputfile):
+        remaining = getattr(self, "_remaining", None)
+        if remaining is None:
+            return super().copyfile(source, outputfile)
+        outputfile.write(source.read(remaining))
+
+
+@pytest.fixture(autouse=True)
+def _isolated_home(tmp_path_factory, monkeypatch):
+    """Point the home directory, and so the default cache, at a temporary one."""
+    from fetch_artifacts import artifacts
+
+    home = tmp_path_factory.mktemp("home")
+    monkeypatch.setenv("HOME", str(home))
+    monkeypatch.setenv("USERPROFILE", str(home))
+    monkeypatch.setattr(artifacts, "_cache_dir", None)
+    artifacts._default_cache_dir.cache_clear()
+    yield
+    artifacts._default_cache_dir.cache_clear()
+
+
+@pytest.fixture
+def http_server(tmp_path):
+    """Serve ``tmp_path / "www"`` over HTTP with byte-range support; yields the base URL."""
+    root = tmp_path / "www"
+    root.mkdir()
+    handler = functools.partial(_RangeRequestHandler, directory=str(root))
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    )
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}", root
+    finally:
+        server.shutdown()
+        server.server_close()
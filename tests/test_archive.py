@@ -1,5 +1,6 @@
 """Tests for archive creation and extraction."""
 
+import os
 import tarfile
 from pathlib import Path
 
@@ -252,3 +253,515 @@ class TestArchiveSuffixDetection:
         # Zenodo-style URL
         url = "https://zenodo.org/records/123/files/data.tar.xz?download=1"
         assert manager._get_archive_suffix(url) == ".tar.xz"
+
+    def test_detect_with_fragment(self, tmp_path):
+        """URL fragments are ignored like query parameters."""
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text('[Test]\ngit-tree-sha1 = "abc"\n')
+
+        manager = ArtifactManager(toml_path)
+
+        assert manager._get_archive_suffix("https://example.com/data.zip#sha=1") == ".zip"
+        assert manager._get_archive_suffix("https://example.com/get#data.zip") == ".tar.gz"
+
+    def test_archive_format_modes(self, tmp_path):
+        """Detected format includes the matching tarfile read mode."""
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text('[Test]\ngit-tree-sha1 = "abc"\n')
+
+        manager = ArtifactManager(toml_path, cache_dir=tmp_path / "cache")
+
+        assert manager._get_archive_format("https://example.com/a.TAR.XZ") == (".tar.xz", "r:xz")
+        assert manager._get_archive_format("https://example.com/a.tgz") == (".tar.gz", "r:gz")
+        assert manager._get_archive_format("https://example.com/a.tar") == (".tar", "r:")
+        assert manager._get_archive_format("https://example.com/a.zip") == (".zip", None)
+        # Unknown formats are sniffed from the contents
+        assert manager._get_archive_format("https://example.com/a.bin") == (".tar.gz", None)
+        assert manager._get_archive_format("https://example.com/a.bin?f=b.zip") == (".tar.gz", None)
+
+    def test_archive_format_memoized(self, tmp_path):
+        """Repeated lookups of the same URL are served from the cache."""
+        from fetch_artifacts.artifacts import ArtifactManager, _archive_format
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text('[Test]\ngit-tree-sha1 = "abc"\n')
+
+        manager = ArtifactManager(toml_path, cache_dir=tmp_path / "cache")
+        url = "https://example.com/memoized.tar.bz2"
+
+        manager._get_archive_suffix(url)
+        hits = _archive_format.cache_info().hits
+        assert manager._get_archive_format(url) == (".tar.bz2", "r:bz2")
+        assert _archive_format.cache_info().hits == hits + 1
+
+
+class TestMoveTree:
+    """Test moving extracted trees into the cache."""
+
+    def test_move_tree_same_filesystem(self, tmp_path):
+        """Tree is renamed into place."""
+        from fetch_artifacts.utils import move_tree
+
+        src = tmp_path / "src"
+        (src / "sub").mkdir(parents=True)
+        (src / "sub" / "file.txt").write_text("content")
+
+        dst = tmp_path / "dst"
+        move_tree(src, dst)
+
+        assert not src.exists()
+        assert (dst / "sub" / "file.txt").read_text() == "content"
+
+    def test_move_tree_cross_device_fallback(self, tmp_path):
+        """Tree is copied when rename crosses filesystems."""
+        import errno
+        from unittest import mock
+
+        from fetch_artifacts.utils import move_tree
+
+        src = tmp_path / "src"
+        src.mkdir()
+        (src / "file.txt").write_text("content")
+
+        dst = tmp_path / "dst"
+        with mock.patch("os.replace", side_effect=OSError(errno.EXDEV, "cross-device")):
+            move_tree(src, dst)
+
+        assert not src.exists()
+        assert (dst / "file.txt").read_text() == "content"
+
+
+class TestStreamExtract:
+    """Test single-pass download and extraction."""
+
+    def test_stream_extract_returns_sha256(self, tmp_path):
+        """Streaming extraction yields the archive SHA256 and its contents."""
+        from fetch_artifacts import compute_sha256
+        from fetch_artifacts.utils import stream_extract
+
+        src_dir = tmp_path / "payload"
+        src_dir.mkdir()
+        (src_dir / "data.txt").write_text("streamed")
+
+        archive_path = tmp_path / "payload.tar.xz"
+        with tarfile.open(archive_path, "w:xz") as tar:
+            tar.add(src_dir, arcname="payload")
+
+        extract_to = tmp_path / "extracted"
+        digest = stream_extract(archive_path.as_uri(), extract_to)
+
+        assert digest == compute_sha256(archive_path)
+        assert (extract_to / "payload" / "data.txt").read_text() == "streamed"
+
+    def test_stream_extract_detects_compression(self, tmp_path):
+        """Compression is detected from the stream, not the URL suffix."""
+        from fetch_artifacts.utils import stream_extract
+
+        src_file = tmp_path / "file.txt"
+        src_file.write_text("bz2 content")
+
+        archive_path = tmp_path / "download"
+        with tarfile.open(archive_path, "w:bz2") as tar:
+            tar.add(src_file, arcname="file.txt")
+
+        extract_to = tmp_path / "extracted"
+        stream_extract(archive_path.as_uri(), extract_to)
+
+        assert (extract_to / "file.txt").read_text() == "bz2 content"
+
+    def test_stream_extract_reads_large_blocks(self, tmp_path):
+        """The tar stream pulls from the network in CHUNK_SIZE reads."""
+        from unittest import mock
+
+        from fetch_artifacts import utils
+
+        src_file = tmp_path / "file.bin"
+        src_file.write_bytes(os.urandom(3 * utils.CHUNK_SIZE))
+
+        archive_path = tmp_path / "payload.tar"
+        with tarfile.open(archive_path, "w") as tar:
+            tar.add(src_file, arcname="file.bin")
+
+        read = utils.HashingReader.read
+        with mock.patch.object(
+            utils.HashingReader, "read", autospec=True, side_effect=read
+        ) as spy:
+            utils.stream_extract(archive_path.as_uri(), tmp_path / "extracted")
+
+        sizes = [call.args[1] for call in spy.call_args_list if len(call.args) > 1]
+        assert max(sizes) == utils.CHUNK_SIZE
+        assert spy.call_count < 20
+
+    def test_stream_extract_invalid_archive(self, tmp_path):
+        """Corrupt data raises a tarfile error."""
+        from fetch_artifacts.utils import stream_extract
+
+        bad = tmp_path / "bad.tar.gz"
+        bad.write_bytes(b"not a real tar file")
+
+        with pytest.raises(tarfile.TarError):
+            stream_extract(bad.as_uri(), tmp_path / "extracted")
+
+    def test_prefetch_reader_preserves_bytes(self):
+        """Read-ahead returns the stream unchanged for any read size."""
+        import io
+
+        from fetch_artifacts.utils import CHUNK_SIZE, _PrefetchReader
+
+        data = os.urandom(2 * CHUNK_SIZE + 123)
+        with _PrefetchReader(io.BytesIO(data), depth=2) as reader:
+            parts = [reader.read(1000), reader.read(CHUNK_SIZE), reader.read()]
+            assert reader.read(10) == b""
+
+        assert b"".join(parts) == data
+
+    def test_prefetch_reader_reraises_errors(self):
+        """An error in the download thread surfaces in the reader."""
+        from urllib.error import URLError
+
+        from fetch_artifacts.utils import _PrefetchReader
+
+        class Broken:
+            def read(self, size):
+                raise URLError("connection reset")
+
+        with _PrefetchReader(Broken()) as reader:
+            with pytest.raises(URLError):
+                reader.read(10)
+
+    def test_prefetch_reader_close_stops_producer(self):
+        """Closing early unblocks and stops a producer waiting on a full queue."""
+        import io
+
+        from fetch_artifacts.utils import CHUNK_SIZE, _PrefetchReader
+
+        reader = _PrefetchReader(io.BytesIO(b"x" * (8 * CHUNK_SIZE)), depth=1)
+        reader.read(10)
+        reader.close()
+
+        assert not reader._thread.is_alive()
+
+
+class TestExtractionFilter:
+    """Test that extraction refuses members escaping the target directory."""
+
+    @pytest.mark.skipif(not hasattr(tarfile, "data_filter"), reason="no tarfile filters")
+    def test_path_traversal_rejected(self, tmp_path):
+        """Members with ../ paths are not written outside extract_to."""
+        import io
+
+        from fetch_artifacts.utils import extract_archive
+
+        archive_path = tmp_path / "evil.tar"
+        with tarfile.open(archive_path, "w") as tar:
+            data = b"escaped"
+            info = tarfile.TarInfo("../escaped.txt")
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+
+        extract_to = tmp_path / "extracted"
+        with pytest.raises(tarfile.TarError):
+            extract_archive(archive_path, extract_to)
+
+        assert not (tmp_path / "escaped.txt").exists()
+
+
+class TestMappedExtraction:
+    """Test extraction of archives read through a memory map."""
+
+    @pytest.mark.parametrize("mode,suffix", [("w", ".tar"), ("w:gz", ".tar.gz"), ("w:xz", ".tar.xz")])
+    def test_extract_compressions(self, tmp_path, monkeypatch, mode, suffix):
+        """Plain and compressed tars extract from the mapped file."""
+        from fetch_artifacts import utils
+        from fetch_artifacts.utils import extract_archive
+
+        monkeypatch.setattr(utils, "_parallel_decompressor", lambda head, mode: None)
+
+        src_file = tmp_path / "file.txt"
+        src_file.write_text("mapped")
+
+        archive_path = tmp_path / f"archive{suffix}"
+        with tarfile.open(archive_path, mode) as tar:
+            tar.add(src_file, arcname="file.txt")
+
+        extract_to = tmp_path / "extracted"
+        extract_archive(archive_path, extract_to)
+
+        assert (extract_to / "file.txt").read_text() == "mapped"
+
+    def test_extract_explicit_mode_with_hardlink(self, tmp_path, monkeypatch):
+        """A known mode is read as a stream, and hard links still extract."""
+        from fetch_artifacts import utils
+        from fetch_artifacts.utils import extract_archive
+
+        monkeypatch.setattr(utils, "_parallel_decompressor", lambda head, mode: None)
+
+        src_dir = tmp_path / "src"
+        src_dir.mkdir()
+        (src_dir / "a.txt").write_text("linked")
+        os.link(src_dir / "a.txt", src_dir / "b.txt")
+
+        archive_path = tmp_path / "archive.tar.gz"
+        with tarfile.open(archive_path, "w:gz") as tar:
+            tar.add(src_dir, arcname="src")
+
+        extract_to = tmp_path / "extracted"
+        extract_archive(archive_path, extract_to, mode="r:gz")
+
+        assert (extract_to / "src" / "a.txt").read_text() == "linked"
+        assert (extract_to / "src" / "b.txt").read_text() == "linked"
+
+    def test_empty_file_raises_tar_error(self, tmp_path):
+        """Empty files (which cannot be mapped) still fail as bad archives."""
+        from fetch_artifacts.utils import extract_archive
+
+        archive_path = tmp_path / "empty.tar.gz"
+        archive_path.write_bytes(b"")
+
+        with pytest.raises(tarfile.TarError):
+            extract_archive(archive_path, tmp_path / "extracted")
+
+
+class TestParallelDecompression:
+    """Test extraction through external multi-threaded decompressors."""
+
+    def _make_archive(self, tmp_path, mode, suffix):
+        src_file = tmp_path / "file.txt"
+        src_file.write_text("decompressed")
+
+        archive_path = tmp_path / f"archive{suffix}"
+        with tarfile.open(archive_path, mode) as tar:
+            tar.add(src_file, arcname="file.txt")
+        return archive_path
+
+    def test_compression_detected_from_contents(self, tmp_path, monkeypatch):
+        """Without a mode, the decompressor is chosen from the leading bytes."""
+        from fetch_artifacts import utils
+
+        monkeypatch.setattr(utils, "_find_decompressor", lambda name: (name,))
+
+        def head(mode):
+            return self._make_archive(tmp_path, mode, ".bin").read_bytes()[:6]
+
+        assert utils._parallel_decompressor(head("w:xz"), None) == ("xz",)
+        assert utils._parallel_decompressor(head("w:bz2"), "r:*") == ("bz2",)
+        assert utils._parallel_decompressor(head("w"), None) is None
+        assert utils._parallel_decompressor(b"", "r:gz") == ("gz",)
+
+    def test_xz_extracts_through_subprocess(self, tmp_path):
+        """An installed xz decompresses the archive in a separate process."""
+        import shutil
+        from unittest import mock
+
+        from fetch_artifacts import utils
+
+        if shutil.which("xz") is None:
+            pytest.skip("xz not installed")
+
+        archive_path = self._make_archive(tmp_path, "w:xz", ".tar.xz")
+        extract_to = tmp_path / "extracted"
+        with mock.patch.object(utils.subprocess, "Popen", wraps=utils.subprocess.Popen) as spy:
+            utils.extract_archive(archive_path, extract_to, mode="r:xz")
+
+        assert spy.call_count == 1
+        assert (extract_to / "file.txt").read_text() == "decompressed"
+
+    def test_decompressor_failure_raises_tar_error(self, tmp_path):
+        """Corrupt input makes the decompressor fail with a tarfile error."""
+        import shutil
+
+        from fetch_artifacts.utils import extract_archive
+
+        if shutil.which("xz") is None:
+            pytest.skip("xz not installed")
+
+        archive_path = self._make_archive(tmp_path, "w:xz", ".tar.xz")
+        data = bytearray(archive_path.read_bytes())
+        data[len(data) // 2] ^= 0xFF
+        archive_path.write_bytes(bytes(data))
+
+        with pytest.raises(tarfile.TarError):
+            extract_archive(archive_path, tmp_path / "extracted", mode="r:xz")
+
+    def test_stream_extract_pipes_through_xz(self, tmp_path):
+        """Streamed downloads are decompressed by an installed xz, and still hashed."""
+        import shutil
+        from unittest import mock
+
+        from fetch_artifacts import compute_sha256, utils
+
+        if shutil.which("xz") is None:
+            pytest.skip("xz not installed")
+
+        archive_path = self._make_archive(tmp_path, "w:xz", ".tar.xz")
+        extract_to = tmp_path / "extracted"
+        with mock.patch.object(utils.subprocess, "Popen", wraps=utils.subprocess.Popen) as spy:
+            digest = utils.stream_extract(archive_path.as_uri(), extract_to)
+
+        assert spy.call_count == 1
+        assert digest == compute_sha256(archive_path)
+        assert (extract_to / "file.txt").read_text() == "decompressed"
+
+    def test_streamed_download_error_is_reported(self, tmp_path):
+        """A download failing mid-stream raises its own error, not a tar error."""
+        import io
+        import shutil
+
+        from fetch_artifacts import utils
+
+        if shutil.which("xz") is None:
+            pytest.skip("xz not installed")
+
+        data = self._make_archive(tmp_path, "w:xz", ".tar.xz").read_bytes()
+
+        class FailingStream(io.BytesIO):
+            def read(self, size=-1):
+                chunk = super().read(size)
+                if not chunk:
+                    raise OSError("connection reset")
+                return chunk
+
+        stream = FailingStream(data[: len(data) // 2])
+        with pytest.raises(OSError, match="connection reset"):
+            utils._read_decompressed_stream(
+                utils._find_decompressor("xz"),
+                stream,
+                lambda tf: utils._extract_all(tf, tmp_path / "extracted"),
+            )
+
+
+class TestExtractedRoot:
+    """Test locating the root of an extracted archive."""
+
+    def test_single_directory_is_root(self, tmp_path):
+        """A lone top-level directory becomes the artifact root."""
+        from fetch_artifacts.utils import get_extracted_root
+
+        (tmp_path / "payload").mkdir()
+
+        assert get_extracted_root(tmp_path) == tmp_path / "payload"
+
+    @pytest.mark.parametrize("names", [[], ["file.txt"], ["a", "b.txt"]])
+    def test_other_layouts_keep_extract_dir(self, tmp_path, names):
+        """Empty, single-file and multi-entry layouts keep the extraction dir."""
+        from fetch_artifacts.utils import get_extracted_root
+
+        for name in names:
+            if name.endswith(".txt"):
+                (tmp_path / name).write_text("x")
+            else:
+                (tmp_path / name).mkdir()
+
+        assert get_extracted_root(tmp_path) == tmp_path
+
+
+class TestScratchFile:
+    """Test the scratch file used for downloads that cannot be streamed."""
+
+    def test_scratch_file_removed_on_exit(self, tmp_path):
+        """Data written through the path is readable, and nothing is left behind."""
+        from fetch_artifacts.utils import _scratch_file
+
+        with _scratch_file(tmp_path, ".zip") as path:
+            path.write_bytes(b"scratch")
+            with open(path, "r+b") as f:
+                f.seek(2)
+                f.write(b"R")
+            assert path.read_bytes() == b"scRatch"
+
+        assert not list(tmp_path.iterdir())
+
+    def test_zip_detected_without_suffix(self, tmp_path):
+        """Zip archives are recognized from their contents when unnamed."""
+        import zipfile
+
+        from fetch_artifacts.utils import _scratch_file, extract_archive
+
+        with _scratch_file(tmp_path) as path:
+            with zipfile.ZipFile(path, "w") as zf:
+                zf.writestr("file.txt", "zipped")
+            extract_archive(path, tmp_path / "extracted")
+
+        assert (tmp_path / "extracted" / "file.txt").read_text() == "zipped"
+
+
+class TestCloneFile:
+    """Test the copy function used for cross-device moves."""
+
+    def test_clone_file_preserves_content_and_mode(self, tmp_path):
+        """Copied file has the same bytes and permission bits."""
+        import os
+        import stat
+
+        from fetch_artifacts.utils import _clone_file
+
+        src = tmp_path / "script.sh"
+        src.write_bytes(b"#!/bin/sh\necho hi\n" * 1000)
+        os.chmod(src, 0o755)
+
+        dst = tmp_path / "copy.sh"
+        _clone_file(str(src), str(dst))
+
+        assert dst.read_bytes() == src.read_bytes()
+        assert stat.S_IMODE(dst.stat().st_mode) == stat.S_IMODE(src.stat().st_mode)
+
+    def test_clone_file_without_copy_file_range(self, tmp_path, monkeypatch):
+        """Platforms lacking copy_file_range fall back to a regular copy."""
+        import os
+
+        from fetch_artifacts import utils
+
+        monkeypatch.delattr(os, "copy_file_range", raising=False)
+        monkeypatch.setattr(utils, "_FICLONE", 0)  # invalid ioctl: no reflink
+
+        src = tmp_path / "data.bin"
+        src.write_bytes(os.urandom(200_000))
+
+        dst = tmp_path / "copy.bin"
+        utils._clone_file(str(src), str(dst))
+
+        assert dst.read_bytes() == src.read_bytes()
+
+    def test_clone_file_skips_ioctl_off_linux(self, tmp_path, monkeypatch):
+        """The Linux-only FICLONE request is never sent on other platforms."""
+        import sys
+
+        from fetch_artifacts import utils
+
+        fcntl = pytest.importorskip("fcntl")
+
+        def fail(*args):
+            raise AssertionError("ioctl called off Linux")
+
+        monkeypatch.setattr(sys, "platform", "darwin")
+        monkeypatch.setattr(fcntl, "ioctl", fail)
+
+        src = tmp_path / "data.bin"
+        src.write_bytes(b"x" * 1000)
+
+        dst = tmp_path / "copy.bin"
+        utils._clone_file(str(src), str(dst))
+
+        assert dst.read_bytes() == src.read_bytes()
+
+    def test_copy_file_range_copies_whole_file(self, tmp_path):
+        """The in-kernel copy loop transfers every byte."""
+        import os
+
+        from fetch_artifacts.utils import _copy_file_range
+
+        if not hasattr(os, "copy_file_range"):
+            pytest.skip("copy_file_range not available")
+
+        src = tmp_path / "data.bin"
+        src.write_bytes(os.urandom(3 * 1024 * 1024 + 7))
+
+        dst = tmp_path / "copy.bin"
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            _copy_file_range(fsrc.fileno(), fdst.fileno())
+
+        assert dst.read_bytes() == src.read_bytes()
@@ -63,6 +63,43 @@ class TestArtifactEntry:
         assert entry.git_tree_sha1 is None
         assert entry.name == "TestArtifact"
 
+    def test_entries_are_immutable(self):
+        import dataclasses
+        from fetch_artifacts.artifacts import ArtifactEntry
+
+        data = {
+            "git-tree-sha1": "abc123",
+            "download": [{"url": "https://example.com/data.tar.gz", "sha256": "def456"}],
+        }
+
+        entry = ArtifactEntry.from_dict("TestArtifact", data)
+
+        assert isinstance(entry.downloads, tuple)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            entry.git_tree_sha1 = "other"
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            entry.downloads[0].url = "https://other.com/data.tar.gz"
+        assert hash(entry.downloads[0]) == hash(ArtifactEntry.from_dict("X", data).downloads[0])
+
+
+    def test_repeated_strings_shared(self):
+        from fetch_artifacts.artifacts import ArtifactEntry
+
+        def make(name):
+            # Built at runtime, so the strings start out as distinct objects
+            url = "".join(["https://mirror.com/", "data.tar.gz"])
+            sha = "".join(["ab"] * 32)
+            return ArtifactEntry.from_dict(name, {
+                "git-tree-sha1": "".join(["cd"] * 20),
+                "download": [{"url": url, "sha256": sha}],
+            })
+
+        first, second = make("First"), make("Second")
+
+        assert first.downloads[0].url is second.downloads[0].url
+        assert first.downloads[0].sha256 is second.downloads[0].sha256
+        assert first.git_tree_sha1 is second.git_tree_sha1
+
 
 class TestArtifactManager:
     """Test ArtifactManager functionality."""
@@ -202,6 +239,70 @@ class TestConvenienceFunctions:
         finally:
             os.chdir(original_cwd)
 
+    def test_load_artifacts_relative_and_absolute_share_manager(self, tmp_path):
+        from fetch_artifacts import load_artifacts
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text('[Test]\ngit-tree-sha1 = "abc"\n')
+
+        import os
+        original_cwd = os.getcwd()
+        try:
+            os.chdir(tmp_path)
+            relative = load_artifacts("Artifacts.toml", cache_dir=tmp_path / "cache")
+            absolute = load_artifacts(toml_path)
+        finally:
+            os.chdir(original_cwd)
+
+        assert relative is absolute
+
+    def test_load_artifacts_concurrent_callers_share_manager(self, tmp_path):
+        import threading
+        from unittest import mock
+
+        from fetch_artifacts import artifacts as module
+        from fetch_artifacts import load_artifacts
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text('[Test]\ngit-tree-sha1 = "abc"\n')
+
+        barrier = threading.Barrier(8)
+        managers = []
+
+        def load():
+            barrier.wait()
+            managers.append(load_artifacts(toml_path, cache_dir=tmp_path / "cache"))
+
+        with mock.patch.object(
+            module, "ArtifactManager", wraps=module.ArtifactManager
+        ) as spy:
+            threads = [threading.Thread(target=load) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert spy.call_count == 1
+        assert all(manager is managers[0] for manager in managers)
+
+    def test_load_artifacts_unused_manager_released(self, tmp_path):
+        import gc
+
+        from fetch_artifacts import artifacts as module
+        from fetch_artifacts import load_artifacts
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text('[Test]\ngit-tree-sha1 = "abc"\n')
+
+        manager = load_artifacts(toml_path, cache_dir=tmp_path / "cache")
+        key = module._resolve_path(str(toml_path))
+        assert module._artifact_managers.get(key) is manager
+
+        del manager
+        gc.collect()
+
+        assert module._artifact_managers.get(key) is None
+
 
 class TestArchiveSuffix:
     """Test archive suffix detection."""
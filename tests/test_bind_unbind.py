@@ -1,5 +1,6 @@
 """Tests for artifact binding and unbinding functions."""
 
+import sys
 from pathlib import Path
 
 import pytest
@@ -48,6 +49,32 @@ class TestBindArtifact:
         assert "NewArtifact" in data
         assert data["NewArtifact"]["git-tree-sha1"] == "abc123"
 
+    @pytest.mark.parametrize("lazy", [True, False])
+    def test_bind_new_toml_matches_tomlkit(self, tmp_path, lazy):
+        """A new file is written without tomlkit, exactly as tomlkit would."""
+        from unittest import mock
+        from fetch_artifacts import bind_artifact, create, edit_artifacts_toml
+
+        args = ("NewArtifact", "abc123", "https://example.com/data.tar.gz", "def456")
+
+        with mock.patch.object(create.tomlkit, "dumps", side_effect=AssertionError):
+            bind_artifact(tmp_path / "fast.toml", *args, lazy=lazy)
+        with edit_artifacts_toml(tmp_path / "tomlkit.toml"):
+            bind_artifact(tmp_path / "tomlkit.toml", *args, lazy=lazy)
+
+        assert (tmp_path / "fast.toml").read_text() == (tmp_path / "tomlkit.toml").read_text()
+
+    def test_bind_new_toml_escapes_through_tomlkit(self, tmp_path):
+        """Names and values that need quoting still round-trip."""
+        from fetch_artifacts import bind_artifact
+
+        toml_path = tmp_path / "Artifacts.toml"
+        bind_artifact(toml_path, "My.v2", "abc", 'https://e.com/"q"\\a.tar.gz', "def")
+
+        with open(toml_path, "rb") as f:
+            data = tomllib.load(f)
+        assert data["My.v2"]["download"][0]["url"] == 'https://e.com/"q"\\a.tar.gz'
+
     def test_bind_adds_to_existing_toml(self, tmp_path):
         """bind_artifact adds to existing TOML file."""
         from fetch_artifacts import bind_artifact
@@ -350,3 +377,131 @@ class TestAddDownloadSource:
                 download_url="https://example.com/data.tar.gz",
                 sha256="sha",
             )
+
+
+class TestReadToml:
+    """Test the cached read-only TOML parse used by create.py."""
+
+    def test_read_toml_cached_until_file_changes(self, tmp_path):
+        """Unchanged files are parsed once; edits are picked up."""
+        import os
+        from fetch_artifacts import create
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text('[First]\ngit-tree-sha1 = "abc"\n')
+
+        first = create._read_toml(toml_path)
+        assert create._read_toml(toml_path) is first
+        assert "First" in first
+
+        toml_path.write_text('[Second]\ngit-tree-sha1 = "def456"\n')
+        stat = toml_path.stat()
+        os.utime(toml_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        second = create._read_toml(toml_path)
+        assert "Second" in second
+        assert "First" not in second
+
+    def test_own_writes_invalidate_cache(self, tmp_path):
+        """A same-size rewrite with an unchanged mtime is still re-read."""
+        import os
+        from fetch_artifacts import create
+
+        toml_path = tmp_path / "Artifacts.toml"
+        create._write_toml_text(toml_path, '[First]\ngit-tree-sha1 = "abc"\n')
+        os.utime(toml_path, ns=(0, 1_000_000_000))
+        assert "First" in create._read_toml(toml_path)
+
+        create._write_toml_text(toml_path, '[Other]\ngit-tree-sha1 = "abc"\n')
+        os.utime(toml_path, ns=(0, 1_000_000_000))
+        assert "Other" in create._read_toml(toml_path)
+
+    @pytest.mark.skipif(not HAS_TOMLKIT, reason="tomlkit not installed")
+    def test_rejected_edits_skip_tomlkit_parse(self, tmp_path):
+        """Edits that can't apply are refused without a tomlkit parse."""
+        from unittest import mock
+        from fetch_artifacts import add_download_source, bind_artifact, create, unbind_artifact
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text('[First]\ngit-tree-sha1 = "abc"\n')
+
+        with mock.patch.object(create, "_load_document") as load:
+            assert unbind_artifact(toml_path, "Missing") is False
+            with pytest.raises(KeyError):
+                add_download_source(toml_path, "Missing", "https://example.com/a.tar.gz", "sha")
+            with pytest.raises(ValueError, match="already exists"):
+                bind_artifact(toml_path, "First", "abc", "https://example.com/a.tar.gz", "sha")
+        load.assert_not_called()
+
+
+@pytest.mark.skipif(not HAS_TOMLKIT, reason="tomlkit not installed")
+class TestEditArtifactsToml:
+    """Test batching edits with edit_artifacts_toml."""
+
+    def test_batch_writes_once(self, tmp_path):
+        """Edits inside the block reach the file in a single write on exit."""
+        from unittest import mock
+        from fetch_artifacts import (
+            add_download_source, bind_artifact, create, edit_artifacts_toml, unbind_artifact,
+        )
+
+        toml_path = tmp_path / "Artifacts.toml"
+        with mock.patch.object(
+            create, "_write_document", wraps=create._write_document
+        ) as spy:
+            with edit_artifacts_toml(toml_path):
+                bind_artifact(toml_path, "First", "a" * 40, "https://example.com/1", "1" * 64)
+                bind_artifact(toml_path, "Second", "b" * 40, "https://example.com/2", "2" * 64)
+                add_download_source(toml_path, "First", "https://mirror.com/1", "1" * 64)
+                assert unbind_artifact(toml_path, "Second") is True
+                assert not toml_path.exists()
+
+        assert spy.call_count == 1
+        content = toml_path.read_text()
+        assert "https://mirror.com/1" in content
+        assert "Second" not in content
+        assert list(tmp_path.iterdir()) == [toml_path]
+
+    def test_error_leaves_file_untouched(self, tmp_path):
+        """An exception inside the block discards the pending edits."""
+        from fetch_artifacts import bind_artifact, edit_artifacts_toml
+
+        toml_path = tmp_path / "Artifacts.toml"
+        bind_artifact(toml_path, "First", "a" * 40, "https://example.com/1", "1" * 64)
+        original = toml_path.read_text()
+
+        with pytest.raises(ValueError, match="already exists"):
+            with edit_artifacts_toml(toml_path):
+                bind_artifact(toml_path, "Second", "b" * 40, "https://example.com/2", "2" * 64)
+                bind_artifact(toml_path, "First", "c" * 40, "https://example.com/3", "3" * 64)
+
+        assert toml_path.read_text() == original
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="POSIX file modes")
+    def test_rewrite_keeps_file_mode(self, tmp_path):
+        """Rewriting Artifacts.toml keeps its permission bits."""
+        import os
+        import stat
+        from fetch_artifacts import bind_artifact
+
+        toml_path = tmp_path / "Artifacts.toml"
+        bind_artifact(toml_path, "First", "a" * 40, "https://example.com/1", "1" * 64)
+        os.chmod(toml_path, 0o640)
+
+        bind_artifact(toml_path, "Second", "b" * 40, "https://example.com/2", "2" * 64)
+
+        assert stat.S_IMODE(toml_path.stat().st_mode) == 0o640
+        assert list(tmp_path.iterdir()) == [toml_path]
+
+    def test_concurrent_writers_use_distinct_temp_files(self, tmp_path):
+        """Threads writing the same file never share a temp file."""
+        from concurrent.futures import ThreadPoolExecutor
+        from fetch_artifacts import create
+
+        toml_path = tmp_path / "Artifacts.toml"
+        texts = [f'[A{i}]\ngit-tree-sha1 = "{i:040d}"\n' for i in range(32)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda t: create._write_toml_text(toml_path, t), texts))
+
+        assert toml_path.read_text() in texts
+        assert list(tmp_path.iterdir()) == [toml_path]
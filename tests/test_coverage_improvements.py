@@ -16,6 +16,46 @@ class TestImportFallbacks:
         # tomllib should be available in Python 3.11+
         assert artifacts.tomllib is not None
 
+    def test_package_import_defers_network_modules(self):
+        """Importing the package loads neither urllib.request nor httpx."""
+        import subprocess
+        import sys
+
+        code = (
+            "import sys, fetch_artifacts; "
+            "loaded = [m for m in ('urllib.request', 'httpx._client', 'tomlkit.api') "
+            "if m in sys.modules]; "
+            "print(','.join(loaded))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout.strip() == ""
+
+    def test_package_import_defers_parsing_and_thread_pools(self):
+        """Importing the package neither loads the TOML parser nor thread pools."""
+        import subprocess
+        import sys
+
+        code = (
+            "import sys, fetch_artifacts; "
+            "loaded = [m for m in ('tomllib._parser', 'tomli._parser', 'concurrent.futures') "
+            "if m in sys.modules]; "
+            "print(','.join(loaded))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout.strip() == ""
+
+    def test_lazy_import_missing_module(self):
+        """Optional modules that are not installed resolve to None."""
+        from fetch_artifacts._compat import _lazy_import
+
+        assert _lazy_import("fetch_artifacts_no_such_module") is None
+
 
 class TestErrorPaths:
     """Test error handling paths."""
@@ -233,6 +273,18 @@ git-tree-sha1 = "xyz789"
         finally:
             os.chdir(original_cwd)
 
+    def test_get_artifacts_toml_start_dir(self, tmp_path):
+        """An explicit start_dir is searched instead of the working directory."""
+        from fetch_artifacts.artifacts import get_artifacts_toml
+
+        julia_dir = tmp_path / "julia"
+        julia_dir.mkdir()
+        toml_path = julia_dir / "JuliaArtifacts.toml"
+        toml_path.write_text('[Test]\ngit-tree-sha1 = "abc"\n')
+
+        assert get_artifacts_toml(start_dir=julia_dir) == toml_path
+        assert get_artifacts_toml(start_dir=tmp_path) is None
+
 
 class TestArchiveSuffixDetection:
     """Test archive suffix detection for various URLs."""
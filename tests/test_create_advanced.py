@@ -14,30 +14,131 @@ except ImportError:
     HAS_TOMLKIT = False
 
 
-class TestGitTreeSHA1Fallback:
-    """Test git-tree-sha1 fallback when git is not available."""
+class TestGitTreeSHA1InProcess:
+    """Test git-tree-sha1 computation without a git installation."""
 
-    def test_fallback_tree_hash(self, tmp_path):
-        """Test fallback hash computation when git unavailable."""
-        from fetch_artifacts.create import compute_git_tree_sha1
+    def test_tree_hash_without_git(self, tmp_path):
+        """Tree hashes are computed without running any subprocess."""
+        from fetch_artifacts.create import _compute_git_tree_sha1
 
-        # Create a test directory
         test_dir = tmp_path / "test"
         test_dir.mkdir()
         (test_dir / "file.txt").write_text("content")
 
-        # Mock git to fail
-        with mock.patch("subprocess.run", side_effect=FileNotFoundError):
-            hash_result = compute_git_tree_sha1(test_dir)
-
-            # Should use fallback and still return a hash
-            assert len(hash_result) >= 40
-            assert all(c in "0123456789abcdef" for c in hash_result)
+        with mock.patch("subprocess.Popen", side_effect=FileNotFoundError):
+            hash_result = _compute_git_tree_sha1(test_dir)
+
+        assert len(hash_result) == 40
+        assert all(c in "0123456789abcdef" for c in hash_result)
+
+    def test_tree_hash_matches_git(self, tmp_path):
+        """The in-process hash matches git's own, including entry order."""
+        import os
+        import shutil
+        import subprocess
+        from fetch_artifacts.create import _compute_git_tree_sha1
+
+        if shutil.which("git") is None:
+            pytest.skip("git not available")
+
+        test_dir = tmp_path / "data"
+        (test_dir / "a").mkdir(parents=True)
+        (test_dir / "a" / "inner.txt").write_bytes(b"inner")
+        # "a.txt" sorts before the tree "a" in git's ordering
+        (test_dir / "a.txt").write_bytes(b"outer")
+        (test_dir / "a-b").write_bytes(b"dash")
+        (test_dir / "run.sh").write_bytes(b"#!/bin/sh\n")
+        os.chmod(test_dir / "run.sh", 0o755)
+
+        repo = tmp_path / "repo"
+        shutil.copytree(test_dir, repo / "content")
+        env = {**os.environ, "GIT_DIR": str(repo / ".git"), "GIT_WORK_TREE": str(repo)}
+        subprocess.run(["git", "init", "-q"], check=True, env=env)
+        subprocess.run(["git", "add", "-A"], check=True, env=env)
+        expected = subprocess.run(
+            ["git", "write-tree"], check=True, env=env, capture_output=True, text=True
+        ).stdout.strip()
+
+        assert _compute_git_tree_sha1(test_dir) == expected
+
+    def test_tree_hash_hardlinks_hashed_once(self, tmp_path):
+        """Hard-linked files are read once and hash like separate copies."""
+        import os
+        from fetch_artifacts import create
+
+        linked = tmp_path / "linked"
+        linked.mkdir()
+        (linked / "a.bin").write_bytes(b"shared")
+        os.link(linked / "a.bin", linked / "b.bin")
+
+        copied = tmp_path / "copied"
+        copied.mkdir()
+        (copied / "a.bin").write_bytes(b"shared")
+        (copied / "b.bin").write_bytes(b"shared")
+
+        with mock.patch.object(
+            create, "_git_blob_sha1", wraps=create._git_blob_sha1
+        ) as spy:
+            linked_hash = create._compute_git_tree_sha1(linked)
+        assert spy.call_count == 1
+
+        assert linked_hash == create._compute_git_tree_sha1(copied)
+
+    def test_tree_hash_reuses_blob_cache(self, tmp_path, monkeypatch):
+        """Unchanged files are not re-read when their directory changes."""
+        import os
+        import time
+        from fetch_artifacts import create
+
+        monkeypatch.setattr(create, "_blob_cache", {})
+        monkeypatch.setattr(create, "_BLOB_CACHE_RACY_NS", 0)
+
+        data = tmp_path / "data"
+        data.mkdir()
+        for name in ("a.bin", "b.bin"):
+            (data / name).write_bytes(name.encode())
+            os.utime(data / name, ns=(10**18, 10**18))
+        expected = create._compute_git_tree_sha1(data)
+
+        with mock.patch.object(
+            create, "_git_blob_sha1", wraps=create._git_blob_sha1
+        ) as spy:
+            assert create._compute_git_tree_sha1(data) == expected
+            assert spy.call_count == 0
+
+            (data / "a.bin").write_bytes(b"changed")
+            changed = create._compute_git_tree_sha1(data)
+            assert spy.call_count == 1
+
+            # An in-place rewrite that restores size and mtime still changes
+            # the ctime, so the file is re-read
+            time.sleep(0.05)
+            (data / "b.bin").write_bytes(b"B.BIN")
+            os.utime(data / "b.bin", ns=(10**18, 10**18))
+            rewritten = create._compute_git_tree_sha1(data)
+            assert spy.call_count == 2
+        assert changed != expected
+        assert rewritten != changed
 
 
 class TestCreateArtifactEdgeCases:
     """Test create_artifact edge cases."""
 
+    @pytest.mark.parametrize("compression", [None, "xz"])
+    def test_create_artifact_copies_in_large_blocks(self, tmp_path, compression):
+        """File contents are copied into the tar in CHUNK_SIZE blocks."""
+        from fetch_artifacts import create_artifact
+        from fetch_artifacts.utils import CHUNK_SIZE
+
+        src_dir = tmp_path / "data"
+        src_dir.mkdir()
+        (src_dir / "file.bin").write_bytes(b"x" * 1000)
+
+        with mock.patch.object(tarfile, "copyfileobj", wraps=tarfile.copyfileobj) as spy:
+            create_artifact(src_dir, archive_path=tmp_path / "out.tar", compression=compression)
+
+        assert spy.call_args.kwargs["bufsize"] == CHUNK_SIZE
+
     def test_create_artifact_with_explicit_path(self, tmp_path):
         """Test create_artifact with explicit output path."""
         from fetch_artifacts import create_artifact
@@ -80,6 +181,92 @@ class TestCreateArtifactEdgeCases:
         assert result["archive_path"].endswith(".tar.bz2")
         assert Path(result["archive_path"]).exists()
 
+    @pytest.mark.parametrize("compression", ["xz", "gz", "bz2", None])
+    def test_create_artifact_sha256_matches_file(self, tmp_path, compression):
+        """The SHA256 hashed while writing matches the archive on disk."""
+        from fetch_artifacts import compute_sha256, create_artifact
+
+        src_dir = tmp_path / "data"
+        src_dir.mkdir()
+        (src_dir / "file.txt").write_text("content" * 1000)
+
+        result = create_artifact(src_dir, tmp_path / "out.tar", compression=compression)
+
+        assert result["sha256"] == compute_sha256(result["archive_path"])
+
+    def test_uncompressed_archive_preallocated_and_trimmed(self, tmp_path):
+        """Uncompressed archives reserve their estimated size, then fit exactly."""
+        import os
+        from fetch_artifacts import create
+
+        src_dir = tmp_path / "data"
+        (src_dir / "sub").mkdir(parents=True)
+        (src_dir / "a.bin").write_bytes(os.urandom(1500))
+        (src_dir / "sub" / "b.bin").write_bytes(os.urandom(10))
+
+        with mock.patch.object(create, "_preallocate", wraps=create._preallocate) as spy:
+            result = create.create_artifact(src_dir, tmp_path / "out.tar", compression=None)
+
+        archive_size = os.path.getsize(result["archive_path"])
+        assert spy.call_args[0][1] == archive_size
+        with tarfile.open(result["archive_path"]) as tar:
+            assert sorted(tar.getnames()) == ["data", "data/a.bin", "data/sub", "data/sub/b.bin"]
+
+    @pytest.mark.parametrize("available", [True, False])
+    def test_create_artifact_xz_compressor(self, tmp_path, available):
+        """Archives are identical in content with or without an external xz."""
+        import shutil
+        from fetch_artifacts import create, create_artifact
+
+        if available and shutil.which("xz") is None:
+            pytest.skip("xz not installed")
+
+        src_dir = tmp_path / "data"
+        src_dir.mkdir()
+        (src_dir / "file.txt").write_text("content")
+
+        finder = create._find_compressor if available else (lambda compression: None)
+        with mock.patch.object(create, "_find_compressor", finder):
+            result = create_artifact(
+                src_dir, tmp_path / "out.tar.xz", compression="xz",
+                parallel_compression=True,
+            )
+
+        with tarfile.open(result["archive_path"], "r:xz") as tar:
+            assert tar.extractfile("data/file.txt").read() == b"content"
+
+    def test_create_artifact_compressor_failure(self, tmp_path):
+        """A failing external compressor raises instead of leaving a bad archive."""
+        import shutil
+        from fetch_artifacts import create, create_artifact
+
+        if shutil.which("sh") is None:
+            pytest.skip("sh not available")
+
+        src_dir = tmp_path / "data"
+        src_dir.mkdir()
+        (src_dir / "file.txt").write_text("content")
+
+        failing = ("sh", "-c", "cat > /dev/null; echo boom >&2; exit 3")
+        with mock.patch.object(create, "_find_compressor", lambda compression: failing):
+            with pytest.raises(RuntimeError, match="boom"):
+                create_artifact(
+                    src_dir, tmp_path / "out.tar.xz", compression="xz",
+                    parallel_compression=True,
+                )
+
+    def test_create_artifact_compresses_in_process_by_default(self, tmp_path):
+        """Archive bytes don't depend on which compressors are installed."""
+        from fetch_artifacts import create, create_artifact
+
+        src_dir = tmp_path / "data"
+        src_dir.mkdir()
+        (src_dir / "file.txt").write_text("content")
+
+        with mock.patch.object(create, "_find_compressor") as finder:
+            create_artifact(src_dir, tmp_path / "out.tar.xz", compression="xz")
+        finder.assert_not_called()
+
 
 @pytest.mark.skipif(not HAS_TOMLKIT, reason="tomlkit not installed")
 class TestQueryArtifactInfo:
@@ -141,6 +328,106 @@ class TestQueryArtifactInfo:
         assert "sha256" in info
         # git_tree_sha1 won't be present due to extraction failure
 
+    def test_query_artifact_info_streams_tar(self, tmp_path):
+        """Tar archives are hashed and extracted without a separate download."""
+        from fetch_artifacts import compute_sha256, create, create_artifact
+
+        src_dir = tmp_path / "data"
+        src_dir.mkdir()
+        (src_dir / "file.txt").write_text("test data")
+        result = create_artifact(src_dir, tmp_path / "test.tar.gz", compression="gz")
+
+        with mock.patch.object(create, "download_file") as download:
+            info = create.query_artifact_info(Path(result["archive_path"]).as_uri())
+
+        download.assert_not_called()
+        assert info["sha256"] == compute_sha256(result["archive_path"])
+        assert info["git_tree_sha1"] == create.compute_git_tree_sha1(src_dir)
+
+    def test_query_artifact_info_zip(self, tmp_path):
+        """Archives tarfile can't stream are downloaded and extracted from disk."""
+        import zipfile
+        from fetch_artifacts import compute_sha256
+        from fetch_artifacts.create import compute_git_tree_sha1, query_artifact_info
+
+        src_dir = tmp_path / "data"
+        src_dir.mkdir()
+        (src_dir / "file.txt").write_text("test data")
+        zip_path = tmp_path / "test.zip"
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            zf.write(src_dir / "file.txt", "data/file.txt")
+
+        info = query_artifact_info(zip_path.as_uri())
+
+        assert info["sha256"] == compute_sha256(zip_path)
+        assert info["git_tree_sha1"] == compute_git_tree_sha1(src_dir)
+
+    @pytest.mark.parametrize("arcname", ["data", ".", "./data"])
+    def test_query_artifact_info_hashes_without_extracting(self, tmp_path, arcname):
+        """Tar members are hashed from the stream, matching the extracted tree."""
+        import os
+        from fetch_artifacts import create
+
+        src_dir = tmp_path / "data"
+        (src_dir / "sub" / "deeper").mkdir(parents=True)
+        (src_dir / "empty").mkdir()
+        (src_dir / "a.txt").write_text("top")
+        (src_dir / "sub" / "deeper" / "b.txt").write_text("nested")
+        (src_dir / "run.sh").write_text("#!/bin/sh\n")
+        os.chmod(src_dir / "run.sh", 0o755)
+        os.link(src_dir / "a.txt", src_dir / "sub" / "a-link.txt")
+
+        archive_path = tmp_path / "test.tar.gz"
+        with tarfile.open(archive_path, "w:gz") as tar:
+            tar.add(src_dir, arcname=arcname)
+
+        with mock.patch.object(create, "extract_archive") as extract:
+            info = create.query_artifact_info(archive_path.as_uri())
+
+        extract.assert_not_called()
+        assert info["git_tree_sha1"] == create.compute_git_tree_sha1(src_dir)
+
+    def test_query_artifact_info_reads_local_file_in_place(self, tmp_path):
+        """file:// archives are hashed where they are, without a copy."""
+        from fetch_artifacts import compute_sha256, create, create_artifact
+
+        src_dir = tmp_path / "data"
+        src_dir.mkdir()
+        (src_dir / "file.txt").write_text("test data")
+        result = create_artifact(src_dir, tmp_path / "test.tar.xz", compression="xz")
+
+        with mock.patch.object(
+            create, "_stream_tar", side_effect=AssertionError
+        ), mock.patch.object(create, "download_file", side_effect=AssertionError):
+            info = create.query_artifact_info(Path(result["archive_path"]).as_uri())
+
+        assert info["sha256"] == compute_sha256(result["archive_path"])
+        assert info["git_tree_sha1"] == create.compute_git_tree_sha1(src_dir)
+
+    def test_query_artifact_info_symlinks_extracted(self, tmp_path, http_server):
+        """Archives with symlinks are extracted from the copy kept while downloading."""
+        import os
+        from fetch_artifacts import create
+
+        src_dir = tmp_path / "data"
+        src_dir.mkdir()
+        (src_dir / "lib.so.1").write_text("library")
+        os.symlink("lib.so.1", src_dir / "lib.so")
+
+        base_url, root = http_server
+        archive_path = root / "test.tar.gz"
+        with tarfile.open(archive_path, "w:gz") as tar:
+            tar.add(src_dir, arcname="data")
+
+        with mock.patch.object(create, "download_file") as download, mock.patch.object(
+            create, "extract_archive", wraps=create.extract_archive
+        ) as extract:
+            info = create.query_artifact_info(f"{base_url}/test.tar.gz")
+
+        download.assert_not_called()
+        extract.assert_called_once()
+        assert info["git_tree_sha1"] == create.compute_git_tree_sha1(src_dir)
+
 
 @pytest.mark.skipif(not HAS_TOMLKIT, reason="tomlkit not installed")
 class TestAddArtifact:
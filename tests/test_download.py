@@ -1,5 +1,6 @@
 """Tests for download and caching functionality."""
 
+import os
 import tarfile
 from pathlib import Path
 from unittest import mock
@@ -60,6 +61,122 @@ class TestChecksumVerification:
         assert manager._verify_checksum(test_file, sha256_lower) is True
         assert manager._verify_checksum(test_file, sha256_upper) is True
 
+    def test_verify_ignores_surrounding_whitespace(self, tmp_path):
+        """Stray whitespace around an expected checksum is ignored."""
+        from fetch_artifacts.artifacts import ArtifactManager, ArtifactEntry
+
+        test_file = tmp_path / "test.txt"
+        test_file.write_bytes(b"hello world")
+        sha256 = "b94d27b9934d3e08a52e52d7da7dabfac484efe37a5380ee9088f7ace2efcde9"
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text('[Test]\ngit-tree-sha1 = "abc"\n')
+        manager = ArtifactManager(toml_path, cache_dir=tmp_path / "cache")
+
+        assert manager._verify_checksum(test_file, f" {sha256}\n") is True
+        entry = ArtifactEntry.from_dict(
+            "Test",
+            {"git-tree-sha1": "abc", "download": [{"url": "x", "sha256": f"{sha256} "}]},
+        )
+        assert entry.downloads[0].sha256 == sha256
+
+    def test_malformed_checksum_skips_hashing_and_download(self, tmp_path):
+        """A checksum that isn't 64 hex digits is rejected without any I/O."""
+        from unittest import mock
+
+        from fetch_artifacts import artifacts
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        test_file = tmp_path / "test.txt"
+        test_file.write_bytes(b"hello world")
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text(f'''
+[Test]
+git-tree-sha1 = "abc"
+
+    [[Test.download]]
+    url = "{test_file.as_uri()}"
+    sha256 = "not-a-sha256"
+''')
+
+        manager = ArtifactManager(toml_path, cache_dir=tmp_path / "cache")
+
+        with mock.patch("fetch_artifacts.create.compute_sha256", side_effect=AssertionError):
+            assert manager._verify_checksum(test_file, "0" * 63) is False
+        with mock.patch.object(artifacts, "stream_extract", side_effect=AssertionError):
+            with pytest.raises(RuntimeError, match="Invalid sha256"):
+                manager["Test"]
+
+    def _write_mismatched_toml(self, tmp_path):
+        src_dir = tmp_path / "source"
+        src_dir.mkdir()
+        (src_dir / "data.txt").write_text("test content")
+
+        archive_path = tmp_path / "test.tar.gz"
+        with tarfile.open(archive_path, "w:gz") as tar:
+            tar.add(src_dir, arcname="source")
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text(f'''
+[TestData]
+git-tree-sha1 = "abc123"
+
+    [[TestData.download]]
+    url = "{archive_path.as_uri()}"
+    sha256 = "{"0" * 64}"
+''')
+        return toml_path
+
+    def test_download_mismatch_rejected(self, tmp_path):
+        """A download whose SHA256 differs from the declared one is discarded."""
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        manager = ArtifactManager(
+            self._write_mismatched_toml(tmp_path), cache_dir=tmp_path / "cache"
+        )
+
+        with pytest.raises(RuntimeError, match="Checksum verification failed"):
+            manager["TestData"]
+
+    def test_zip_verification_can_be_disabled(self, tmp_path):
+        """Zip archives are still extracted when a mismatch is not checked."""
+        import zipfile
+
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        archive_path = tmp_path / "test.zip"
+        with zipfile.ZipFile(archive_path, "w") as zf:
+            zf.writestr("source/data.txt", "zip content")
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text(f'''
+[TestData]
+git-tree-sha1 = "abc123"
+
+    [[TestData.download]]
+    url = "{archive_path.as_uri()}"
+    sha256 = "{"0" * 64}"
+''')
+
+        manager = ArtifactManager(
+            toml_path, cache_dir=tmp_path / "cache", verify_checksum=False
+        )
+
+        assert (manager["TestData"] / "data.txt").read_text() == "zip content"
+
+    def test_verification_can_be_disabled(self, tmp_path):
+        """verify_checksum=False accepts the download without comparing hashes."""
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        manager = ArtifactManager(
+            self._write_mismatched_toml(tmp_path),
+            cache_dir=tmp_path / "cache",
+            verify_checksum=False,
+        )
+
+        assert (manager["TestData"] / "data.txt").read_text() == "test content"
+
 
 class TestCaching:
     """Test artifact caching behavior."""
@@ -121,6 +238,56 @@ git-tree-sha1 = "abc123"
         entry = manager.artifacts["Test"]
         assert manager._is_valid_artifact(artifact_dir, entry) is True
 
+    def test_cached_path_answered_from_memory(self, tmp_path):
+        """Repeated get_path calls skip the filesystem until the cache is cleared."""
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text('[Test]\ngit-tree-sha1 = "abc123"\n')
+
+        cache_dir = tmp_path / "cache"
+        manager = ArtifactManager(toml_path, cache_dir=cache_dir)
+
+        artifact_dir = cache_dir / "abc123"
+        artifact_dir.mkdir(parents=True)
+        (artifact_dir / ".fetch_artifacts_complete").touch()
+        assert manager.get_path("Test", download=False) == artifact_dir
+
+        # Removing the marker behind the manager's back goes unnoticed...
+        (artifact_dir / ".fetch_artifacts_complete").unlink()
+        assert manager.get_path("Test", download=False) == artifact_dir
+
+        # ...until clear() drops the remembered path
+        manager.clear("Test")
+        with pytest.raises(RuntimeError, match="not cached"):
+            manager.get_path("Test", download=False)
+
+    def test_exists_remembers_cached_artifacts(self, tmp_path):
+        """exists() stops probing once an artifact is found, but re-checks misses."""
+        from unittest import mock
+
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text('[Test]\ngit-tree-sha1 = "abc123"\n')
+
+        cache_dir = tmp_path / "cache"
+        manager = ArtifactManager(toml_path, cache_dir=cache_dir)
+        assert manager.exists("Test") is False
+
+        # Another process finishing the download is picked up
+        artifact_dir = cache_dir / "abc123"
+        artifact_dir.mkdir(parents=True)
+        (artifact_dir / ".fetch_artifacts_complete").touch()
+        assert manager.exists("Test") is True
+
+        with mock.patch.object(manager, "_is_valid_artifact", side_effect=AssertionError):
+            assert manager.exists("Test") is True
+            assert manager.get_path("Test", download=False) == artifact_dir
+
+        manager.clear("Test")
+        assert manager.exists("Test") is False
+
     def test_cache_without_marker_invalid(self, tmp_path):
         """Directory without marker is not valid cache."""
         from fetch_artifacts.artifacts import ArtifactManager
@@ -139,6 +306,23 @@ git-tree-sha1 = "abc123"
         entry = manager.artifacts["Test"]
         assert manager._is_valid_artifact(artifact_dir, entry) is False
 
+    def test_missing_or_non_directory_path_invalid(self, tmp_path):
+        """A missing path or a plain file in its place is not a valid cache."""
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text('[Test]\ngit-tree-sha1 = "abc123"\n')
+
+        cache_dir = tmp_path / "cache"
+        manager = ArtifactManager(toml_path, cache_dir=cache_dir)
+        entry = manager.artifacts["Test"]
+
+        assert manager._is_valid_artifact(cache_dir / "abc123", entry) is False
+
+        (cache_dir / "abc123").write_text("not a directory")
+        assert manager._is_valid_artifact(cache_dir / "abc123", entry) is False
+        assert manager._is_valid_artifact(cache_dir / "abc123", entry, deep=True) is False
+
     def test_cache_dir_created(self, tmp_path):
         """Cache directory is created if doesn't exist."""
         from fetch_artifacts.artifacts import ArtifactManager
@@ -181,6 +365,20 @@ git-tree-sha1 = "abc123"
 
         assert artifact_dir.name == "MyArtifact"
 
+    def test_artifact_dir_resolved_once(self, tmp_path):
+        """Repeated lookups return the same cached Path object."""
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text('[Test]\ngit-tree-sha1 = "abc123"\n')
+
+        manager = ArtifactManager(toml_path, cache_dir=tmp_path / "cache")
+        entry = manager.artifacts["Test"]
+
+        first = manager._get_artifact_dir(entry)
+        assert manager._get_artifact_dir(entry) is first
+        assert first == tmp_path / "cache" / "abc123"
+
 
 class TestClearCache:
     """Test cache clearing functionality."""
@@ -241,6 +439,44 @@ git-tree-sha1 = "hash2"
         assert not (cache_dir / "hash1").exists()
         assert not (cache_dir / "hash2").exists()
 
+    def test_clear_all_removes_shared_directory_once(self, tmp_path):
+        """Aliases of one tree remove it once, and objects are pruned once."""
+        from unittest import mock
+
+        from fetch_artifacts import artifacts
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text('''
+[Artifact1]
+git-tree-sha1 = "hash1"
+
+[Alias]
+git-tree-sha1 = "hash1"
+
+[Artifact2]
+git-tree-sha1 = "hash2"
+
+[Missing]
+git-tree-sha1 = "hash3"
+''')
+
+        cache_dir = tmp_path / "cache"
+        manager = ArtifactManager(toml_path, cache_dir=cache_dir)
+        for tree in ("hash1", "hash2"):
+            (cache_dir / tree).mkdir(parents=True)
+            (cache_dir / tree / ".fetch_artifacts_complete").touch()
+
+        with mock.patch.object(
+            artifacts.shutil, "rmtree", wraps=artifacts.shutil.rmtree
+        ) as rmtree, mock.patch.object(manager, "_prune_objects") as prune:
+            manager.clear()
+
+        assert sorted(call.args[0].name for call in rmtree.call_args_list) == ["hash1", "hash2"]
+        prune.assert_called_once()
+        assert not (cache_dir / "hash1").exists()
+        assert not (cache_dir / "hash2").exists()
+
 
 class TestDownloadFallback:
     """Test download fallback to alternative sources."""
@@ -270,6 +506,21 @@ class TestModuleFunctions:
 
         assert cache_dir == Path.home() / ".fetch_artifacts"
 
+    def test_default_cache_dir_computed_once(self):
+        """The default cache path is built once and then reused."""
+        from unittest import mock
+
+        import fetch_artifacts.artifacts as module
+
+        original = module._cache_dir
+        module._cache_dir = None
+        try:
+            first = module.get_cache_dir()
+            with mock.patch.object(Path, "home", side_effect=AssertionError):
+                assert module.get_cache_dir() is first
+        finally:
+            module._cache_dir = original
+
     def test_set_and_get_cache_dir(self, tmp_path):
         """set_cache_dir updates global cache directory."""
         from fetch_artifacts import get_cache_dir, set_cache_dir
@@ -307,3 +558,1221 @@ class TestModuleFunctions:
         clear_artifact_cache("Test", toml_path=toml_path)
 
         assert not artifact_dir.exists()
+
+
+class TestStreamingDownload:
+    """Test download_file streaming behavior."""
+
+    def test_download_returns_sha256(self, tmp_path):
+        """download_file returns the SHA256 of the downloaded bytes."""
+        from fetch_artifacts import compute_sha256
+        from fetch_artifacts.utils import download_file
+
+        src = tmp_path / "source.bin"
+        src.write_bytes(b"hello world" * 1000)
+
+        dest = tmp_path / "dest.bin"
+        digest = download_file(src.as_uri(), dest)
+
+        assert dest.read_bytes() == src.read_bytes()
+        assert digest == compute_sha256(src)
+
+    def test_download_failure_raises_runtime_error(self, tmp_path):
+        """Missing source raises RuntimeError."""
+        from fetch_artifacts.utils import download_file
+
+        missing = tmp_path / "missing.bin"
+
+        with pytest.raises(RuntimeError, match="Download failed"):
+            download_file(missing.as_uri(), tmp_path / "dest.bin")
+
+    def test_progress_output_throttled(self, capsys):
+        """Many small reads print only the first and final progress lines."""
+        import io
+
+        from fetch_artifacts.utils import HashingReader
+
+        reader = HashingReader(io.BytesIO(b"x" * 4096), total_size=4096, verbose=True)
+        while reader.read(16):
+            pass
+
+        lines = [line for line in capsys.readouterr().out.split("\r") if line]
+        assert len(lines) == 2
+        assert "100.0%" in lines[-1]
+
+
+    def test_unfiltered_tar_verified_before_extracting(self, http_server, monkeypatch):
+        """Without tarfile's data filter, a bad archive is rejected before extraction."""
+        import io
+
+        from fetch_artifacts import utils
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        monkeypatch.setattr(utils, "_TAR_FILTER", {})
+
+        base_url, root = http_server
+        payload = b"escaped"
+        with tarfile.open(root / "evil.tar.gz", "w:gz") as tar:
+            info = tarfile.TarInfo("../../escape.txt")
+            info.size = len(payload)
+            tar.addfile(info, io.BytesIO(payload))
+
+        toml_path = root.parent / "Artifacts.toml"
+        toml_path.write_text(f'''
+[TestData]
+git-tree-sha1 = "abc123"
+
+    [[TestData.download]]
+    url = "{base_url}/evil.tar.gz"
+    sha256 = "{"0" * 64}"
+''')
+
+        manager = ArtifactManager(toml_path, cache_dir=root.parent / "cache")
+        with pytest.raises(RuntimeError, match="Failed to download"):
+            manager["TestData"]
+
+        assert not (root.parent / "escape.txt").exists()
+
+
+class TestMirrorRanking:
+    """Test concurrent mirror probing."""
+
+    def test_responsive_mirror_ranked_first(self, tmp_path):
+        """Reachable mirror is tried before an unreachable one."""
+        from fetch_artifacts.artifacts import ArtifactManager, DownloadInfo
+
+        good = tmp_path / "good.tar.gz"
+        good.write_bytes(b"data")
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text('[Test]\ngit-tree-sha1 = "abc"\n')
+        manager = ArtifactManager(toml_path, cache_dir=tmp_path / "cache")
+
+        bad = DownloadInfo(url=(tmp_path / "missing.tar.gz").as_uri(), sha256="")
+        ok = DownloadInfo(url=good.as_uri(), sha256="")
+
+        ranked = manager._rank_mirrors([bad, ok])
+
+        assert ranked[0] is ok
+        assert ranked[1] is bad
+
+    def test_all_unreachable_keeps_order(self, tmp_path):
+        """Declared order is kept when no mirror responds."""
+        from fetch_artifacts.artifacts import ArtifactManager, DownloadInfo
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text('[Test]\ngit-tree-sha1 = "abc"\n')
+        manager = ArtifactManager(toml_path, cache_dir=tmp_path / "cache")
+
+        first = DownloadInfo(url=(tmp_path / "a.tar.gz").as_uri(), sha256="")
+        second = DownloadInfo(url=(tmp_path / "b.tar.gz").as_uri(), sha256="")
+
+        assert manager._rank_mirrors([first, second]) == [first, second]
+
+    def test_unreachable_mirrors_moved_last(self, tmp_path):
+        """Mirrors whose probe already failed fall behind untested ones."""
+        import time
+
+        from fetch_artifacts.artifacts import ArtifactManager, DownloadInfo
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text('[Test]\ngit-tree-sha1 = "abc"\n')
+        manager = ArtifactManager(toml_path, cache_dir=tmp_path / "cache")
+
+        dead = DownloadInfo(url="http://dead.invalid/a.tar.gz", sha256="")
+        slow = DownloadInfo(url="http://slow.invalid/a.tar.gz", sha256="")
+        fast = DownloadInfo(url="http://fast.invalid/a.tar.gz", sha256="")
+
+        def fake_probe(url):
+            if url == dead.url:
+                return False
+            time.sleep(0.05 if url == fast.url else 0.5)
+            return True
+
+        with mock.patch("fetch_artifacts.artifacts.probe_url", side_effect=fake_probe):
+            ranked = manager._rank_mirrors([dead, slow, fast])
+
+        assert ranked == [fast, slow, dead]
+
+
+class TestSegmentedDownload:
+    """Test parallel byte-range downloads across mirrors."""
+
+    def test_segmented_download_matches_source(self, http_server):
+        """Segments fetched from two mirrors reassemble the original file."""
+        from fetch_artifacts import compute_sha256
+        from fetch_artifacts.utils import download_file_segmented
+
+        base_url, root = http_server
+        payload = os.urandom(3 * 1024 * 1024 + 17)
+        (root / "a.bin").write_bytes(payload)
+        (root / "b.bin").write_bytes(payload)
+
+        dest = root.parent / "dest.bin"
+        digest = download_file_segmented(
+            [f"{base_url}/a.bin", f"{base_url}/b.bin"], dest
+        )
+
+        assert dest.read_bytes() == payload
+        assert digest == compute_sha256(dest)
+
+    def test_single_url_split_into_segments(self, http_server):
+        """One URL can be fetched as several parallel ranges."""
+        from unittest import mock
+        from fetch_artifacts import compute_sha256, utils
+
+        base_url, root = http_server
+        payload = os.urandom(3 * 1024 * 1024 + 17)
+        (root / "a.bin").write_bytes(payload)
+
+        dest = root.parent / "dest.bin"
+        with mock.patch.object(utils, "_fetch_range", wraps=utils._fetch_range) as spy:
+            digest = utils.download_file_segmented(
+                [f"{base_url}/a.bin"], dest, segments=3
+            )
+
+        assert spy.call_count == 3
+        assert dest.read_bytes() == payload
+        assert digest == compute_sha256(dest)
+
+    def test_manager_segments_option(self, http_server):
+        """ArtifactManager(segments=N) downloads artifacts in parallel ranges."""
+        from unittest import mock
+        from fetch_artifacts import compute_sha256, utils
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        base_url, root = http_server
+        src_dir = root.parent / "source"
+        src_dir.mkdir()
+        (src_dir / "data.bin").write_bytes(os.urandom(3 * 1024 * 1024))
+        archive_path = root / "data.tar"
+        with tarfile.open(archive_path, "w") as tar:
+            tar.add(src_dir, arcname="source")
+
+        toml_path = root.parent / "Artifacts.toml"
+        toml_path.write_text(f'''
+[TestData]
+git-tree-sha1 = "abc123"
+
+    [[TestData.download]]
+    url = "{base_url}/data.tar"
+    sha256 = "{compute_sha256(archive_path)}"
+''')
+
+        manager = ArtifactManager(toml_path, cache_dir=root.parent / "cache", segments=2)
+        with mock.patch.object(utils, "_fetch_range", wraps=utils._fetch_range) as spy:
+            path = manager["TestData"]
+
+        assert spy.call_count == 2
+        assert (path / "data.bin").read_bytes() == (src_dir / "data.bin").read_bytes()
+
+    def test_mirrors_streamed_unless_segments_requested(self, http_server):
+        """Mirrors of the same file don't turn a download into a segmented one."""
+        from fetch_artifacts import artifacts, compute_sha256
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        base_url, root = http_server
+        src_dir = root.parent / "source"
+        src_dir.mkdir()
+        (src_dir / "data.txt").write_text("test content")
+        with tarfile.open(root / "a.tar.gz", "w:gz") as tar:
+            tar.add(src_dir, arcname="source")
+        (root / "b.tar.gz").write_bytes((root / "a.tar.gz").read_bytes())
+        sha256 = compute_sha256(root / "a.tar.gz")
+
+        toml_path = root.parent / "Artifacts.toml"
+        toml_path.write_text(f'''
+[TestData]
+git-tree-sha1 = "abc123"
+
+    [[TestData.download]]
+    url = "{base_url}/a.tar.gz"
+    sha256 = "{sha256}"
+
+    [[TestData.download]]
+    url = "{base_url}/b.tar.gz"
+    sha256 = "{sha256}"
+''')
+
+        manager = ArtifactManager(toml_path, cache_dir=root.parent / "cache")
+        with mock.patch.object(
+            artifacts, "download_file_segmented", side_effect=AssertionError
+        ):
+            assert (manager["TestData"] / "data.txt").read_text() == "test content"
+
+    def test_segments_skip_failed_mirrors(self, tmp_path):
+        """Mirrors whose probe failed are not asked for byte ranges."""
+        from fetch_artifacts.artifacts import ArtifactManager, DownloadInfo
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text('[Test]\ngit-tree-sha1 = "abc"\n')
+        manager = ArtifactManager(toml_path, cache_dir=tmp_path / "cache", segments=2)
+
+        dead = DownloadInfo(url="http://dead.invalid/a.tar.gz", sha256="ab" * 32)
+        live = DownloadInfo(url="http://live.invalid/a.tar.gz", sha256="ab" * 32)
+        other = DownloadInfo(url="http://other.invalid/a.tar.gz", sha256="ab" * 32)
+        entry = mock.Mock(downloads=[dead, live, other])
+        entry.name = "Test"
+
+        def fake_rank(downloads, failed):
+            failed.append(dead)
+            return [live, other, dead]
+
+        with mock.patch.object(manager, "_rank_mirrors", side_effect=fake_rank), \
+                mock.patch.object(manager, "_download_and_extract") as download:
+            manager._download_from_sources(entry, tmp_path / "out")
+
+        assert download.call_args[0][1] is live
+        assert download.call_args[0][3] == [other.url]
+
+    def test_segmented_falls_back_without_ranges(self, tmp_path):
+        """Mirrors without range support fall back to a single stream."""
+        from fetch_artifacts.utils import download_file_segmented
+
+        src = tmp_path / "src.bin"
+        src.write_bytes(b"payload")
+        other = tmp_path / "other.bin"
+        other.write_bytes(b"payload")
+
+        dest = tmp_path / "dest.bin"
+        download_file_segmented([src.as_uri(), other.as_uri()], dest)
+
+        assert dest.read_bytes() == b"payload"
+
+
+class TestResumableDownload:
+    """Test continuing interrupted downloads with HTTP Range requests."""
+
+    def test_resume_requests_only_missing_bytes(self, http_server):
+        """An existing prefix is kept and only the remainder is fetched."""
+        from fetch_artifacts.utils import download_file
+
+        base_url, root = http_server
+        payload = os.urandom(256 * 1024)
+        (root / "data.bin").write_bytes(payload)
+
+        # A marker prefix proves the first bytes were not downloaded again
+        dest = root.parent / "dest.bin"
+        dest.write_bytes(b"X" * 1000)
+        download_file(f"{base_url}/data.bin", dest, resume=True)
+
+        assert dest.read_bytes() == b"X" * 1000 + payload[1000:]
+
+    def test_resumed_digest_covers_whole_file(self, http_server):
+        """The returned SHA256 includes the bytes from the earlier attempt."""
+        import hashlib
+
+        from fetch_artifacts.utils import download_file
+
+        base_url, root = http_server
+        payload = os.urandom(256 * 1024)
+        (root / "data.bin").write_bytes(payload)
+
+        dest = root.parent / "dest.bin"
+        dest.write_bytes(payload[:5000])
+        digest = download_file(f"{base_url}/data.bin", dest, resume=True)
+
+        assert dest.read_bytes() == payload
+        assert digest == hashlib.sha256(payload).hexdigest()
+
+    def test_resume_restarts_without_range_support(self, tmp_path):
+        """Sources that ignore ranges are downloaded again from the start."""
+        from fetch_artifacts.utils import download_file
+
+        src = tmp_path / "src.bin"
+        src.write_bytes(b"payload")
+
+        dest = tmp_path / "dest.bin"
+        dest.write_bytes(b"XXX")
+        download_file(src.as_uri(), dest, resume=True)
+
+        assert dest.read_bytes() == b"payload"
+
+    def test_partial_removed_after_download(self, http_server):
+        """A completed artifact leaves no partial download behind."""
+        from fetch_artifacts import compute_sha256
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        base_url, root = http_server
+        src_dir = root.parent / "source"
+        src_dir.mkdir()
+        (src_dir / "data.txt").write_text("test content")
+
+        archive_path = root / "test.tar.gz"
+        with tarfile.open(archive_path, "w:gz") as tar:
+            tar.add(src_dir, arcname="source")
+
+        toml_path = root.parent / "Artifacts.toml"
+        toml_path.write_text(f'''
+[TestData]
+git-tree-sha1 = "abc123"
+
+    [[TestData.download]]
+    url = "{base_url}/test.tar.gz"
+    sha256 = "{compute_sha256(archive_path)}"
+''')
+
+        cache_dir = root.parent / "cache"
+        manager = ArtifactManager(toml_path, cache_dir=cache_dir)
+        path = manager["TestData"]
+
+        assert (path / "data.txt").read_text() == "test content"
+        assert not list((cache_dir / ".partial").iterdir())
+
+
+    def test_invalid_response_not_resumed(self, http_server):
+        """A response that isn't the archive is discarded, not resumed from."""
+        from fetch_artifacts import compute_sha256
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        base_url, root = http_server
+        src_dir = root.parent / "source"
+        src_dir.mkdir()
+        (src_dir / "data.txt").write_text("test content")
+
+        archive_path = root.parent / "test.tar.gz"
+        with tarfile.open(archive_path, "w:gz") as tar:
+            tar.add(src_dir, arcname="source")
+
+        toml_path = root.parent / "Artifacts.toml"
+        toml_path.write_text(f'''
+[TestData]
+git-tree-sha1 = "abc123"
+
+    [[TestData.download]]
+    url = "{base_url}/test.tar.gz"
+    sha256 = "{compute_sha256(archive_path)}"
+''')
+        cache_dir = root.parent / "cache"
+
+        # The server first answers with an error page instead of the archive
+        (root / "test.tar.gz").write_bytes(b"<html>rate limited</html>" * 15)
+        with pytest.raises(RuntimeError, match="Failed to download"):
+            ArtifactManager(toml_path, cache_dir=cache_dir)["TestData"]
+        assert not list((cache_dir / ".partial").iterdir())
+
+        (root / "test.tar.gz").write_bytes(archive_path.read_bytes())
+        path = ArtifactManager(toml_path, cache_dir=cache_dir)["TestData"]
+        assert (path / "data.txt").read_text() == "test content"
+
+    def test_interrupted_stream_keeps_spool(self, tmp_path):
+        """Bytes received before the connection dropped are kept for resuming."""
+        import io
+        from urllib.error import URLError
+
+        from fetch_artifacts import utils
+
+        class Dropped(io.BytesIO):
+            headers = {"Content-Length": "100000"}
+
+            def read(self, size=-1):
+                data = super().read(size)
+                if not data:
+                    raise ConnectionResetError("connection reset")
+                return data
+
+        data = tmp_path / "data.bin"
+        data.write_bytes(os.urandom(200_000))
+        archive = tmp_path / "data.tar.gz"
+        with tarfile.open(archive, "w:gz") as tar:
+            tar.add(data, arcname="data.bin")
+        payload = archive.read_bytes()[:50_000]
+
+        spool = tmp_path / "spool.tar.gz"
+        with mock.patch.object(utils, "_urlopen", return_value=Dropped(payload)):
+            with pytest.raises((ConnectionResetError, URLError, RuntimeError)):
+                utils.stream_extract("http://example.invalid/a.tar.gz", tmp_path / "out",
+                                     spool=spool)
+
+        assert spool.read_bytes() == payload
+
+    def test_partial_claimed_by_one_writer(self, tmp_path):
+        """A partial download is renamed away from the shared name while in use."""
+        from fetch_artifacts.artifacts import ArtifactManager, DownloadInfo
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text('[Test]\ngit-tree-sha1 = "abc"\n')
+        manager = ArtifactManager(toml_path, cache_dir=tmp_path / "cache")
+
+        dl = DownloadInfo(url="https://example.com/a.tar.gz", sha256="ab" * 32)
+        shared = manager._partial_path(dl)
+        shared.write_bytes(b"prefix")
+
+        with pytest.raises(RuntimeError):
+            with manager._claim_partial(dl) as claimed:
+                assert claimed.name.endswith(".tar.gz")
+                assert claimed.read_bytes() == b"prefix"
+                assert not shared.exists()
+
+                # A second writer starts over in a file of its own
+                with manager._claim_partial(dl) as other:
+                    assert other != claimed
+                    assert other.read_bytes() == b""
+                other.unlink()
+                raise RuntimeError("interrupted")
+
+        # The interrupted transfer is handed back for the next attempt
+        assert shared.read_bytes() == b"prefix"
+        assert not claimed.exists()
+
+
+    def test_malformed_sha256_never_names_a_partial(self, tmp_path):
+        """A crafted checksum can't place partial files outside the cache."""
+        from fetch_artifacts.artifacts import ArtifactManager, DownloadInfo
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text('[Test]\ngit-tree-sha1 = "abc"\n')
+        manager = ArtifactManager(
+            toml_path, cache_dir=tmp_path / "cache", verify_checksum=False
+        )
+
+        victim = tmp_path / "victim.tar.gz"
+        victim.write_bytes(b"keep me")
+        dl = DownloadInfo(url="https://example.com/a.tar.gz", sha256="../../victim")
+
+        assert manager._partial_path(dl) is None
+        with manager._claim_partial(dl) as claimed:
+            assert claimed is None
+        assert victim.read_bytes() == b"keep me"
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "Artifacts.toml", "cache", "victim.tar.gz"
+        ]
+
+
+class TestBatchDownload:
+    """Test fetching several artifacts at once."""
+
+    def _make_archive(self, tmp_path, name):
+        from fetch_artifacts import compute_sha256
+
+        src_dir = tmp_path / name
+        src_dir.mkdir()
+        (src_dir / "data.txt").write_text(f"{name} content")
+
+        archive_path = tmp_path / f"{name}.tar.gz"
+        with tarfile.open(archive_path, "w:gz") as tar:
+            tar.add(src_dir, arcname=name)
+        return archive_path, compute_sha256(archive_path)
+
+    def test_get_paths_downloads_all(self, tmp_path):
+        """get_paths returns a path for every requested artifact."""
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        entries = []
+        for name, tree in [("First", "hash1"), ("Second", "hash2")]:
+            archive_path, sha256 = self._make_archive(tmp_path, name)
+            entries.append(f'''
+[{name}]
+git-tree-sha1 = "{tree}"
+
+    [[{name}.download]]
+    url = "{archive_path.as_uri()}"
+    sha256 = "{sha256}"
+''')
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text("".join(entries))
+
+        manager = ArtifactManager(toml_path, cache_dir=tmp_path / "cache")
+        paths = manager.get_paths(["Second", "First"])
+
+        assert list(paths) == ["Second", "First"]
+        assert (paths["First"] / "data.txt").read_text() == "First content"
+        assert (paths["Second"] / "data.txt").read_text() == "Second content"
+
+    def test_get_paths_aliases_download_once(self, tmp_path):
+        """Names sharing a git-tree-sha1 are fetched with a single download."""
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        archive_path, sha256 = self._make_archive(tmp_path, "Shared")
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text("".join(f'''
+[{name}]
+git-tree-sha1 = "samehash"
+
+    [[{name}.download]]
+    url = "{archive_path.as_uri()}"
+    sha256 = "{sha256}"
+''' for name in ["Alias", "Original"]))
+
+        manager = ArtifactManager(toml_path, cache_dir=tmp_path / "cache")
+        with mock.patch.object(
+            manager, "_download_from_sources", wraps=manager._download_from_sources
+        ) as spy:
+            paths = manager.get_paths(["Alias", "Original"], max_workers=2)
+
+        assert spy.call_count == 1
+        assert paths["Alias"] == paths["Original"]
+        assert (paths["Alias"] / "data.txt").read_text() == "Shared content"
+
+    def test_get_paths_unknown_name(self, tmp_path):
+        """get_paths raises KeyError for undefined artifacts."""
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text('[Test]\ngit-tree-sha1 = "abc"\n')
+
+        manager = ArtifactManager(toml_path, cache_dir=tmp_path / "cache")
+
+        with pytest.raises(KeyError, match="Missing"):
+            manager.get_paths(["Test", "Missing"])
+
+    def test_get_paths_no_download(self, tmp_path):
+        """get_paths with download=False raises for uncached artifacts."""
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text('[Test]\ngit-tree-sha1 = "abc"\n')
+
+        manager = ArtifactManager(toml_path, cache_dir=tmp_path / "cache")
+
+        with pytest.raises(RuntimeError, match="not cached"):
+            manager.get_paths(["Test"], download=False)
+
+    def test_prefetch_downloads_in_background(self, tmp_path):
+        """load_artifacts(prefetch=True) fetches everything before it is asked for."""
+        from fetch_artifacts.artifacts import load_artifacts
+
+        entries = []
+        for name, tree in [("First", "hash1"), ("Second", "hash2")]:
+            archive_path, sha256 = self._make_archive(tmp_path, name)
+            entries.append(f'''
+[{name}]
+git-tree-sha1 = "{tree}"
+
+    [[{name}.download]]
+    url = "{archive_path.as_uri()}"
+    sha256 = "{sha256}"
+''')
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text("".join(entries))
+
+        manager = load_artifacts(toml_path, cache_dir=tmp_path / "cache", prefetch=True)
+        futures = dict(manager._prefetched)
+        assert set(futures) == {"First", "Second"}
+
+        path = manager.get_path("First")
+        assert (path / "data.txt").read_text() == "First content"
+        assert "First" not in manager._prefetched
+
+        futures["Second"].result()
+        assert manager.exists("Second")
+
+    def test_prefetch_error_raised_on_access(self, tmp_path):
+        """A failed background download surfaces when the artifact is requested."""
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text(f'''
+[Broken]
+git-tree-sha1 = "abc"
+
+    [[Broken.download]]
+    url = "{(tmp_path / "missing.tar.gz").as_uri()}"
+    sha256 = "0000"
+''')
+
+        manager = ArtifactManager(toml_path, cache_dir=tmp_path / "cache")
+        manager.prefetch()
+
+        with pytest.raises(RuntimeError, match="Failed to download"):
+            manager.get_path("Broken")
+
+    def test_prefetch_error_raised_by_get_paths_and_printed(self, tmp_path, capsys):
+        """A failed background download is printed, and get_paths re-raises it."""
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text(f'''
+[Broken]
+git-tree-sha1 = "abc"
+
+    [[Broken.download]]
+    url = "{(tmp_path / "missing.tar.gz").as_uri()}"
+    sha256 = "0000"
+''')
+
+        manager = ArtifactManager(toml_path, cache_dir=tmp_path / "cache", verbose=True)
+        manager.prefetch()
+        future = manager._prefetched["Broken"]
+        with pytest.raises(RuntimeError):
+            future.result()
+        assert "Background download of 'Broken' failed" in capsys.readouterr().out
+
+        with pytest.raises(RuntimeError, match="Failed to download"):
+            manager.get_paths(["Broken"])
+
+    def test_queued_prefetches_cancelled_at_exit(self, tmp_path):
+        """The exit hook cancels downloads still waiting for a worker."""
+        import threading
+        from unittest import mock
+        from fetch_artifacts import artifacts
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text("".join(
+            f'''
+[A{i}]
+git-tree-sha1 = "{i:040d}"
+
+    [[A{i}.download]]
+    url = "https://example.com/{i}.tar.gz"
+    sha256 = "{"0" * 64}"
+''' for i in range(3)
+        ))
+
+        manager = artifacts.ArtifactManager(toml_path, cache_dir=tmp_path / "cache")
+        release = threading.Event()
+        with mock.patch.object(manager, "_ensure_artifact", side_effect=lambda e: release.wait()):
+            manager.prefetch(max_workers=1)
+            futures = dict(manager._prefetched)
+            try:
+                artifacts._cancel_prefetches()
+            finally:
+                release.set()
+            futures["A0"].result()
+
+        assert not futures["A0"].cancelled()
+        assert futures["A1"].cancelled()
+        assert futures["A2"].cancelled()
+
+
+class TestDeduplication:
+    """Test sharing identical files between artifacts through the object store."""
+
+    def _write_toml(self, tmp_path):
+        from fetch_artifacts import compute_sha256
+
+        entries = []
+        for name, tree in [("First", "hash1"), ("Second", "hash2")]:
+            src_dir = tmp_path / name
+            src_dir.mkdir()
+            (src_dir / "shared.txt").write_text("shared content")
+            (src_dir / "own.txt").write_text(f"{name} content")
+
+            archive_path = tmp_path / f"{name}.tar.gz"
+            with tarfile.open(archive_path, "w:gz") as tar:
+                tar.add(src_dir, arcname=name)
+            entries.append(f'''
+[{name}]
+git-tree-sha1 = "{tree}"
+
+    [[{name}.download]]
+    url = "{archive_path.as_uri()}"
+    sha256 = "{compute_sha256(archive_path)}"
+''')
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text("".join(entries))
+        return toml_path
+
+    def test_identical_files_share_storage(self, tmp_path):
+        """The same file in two artifacts is stored once."""
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        manager = ArtifactManager(
+            self._write_toml(tmp_path), cache_dir=tmp_path / "cache", dedup=True
+        )
+        first = manager["First"]
+        second = manager["Second"]
+
+        assert (first / "shared.txt").read_text() == "shared content"
+        assert os.path.samefile(first / "shared.txt", second / "shared.txt")
+        assert not os.path.samefile(first / "own.txt", second / "own.txt")
+
+    def test_files_hashed_in_one_batch(self, tmp_path):
+        """Every file of an artifact is hashed by a single parallel batch."""
+        from unittest import mock
+
+        from fetch_artifacts import create
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        manager = ArtifactManager(
+            self._write_toml(tmp_path), cache_dir=tmp_path / "cache", dedup=True
+        )
+        with mock.patch.object(
+            create, "compute_sha256_batch", wraps=create.compute_sha256_batch
+        ) as spy:
+            manager["First"]
+
+        spy.assert_called_once()
+        assert len(spy.call_args[0][0]) == 2
+
+    def test_clear_prunes_unused_objects(self, tmp_path):
+        """Blobs are removed once no artifact links to them."""
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        cache_dir = tmp_path / "cache"
+        manager = ArtifactManager(self._write_toml(tmp_path), cache_dir=cache_dir, dedup=True)
+        manager.get_paths(["First", "Second"])
+
+        manager.clear("First")
+        assert (manager["Second"] / "shared.txt").read_text() == "shared content"
+        assert len(list((cache_dir / ".objects").glob("*/*"))) == 2
+
+        manager.clear()
+        assert not list((cache_dir / ".objects").glob("*/*"))
+
+    def test_dedup_off_by_default(self, tmp_path):
+        """Without dedup, artifacts hold independent copies."""
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        cache_dir = tmp_path / "cache"
+        manager = ArtifactManager(self._write_toml(tmp_path), cache_dir=cache_dir)
+        first = manager["First"]
+        second = manager["Second"]
+
+        assert not os.path.samefile(first / "shared.txt", second / "shared.txt")
+        assert not (cache_dir / ".objects").exists()
+
+
+class TestKeptArchives:
+    """Test re-extracting artifacts from archives kept in the cache."""
+
+    @pytest.mark.parametrize("fmt, suffix", [("w:gz", "tar.gz"), ("zip", "zip")])
+    def test_reextract_without_network(self, tmp_path, fmt, suffix):
+        """A cleared artifact is restored from the kept archive."""
+        import zipfile
+
+        from fetch_artifacts import compute_sha256
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        src_dir = tmp_path / "source"
+        src_dir.mkdir()
+        (src_dir / "data.txt").write_text("test content")
+
+        archive_path = tmp_path / f"test.{suffix}"
+        if fmt == "zip":
+            with zipfile.ZipFile(archive_path, "w") as zf:
+                zf.write(src_dir / "data.txt", "source/data.txt")
+        else:
+            with tarfile.open(archive_path, fmt) as tar:
+                tar.add(src_dir, arcname="source")
+        sha256 = compute_sha256(archive_path)
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text(f'''
+[TestData]
+git-tree-sha1 = "abc123"
+
+    [[TestData.download]]
+    url = "{archive_path.as_uri()}"
+    sha256 = "{sha256}"
+''')
+
+        cache_dir = tmp_path / "cache"
+        manager = ArtifactManager(toml_path, cache_dir=cache_dir, keep_archives=True)
+        manager["TestData"]
+        assert (cache_dir / ".archives" / f"{sha256}.{suffix}").exists()
+
+        manager.clear("TestData")
+        archive_path.unlink()
+
+        assert (manager["TestData"] / "data.txt").read_text() == "test content"
+
+    def test_segmented_download_kept(self, http_server):
+        """Archives fetched across mirrors into a scratch file are kept too."""
+        from fetch_artifacts import compute_sha256
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        base_url, root = http_server
+        src_dir = root.parent / "source"
+        src_dir.mkdir()
+        (src_dir / "data.bin").write_bytes(os.urandom(64 * 1024))
+
+        for name in ["a.tar.gz", "b.tar.gz"]:
+            with tarfile.open(root / name, "w:gz") as tar:
+                tar.add(src_dir, arcname="source")
+        # Both mirrors must serve identical bytes
+        (root / "b.tar.gz").write_bytes((root / "a.tar.gz").read_bytes())
+        sha256 = compute_sha256(root / "a.tar.gz")
+
+        toml_path = root.parent / "Artifacts.toml"
+        toml_path.write_text(f'''
+[TestData]
+git-tree-sha1 = "abc123"
+
+    [[TestData.download]]
+    url = "{base_url}/a.tar.gz"
+    sha256 = "{sha256}"
+
+    [[TestData.download]]
+    url = "{base_url}/b.tar.gz"
+    sha256 = "{sha256}"
+''')
+
+        cache_dir = root.parent / "cache"
+        manager = ArtifactManager(
+            toml_path, cache_dir=cache_dir, keep_archives=True, segments=2
+        )
+        path = manager["TestData"]
+
+        assert (path / "data.bin").read_bytes() == (src_dir / "data.bin").read_bytes()
+        assert compute_sha256(cache_dir / ".archives" / f"{sha256}.tar.gz") == sha256
+
+    def test_local_source_extracted_in_place(self, tmp_path):
+        """file:// sources are read where they are, and kept as copies, not links."""
+        from unittest import mock
+
+        from fetch_artifacts import artifacts, compute_sha256
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        src_dir = tmp_path / "source"
+        src_dir.mkdir()
+        (src_dir / "data.txt").write_text("test content")
+
+        archive_path = tmp_path / "test.tar.gz"
+        with tarfile.open(archive_path, "w:gz") as tar:
+            tar.add(src_dir, arcname="source")
+        sha256 = compute_sha256(archive_path)
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text(f'''
+[TestData]
+git-tree-sha1 = "abc123"
+
+    [[TestData.download]]
+    url = "{archive_path.as_uri()}"
+    sha256 = "{sha256}"
+''')
+
+        cache_dir = tmp_path / "cache"
+        manager = ArtifactManager(toml_path, cache_dir=cache_dir, keep_archives=True)
+        with mock.patch.object(artifacts, "stream_extract", side_effect=AssertionError), \
+                mock.patch.object(artifacts, "download_file", side_effect=AssertionError):
+            assert (manager["TestData"] / "data.txt").read_text() == "test content"
+
+        kept = cache_dir / ".archives" / f"{sha256}.tar.gz"
+        assert not os.path.samefile(kept, archive_path)
+        assert not list((cache_dir / ".partial").glob("*"))
+
+    def test_malformed_sha256_never_names_an_archive(self, tmp_path):
+        """A crafted checksum can't read or write kept archives outside the cache."""
+        from fetch_artifacts.artifacts import ArtifactManager, DownloadInfo
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text('[Test]\ngit-tree-sha1 = "abc"\n')
+        manager = ArtifactManager(
+            toml_path, cache_dir=tmp_path / "cache",
+            verify_checksum=False, keep_archives=True,
+        )
+
+        dl = DownloadInfo(url="https://example.com/a.tar.gz", sha256="../../victim")
+        assert manager._archive_path(dl) is None
+
+        download = tmp_path / "download.tar.gz"
+        download.write_bytes(b"data")
+        manager._keep_archive(download, dl, "../../victim")
+        assert not (tmp_path / "victim.tar.gz").exists()
+
+    def test_archives_not_kept_by_default(self, tmp_path):
+        """Without keep_archives, downloaded archives are discarded."""
+        from fetch_artifacts import compute_sha256
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        src_dir = tmp_path / "source"
+        src_dir.mkdir()
+        (src_dir / "data.txt").write_text("test content")
+
+        archive_path = tmp_path / "test.tar.gz"
+        with tarfile.open(archive_path, "w:gz") as tar:
+            tar.add(src_dir, arcname="source")
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text(f'''
+[TestData]
+git-tree-sha1 = "abc123"
+
+    [[TestData.download]]
+    url = "{archive_path.as_uri()}"
+    sha256 = "{compute_sha256(archive_path)}"
+''')
+
+        cache_dir = tmp_path / "cache"
+        ArtifactManager(toml_path, cache_dir=cache_dir)["TestData"]
+
+        assert not (cache_dir / ".archives").exists()
+
+
+class TestStagingCleanup:
+    """Test that extraction staging directories are removed."""
+
+    def test_no_staging_left_in_cache(self, tmp_path):
+        """Successful download leaves only the artifact in the cache."""
+        from fetch_artifacts import compute_sha256
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        src_dir = tmp_path / "source"
+        src_dir.mkdir()
+        (src_dir / "data.txt").write_text("test content")
+
+        archive_path = tmp_path / "test.tar.gz"
+        with tarfile.open(archive_path, "w:gz") as tar:
+            tar.add(src_dir, arcname="source")
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text(f'''
+[TestData]
+git-tree-sha1 = "abc123"
+
+    [[TestData.download]]
+    url = "{archive_path.as_uri()}"
+    sha256 = "{compute_sha256(archive_path)}"
+''')
+
+        cache_dir = tmp_path / "cache"
+        manager = ArtifactManager(toml_path, cache_dir=cache_dir)
+        path = manager["TestData"]
+
+        assert (path / "data.txt").read_text() == "test content"
+        assert not list(cache_dir.glob(".staging-*"))
+
+    def test_unmarked_directory_replaced(self, tmp_path):
+        """A leftover directory without a marker is swapped out and removed."""
+        from fetch_artifacts import compute_sha256
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        src_dir = tmp_path / "source"
+        src_dir.mkdir()
+        (src_dir / "data.txt").write_text("test content")
+
+        archive_path = tmp_path / "test.tar.gz"
+        with tarfile.open(archive_path, "w:gz") as tar:
+            tar.add(src_dir, arcname="source")
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text(f'''
+[TestData]
+git-tree-sha1 = "abc123"
+
+    [[TestData.download]]
+    url = "{archive_path.as_uri()}"
+    sha256 = "{compute_sha256(archive_path)}"
+''')
+
+        cache_dir = tmp_path / "cache"
+        stale = cache_dir / "abc123"
+        stale.mkdir(parents=True)
+        (stale / "leftover.txt").write_text("partial")
+
+        manager = ArtifactManager(toml_path, cache_dir=cache_dir)
+        path = manager["TestData"]
+
+        assert path == stale
+        assert (path / "data.txt").read_text() == "test content"
+        assert not (path / "leftover.txt").exists()
+        assert not list(cache_dir.glob(".staging-*"))
+
+    def test_marker_written_before_publish(self, tmp_path):
+        """The staged tree already carries its marker when it is moved into place."""
+        from fetch_artifacts import compute_sha256
+        from fetch_artifacts.artifacts import _MARKER_NAME, ArtifactManager
+        from fetch_artifacts.utils import move_tree
+
+        src_dir = tmp_path / "source"
+        src_dir.mkdir()
+        (src_dir / "data.txt").write_text("test content")
+
+        archive_path = tmp_path / "test.tar.gz"
+        with tarfile.open(archive_path, "w:gz") as tar:
+            tar.add(src_dir, arcname="source")
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text(f'''
+[TestData]
+git-tree-sha1 = "abc123"
+
+    [[TestData.download]]
+    url = "{archive_path.as_uri()}"
+    sha256 = "{compute_sha256(archive_path)}"
+''')
+
+        staged_markers = []
+
+        def checking_move(src, dst):
+            staged_markers.append((src / _MARKER_NAME).exists())
+            move_tree(src, dst)
+
+        manager = ArtifactManager(toml_path, cache_dir=tmp_path / "cache")
+        with mock.patch("fetch_artifacts.artifacts.move_tree", side_effect=checking_move):
+            path = manager["TestData"]
+
+        assert staged_markers == [True]
+        assert (path / _MARKER_NAME).exists()
+
+
+class TestCompletionMarker:
+    """Test the completion marker contents and deep verification."""
+
+    def _setup(self, tmp_path):
+        from fetch_artifacts import compute_sha256
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        src_dir = tmp_path / "source"
+        src_dir.mkdir()
+        (src_dir / "a.txt").write_text("aaa")
+        (src_dir / "b.txt").write_text("bbbbb")
+
+        archive_path = tmp_path / "test.tar.gz"
+        with tarfile.open(archive_path, "w:gz") as tar:
+            tar.add(src_dir, arcname="source")
+        sha256 = compute_sha256(archive_path)
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text(f'''
+[TestData]
+git-tree-sha1 = "abc123"
+
+    [[TestData.download]]
+    url = "{archive_path.as_uri()}"
+    sha256 = "{sha256}"
+''')
+        manager = ArtifactManager(toml_path, cache_dir=tmp_path / "cache")
+        return manager, sha256
+
+    def test_marker_records_tree_summary(self, tmp_path):
+        """Marker stores the archive hash, file count and size."""
+        import json
+
+        manager, sha256 = self._setup(tmp_path)
+        path = manager["TestData"]
+
+        info = json.loads((path / ".fetch_artifacts_complete").read_text())
+
+        assert info["sha256"] == sha256
+        assert info["file_count"] == 2
+        assert info["total_bytes"] == 8
+
+    def test_verify_deep_redownloads_damaged_artifact(self, tmp_path):
+        """Deep verification re-downloads an artifact with missing files."""
+        manager, _ = self._setup(tmp_path)
+        path = manager["TestData"]
+        (path / "a.txt").unlink()
+
+        # The cheap check only looks at the marker
+        assert manager.get_path("TestData") == path
+        assert not (path / "a.txt").exists()
+
+        assert manager.get_path("TestData", verify_deep=True) == path
+        assert (path / "a.txt").read_text() == "aaa"
+
+    def test_fsync_skipped_when_disabled(self, tmp_path, monkeypatch):
+        """Setting FETCH_ARTIFACTS_NO_FSYNC commits artifacts without fsync."""
+        import os
+
+        manager, _ = self._setup(tmp_path)
+        calls = []
+        real_fsync = os.fsync
+        monkeypatch.setattr(os, "fsync", lambda fd: calls.append(fd) or real_fsync(fd))
+
+        monkeypatch.setenv("FETCH_ARTIFACTS_NO_FSYNC", "1")
+        manager["TestData"]
+        assert calls == []
+
+        manager.clear("TestData")
+        monkeypatch.delenv("FETCH_ARTIFACTS_NO_FSYNC")
+        path = manager["TestData"]
+        assert calls
+        assert (path / ".fetch_artifacts_complete").exists()
+
+    def test_legacy_empty_marker_accepted(self, tmp_path):
+        """Empty markers from older versions still count as valid."""
+        manager, _ = self._setup(tmp_path)
+        artifact_dir = manager.cache_dir / "abc123"
+        artifact_dir.mkdir(parents=True)
+        (artifact_dir / ".fetch_artifacts_complete").touch()
+
+        entry = manager.artifacts["TestData"]
+        assert manager._is_valid_artifact(artifact_dir, entry, deep=True) is True
+
+
+class TestHttpClient:
+    """Test HTTP downloads with and without the pooled httpx client."""
+
+    @pytest.mark.parametrize("use_httpx", [True, False])
+    def test_http_download(self, http_server, monkeypatch, use_httpx):
+        """Downloads over HTTP work through either backend."""
+        from fetch_artifacts import utils
+        from fetch_artifacts.utils import download_file
+
+        if use_httpx and utils.httpx is None:
+            pytest.skip("httpx not installed")
+        if not use_httpx:
+            monkeypatch.setattr(utils, "httpx", None)
+
+        base_url, root = http_server
+        (root / "data.bin").write_bytes(b"abc" * 1000)
+
+        dest = root.parent / "dest.bin"
+        download_file(f"{base_url}/data.bin", dest)
+
+        assert dest.read_bytes() == b"abc" * 1000
+
+    def test_httpx_response_reads_across_chunks(self):
+        """Reads of any size return the streamed bytes in order."""
+        from fetch_artifacts.utils import _HttpxResponse
+
+        chunks = [b"abc", b"defgh", b"", b"ij"]
+        response = mock.Mock(headers={}, status_code=200)
+        response.iter_raw.return_value = iter(chunks)
+
+        stream = _HttpxResponse(response)
+        assert stream.read(2) == b"ab"
+        assert stream.read(5) == b"cdefg"
+        assert stream.read(10) == b"hij"
+        assert stream.read(4) == b""
+        assert stream.read() == b""
+
+    @pytest.mark.parametrize("use_httpx", [True, False])
+    def test_http_error_raises_runtime_error(self, http_server, monkeypatch, use_httpx):
+        """HTTP error statuses surface as RuntimeError through either backend."""
+        from fetch_artifacts import utils
+        from fetch_artifacts.utils import download_file
+
+        if use_httpx and utils.httpx is None:
+            pytest.skip("httpx not installed")
+        if not use_httpx:
+            monkeypatch.setattr(utils, "httpx", None)
+
+        base_url, root = http_server
+
+        with pytest.raises(RuntimeError, match="Download failed"):
+            download_file(f"{base_url}/missing.bin", root.parent / "dest.bin")
+
+    @pytest.mark.parametrize("use_httpx", [True, False])
+    def test_connection_refused_raises_runtime_error(self, tmp_path, monkeypatch, use_httpx):
+        """A host that refuses connections fails without hanging on retries."""
+        import socket
+
+        from fetch_artifacts import utils
+        from fetch_artifacts.utils import download_file
+
+        if use_httpx and utils.httpx is None:
+            pytest.skip("httpx not installed")
+        if not use_httpx:
+            monkeypatch.setattr(utils, "httpx", None)
+
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+
+        with pytest.raises(RuntimeError, match="Download failed"):
+            download_file(f"http://127.0.0.1:{port}/data.bin", tmp_path / "dest.bin")
+
+    def test_client_is_shared(self):
+        """The httpx client is created once and reused."""
+        from fetch_artifacts import utils
+
+        if utils.httpx is None:
+            pytest.skip("httpx not installed")
+
+        assert utils._get_http_client() is utils._get_http_client()
+
+    def test_client_requests_uncompressed_bodies(self):
+        """Raw response bytes are hashed, so content-encoding is refused."""
+        from fetch_artifacts import utils
+
+        if utils.httpx is None:
+            pytest.skip("httpx not installed")
+
+        assert utils._get_http_client().headers["Accept-Encoding"] == "identity"
@@ -61,6 +61,51 @@ class TestSHA256:
 
         assert len(result) == 64
 
+    def test_sha256_mmap_threshold(self, tmp_path, monkeypatch):
+        """Files past the mmap threshold hash the same as through reads."""
+        import hashlib
+        from fetch_artifacts import create
+
+        monkeypatch.setattr(create, "HASH_MMAP_THRESHOLD", 4096)
+        content = os.urandom(10000)
+        test_file = tmp_path / "large.bin"
+        test_file.write_bytes(content)
+
+        assert create.compute_sha256(test_file) == hashlib.sha256(content).hexdigest()
+
+    def test_sha256_without_mmap(self, tmp_path, monkeypatch):
+        """Where mapping is disabled (Windows), large files are read instead."""
+        import hashlib
+        from unittest import mock
+        from fetch_artifacts import create
+
+        monkeypatch.setattr(create, "HASH_MMAP_THRESHOLD", 4096)
+        monkeypatch.setattr(create, "_HASH_MMAP", False)
+        content = os.urandom(10000)
+        test_file = tmp_path / "large.bin"
+        test_file.write_bytes(content)
+
+        with mock.patch.object(create.mmap, "mmap", side_effect=AssertionError):
+            assert create.compute_sha256(test_file) == hashlib.sha256(content).hexdigest()
+
+    def test_sha256_reads_advise_sequential_access(self, tmp_path, monkeypatch):
+        """Files hashed through reads are flagged for sequential read-ahead."""
+        import hashlib
+        from unittest import mock
+        from fetch_artifacts import create
+
+        if not hasattr(os, "posix_fadvise"):
+            pytest.skip("posix_fadvise not available")
+
+        monkeypatch.setattr(create, "_HASH_MMAP", False)
+        content = os.urandom(create.HASH_CHUNK_SIZE + 1)
+        test_file = tmp_path / "large.bin"
+        test_file.write_bytes(content)
+
+        with mock.patch.object(create.os, "posix_fadvise") as fadvise:
+            assert create.compute_sha256(test_file) == hashlib.sha256(content).hexdigest()
+        assert fadvise.call_args.args[3] == os.POSIX_FADV_SEQUENTIAL
+
     def test_sha256_nonexistent_file(self, tmp_path):
         """Raise error for nonexistent file."""
         from fetch_artifacts import compute_sha256
@@ -68,6 +113,35 @@ class TestSHA256:
         with pytest.raises(FileNotFoundError):
             compute_sha256(tmp_path / "nonexistent.txt")
 
+    def test_sha256_batch_matches_single(self, tmp_path):
+        """Batch hashing returns the per-file hashes in input order."""
+        from fetch_artifacts import compute_sha256, compute_sha256_batch
+
+        paths = []
+        for i in range(5):
+            path = tmp_path / f"file{i}.bin"
+            path.write_bytes(os.urandom(1000 * (i + 1)))
+            paths.append(path)
+
+        assert compute_sha256_batch(paths) == [compute_sha256(p) for p in paths]
+        assert compute_sha256_batch(paths[:1]) == [compute_sha256(paths[0])]
+        assert compute_sha256_batch([]) == []
+
+    def test_sha256_rehashes_unchanged_metadata(self, tmp_path):
+        """An in-place edit is detected even when size and mtime are kept."""
+        import hashlib
+
+        from fetch_artifacts.create import compute_sha256
+
+        path = tmp_path / "data.bin"
+        path.write_bytes(b"original")
+        os.utime(path, ns=(10**18, 10**18))
+        assert compute_sha256(path) == hashlib.sha256(b"original").hexdigest()
+
+        path.write_bytes(b"modified")
+        os.utime(path, ns=(10**18, 10**18))
+        assert compute_sha256(path) == hashlib.sha256(b"modified").hexdigest()
+
 
 class TestGitTreeSHA1:
     """Test git-tree-sha1 computation."""
@@ -167,3 +241,115 @@ class TestGitTreeSHA1:
         hash2 = compute_git_tree_sha1(dir2)
 
         assert hash1 != hash2
+
+    def test_tree_hash_known_value(self, tmp_path):
+        """Tree hash is stable across implementations, including exec bits."""
+        from fetch_artifacts.create import _compute_git_tree_sha1
+
+        test_dir = tmp_path / "data"
+        (test_dir / "sub").mkdir(parents=True)
+        (test_dir / "a.txt").write_bytes(b"hello\n")
+        (test_dir / "sub" / "b.bin").write_bytes(b"x")
+        os.chmod(test_dir / "sub" / "b.bin", 0o755)
+        (test_dir / "empty").mkdir()
+
+        assert _compute_git_tree_sha1(test_dir) == "0730e8730da082139ccb899227794531f19b07ea"
+
+    def test_tree_hash_large_file_known_value(self, tmp_path, monkeypatch):
+        """Memory-mapped, file_digest and chunked blob hashing give git's blob hash."""
+        import hashlib
+        from fetch_artifacts import create
+
+        test_dir = tmp_path / "data"
+        test_dir.mkdir()
+        content = os.urandom(3 * 1024 + 5)
+        (test_dir / "big.bin").write_bytes(content)
+        expected = hashlib.sha1(b"blob %d\0" % len(content) + content).digest()
+
+        monkeypatch.setattr(create, "HASH_CHUNK_SIZE", 1024)
+        assert create._git_blob_sha1(str(test_dir / "big.bin")) == expected
+        with monkeypatch.context() as m:
+            m.delattr(hashlib, "file_digest", raising=False)
+            assert create._git_blob_sha1(str(test_dir / "big.bin")) == expected
+        monkeypatch.setattr(create, "HASH_MMAP_THRESHOLD", 1024)
+        assert create._git_blob_sha1(str(test_dir / "big.bin")) == expected
+
+    def test_tree_hash_reused_until_directory_changes(self, tmp_path):
+        """An unchanged directory is not hashed again; a modified one is."""
+        from unittest import mock
+        from fetch_artifacts import create
+
+        test_dir = tmp_path / "data"
+        test_dir.mkdir()
+        (test_dir / "file.txt").write_text("original")
+
+        with mock.patch.object(
+            create, "_compute_git_tree_sha1", wraps=create._compute_git_tree_sha1
+        ) as spy:
+            first = create.compute_git_tree_sha1(test_dir)
+            assert create.compute_git_tree_sha1(test_dir) == first
+            assert spy.call_count == 1
+
+            (test_dir / "file.txt").write_text("modified, longer")
+            assert create.compute_git_tree_sha1(test_dir) != first
+            assert spy.call_count == 2
+
+    def test_tree_scanned_once_per_hash(self, tmp_path):
+        """The cache lookup and the hash share a single directory scan."""
+        from unittest import mock
+        from fetch_artifacts import create
+
+        test_dir = tmp_path / "data"
+        (test_dir / "sub").mkdir(parents=True)
+        (test_dir / "sub" / "file.txt").write_text("nested")
+        (test_dir / "top.txt").write_text("top")
+
+        with mock.patch.object(create.os, "scandir", wraps=os.scandir) as spy:
+            tree_hash = create.compute_git_tree_sha1(test_dir)
+        assert spy.call_count == 2
+        assert tree_hash == create._compute_git_tree_sha1(test_dir)
+
+
+class TestSHA256Fallback:
+    """Test the chunked hashing path used before Python 3.11."""
+
+    def test_sha256_without_file_digest(self, tmp_path, monkeypatch):
+        """Chunked fallback matches a one-shot hash of the file."""
+        import hashlib
+
+        from fetch_artifacts import compute_sha256
+
+        test_file = tmp_path / "data.bin"
+        test_file.write_bytes(os.urandom(3 * 1024 * 1024 + 5))
+        expected = hashlib.sha256(test_file.read_bytes()).hexdigest()
+
+        monkeypatch.delattr(hashlib, "file_digest", raising=False)
+
+        assert compute_sha256(test_file) == expected
+
+    def test_sha256_empty_file_without_file_digest(self, tmp_path, monkeypatch):
+        """Chunked fallback handles files with no data."""
+        import hashlib
+
+        from fetch_artifacts import compute_sha256
+
+        test_file = tmp_path / "empty.bin"
+        test_file.write_bytes(b"")
+
+        monkeypatch.delattr(hashlib, "file_digest", raising=False)
+
+        assert compute_sha256(test_file) == hashlib.sha256(b"").hexdigest()
+
+    def test_sha256_small_file_without_file_digest(self, tmp_path, monkeypatch):
+        """Files below the mmap threshold are hashed with the buffered loop."""
+        import hashlib
+
+        from fetch_artifacts import compute_sha256
+
+        test_file = tmp_path / "small.bin"
+        test_file.write_bytes(os.urandom(1000))
+        expected = hashlib.sha256(test_file.read_bytes()).hexdigest()
+
+        monkeypatch.delattr(hashlib, "file_digest", raising=False)
+
+        assert compute_sha256(test_file) == expected
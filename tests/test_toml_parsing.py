@@ -1,5 +1,6 @@
 """Tests for TOML parsing functionality."""
 
+import sys
 import tempfile
 from pathlib import Path
 
@@ -81,6 +82,29 @@ class TestArtifactEntryParsing:
 
         assert entry.lazy is False
 
+    def test_entry_hashable_and_metadata_read_only(self):
+        """Entries can be hashed, and shared metadata can't be changed."""
+        import pickle
+
+        from fetch_artifacts.artifacts import ArtifactEntry
+
+        data = {"git-tree-sha1": "abc123", "description": "shared"}
+        entry = ArtifactEntry.from_dict("Shared", data)
+
+        assert hash(entry) == hash(ArtifactEntry.from_dict("Shared", data))
+        assert {entry: 1}[ArtifactEntry.from_dict("Shared", data)] == 1
+        with pytest.raises(TypeError):
+            entry.metadata["description"] = "changed"
+        assert entry.metadata["description"] == "shared"
+
+        # Directly constructed entries don't share the caller's dict either
+        metadata = {"description": "direct"}
+        direct = ArtifactEntry(name="Direct", metadata=metadata)
+        metadata["description"] = "changed"
+        assert direct.metadata["description"] == "direct"
+
+        assert pickle.loads(pickle.dumps(entry)) == entry
+
     def test_parse_no_downloads(self):
         """Parse artifact without download section (local-only)."""
         from fetch_artifacts.artifacts import ArtifactEntry
@@ -108,6 +132,17 @@ class TestArtifactEntryParsing:
         assert entry.os == "linux"
         assert entry.arch == "x86_64"
 
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="slotted dataclasses need 3.10")
+    def test_entries_use_slots(self):
+        """Entries and download sources carry no per-instance __dict__."""
+        from fetch_artifacts.artifacts import ArtifactEntry
+
+        data = {"download": [{"url": "https://example.com/data.tar.gz", "sha256": "h"}]}
+        entry = ArtifactEntry.from_dict("Slotted", data)
+
+        assert not hasattr(entry, "__dict__")
+        assert not hasattr(entry.downloads[0], "__dict__")
+
 
 class TestArtifactManagerTomlLoading:
     """Test ArtifactManager TOML file loading."""
@@ -181,6 +216,20 @@ git-tree-sha1 = "hash3"
 
         assert len(manager.artifacts) == 0
 
+    def test_empty_toml_not_parsed(self, tmp_path, monkeypatch):
+        """An empty file is known to define nothing without a parser."""
+        from fetch_artifacts import artifacts
+
+        monkeypatch.setattr(artifacts, "tomllib", None)
+        monkeypatch.setattr(artifacts, "rtoml", None)
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text("")
+
+        manager = artifacts.ArtifactManager(toml_path, cache_dir=tmp_path / "cache")
+
+        assert manager.artifacts == {}
+
     def test_load_nonexistent_toml(self, tmp_path):
         """Raise error for nonexistent TOML file."""
         from fetch_artifacts import ArtifactManager
@@ -196,15 +245,10 @@ git-tree-sha1 = "hash3"
         julia_toml = tmp_path / "JuliaArtifacts.toml"
         julia_toml.write_text('[Test]\ngit-tree-sha1 = "abc"\n')
 
-        # Search should find it
-        import os
-        original_cwd = os.getcwd()
-        try:
-            os.chdir(tmp_path)
-            found = get_artifacts_toml()
-            # Note: get_artifacts_toml looks in caller's directory first
-        finally:
-            os.chdir(original_cwd)
+        # Search should find it, without changing the working directory
+        found = get_artifacts_toml(start_dir=tmp_path)
+
+        assert found == julia_toml
 
     def test_contains_operator(self, tmp_path):
         """Test 'in' operator for artifact checking."""
@@ -231,3 +275,139 @@ git-tree-sha1 = "hash3"
 
         with pytest.raises(KeyError, match="Unknown"):
             manager["Unknown"]
+
+
+class TestParseCache:
+    """Test caching of parsed Artifacts.toml contents."""
+
+    def test_unchanged_toml_not_reparsed(self, tmp_path):
+        """A second manager for an unchanged file reuses the cached parse."""
+        from unittest import mock
+
+        from fetch_artifacts import artifacts as module
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text('[Test]\ngit-tree-sha1 = "abc"\ndescription = "cached"\n')
+        cache_dir = tmp_path / "cache"
+
+        first = ArtifactManager(toml_path, cache_dir=cache_dir)
+
+        with mock.patch.object(module.tomllib, "load", side_effect=AssertionError):
+            second = ArtifactManager(toml_path, cache_dir=cache_dir)
+
+        assert second.artifacts == first.artifacts
+        assert second.artifacts is not first.artifacts
+        assert second.artifacts["Test"].metadata["description"] == "cached"
+
+    def test_cache_disabled_by_environment(self, tmp_path, monkeypatch):
+        """The opt-out variable makes every manager parse the file again."""
+        import os
+
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        monkeypatch.setenv("FETCH_ARTIFACTS_DISABLE_TOML_CACHE", "1")
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text('[Old]\ngit-tree-sha1 = "abc"\n')
+        stat = toml_path.stat()
+        ArtifactManager(toml_path, cache_dir=tmp_path / "cache")
+
+        # Same size and mtime, as after a quick in-place rewrite
+        toml_path.write_text('[New]\ngit-tree-sha1 = "abc"\n')
+        os.utime(toml_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        manager = ArtifactManager(toml_path, cache_dir=tmp_path / "cache")
+        assert "New" in manager
+
+    def test_in_process_cache_keeps_latest_parse(self, tmp_path):
+        """Re-parsing an edited file replaces its cache entry instead of adding one."""
+        import os
+
+        from fetch_artifacts import artifacts as module
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        toml_path = tmp_path / "Artifacts.toml"
+        cache_dir = tmp_path / "cache"
+        for i in range(3):
+            toml_path.write_text(f'[Test{i}]\ngit-tree-sha1 = "abc"\n')
+            stat = toml_path.stat()
+            os.utime(toml_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + i * 1_000_000))
+            manager = ArtifactManager(toml_path, cache_dir=cache_dir)
+
+        signature, entries = module._toml_cache[manager._cache_key()]
+        assert signature == manager._toml_signature
+        assert list(entries) == ["Test2"]
+
+    def test_modified_toml_reparsed(self, tmp_path):
+        """Changing the file invalidates the cached parse."""
+        import os
+
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text('[Old]\ngit-tree-sha1 = "abc"\n')
+        cache_dir = tmp_path / "cache"
+
+        ArtifactManager(toml_path, cache_dir=cache_dir)
+
+        toml_path.write_text('[New]\ngit-tree-sha1 = "def456"\n')
+        stat = toml_path.stat()
+        os.utime(toml_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        manager = ArtifactManager(toml_path, cache_dir=cache_dir)
+
+        assert "New" in manager
+        assert "Old" not in manager
+
+    def test_load_artifacts_reloads_stale_manager(self, tmp_path):
+        """load_artifacts replaces a manager whose TOML changed."""
+        import os
+
+        from fetch_artifacts import load_artifacts
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text('[Old]\ngit-tree-sha1 = "abc"\n')
+
+        first = load_artifacts(toml_path, cache_dir=tmp_path / "cache")
+        assert load_artifacts(toml_path) is first
+
+        toml_path.write_text('[New]\ngit-tree-sha1 = "def456"\n')
+        stat = toml_path.stat()
+        os.utime(toml_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        second = load_artifacts(toml_path, cache_dir=tmp_path / "cache")
+        assert second is not first
+        assert "New" in second
+
+    def test_date_metadata_cached(self, tmp_path):
+        """TOML values with no JSON equivalent survive the parse cache."""
+        import datetime
+
+        from fetch_artifacts.artifacts import ArtifactManager
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text('[Test]\ngit-tree-sha1 = "abc"\nreleased = 2024-01-02\n')
+        cache_dir = tmp_path / "cache"
+
+        ArtifactManager(toml_path, cache_dir=cache_dir)
+        manager = ArtifactManager(toml_path, cache_dir=cache_dir)
+
+        assert manager.artifacts["Test"].metadata["released"] == datetime.date(2024, 1, 2)
+
+    def test_rtoml_preferred_when_installed(self, tmp_path, monkeypatch):
+        """The optional native parser reads the file when available."""
+        from unittest import mock
+
+        from fetch_artifacts import artifacts
+        from fetch_artifacts._compat import tomllib
+
+        fake_rtoml = mock.Mock(loads=mock.Mock(side_effect=tomllib.loads))
+        monkeypatch.setattr(artifacts, "rtoml", fake_rtoml)
+
+        toml_path = tmp_path / "Artifacts.toml"
+        toml_path.write_text('[Test]\ngit-tree-sha1 = "abc"\n')
+        manager = artifacts.ArtifactManager(toml_path, cache_dir=tmp_path / "cache")
+
+        fake_rtoml.loads.assert_called_once()
+        assert manager.artifacts["Test"].git_tree_sha1 == "abc"